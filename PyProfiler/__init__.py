@@ -23,8 +23,15 @@
     PyProfiler
 
 """
-from .wrapper import Profiler  # noqa
+from .wrapper import Profiler, profile_module, register_engine  # noqa
 from .utils import get_default_args  # noqa
+from .sampling import EveryN, Probability, TokenBucket  # noqa
+from .aggregate import Aggregate  # noqa
+from .sinks import Sink, BackgroundWriter, ShardWriter, RotatingWriter, RingBuffer, StatsdWriter  # noqa
+from .callgraph import CallGraph  # noqa
+from .threshold import SlowCalls  # noqa
+from .scaling import Scaling  # noqa
+from .registry import enable, disable  # noqa
 
 
 __all__ = [i for i in dir() if not i.startswith('_')]
@@ -0,0 +1,154 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/aggregate.py
+
+"""
+# Python Dependencies
+import atexit
+
+from threading import Lock
+from threading import local
+from time import monotonic
+from typing import Any, Callable, Optional
+
+from . import context
+
+
+class Aggregate:
+    """Aggregation Policy, accumulating profiles across calls into a single report.
+
+    Rather than output a report for every profiled call, a single long-lived profile accumulates
+    results which are flushed to the configured stream periodically.
+
+    Args:
+        interval (float): Flush after this many seconds have elapsed since the previous flush.
+        calls (int): Flush after this many profiled calls have accumulated.
+        at_exit (bool): Flush any remaining results at interpreter exit.
+
+    Notes:
+        - Flush conditions are evaluated after each profiled call completes.
+        - When neither interval nor calls are defined, results are only flushed at exit (or
+          when flushed explicitly via the `flush` attribute of the wrapped function).
+
+    """
+    __slots__ = ("interval", "calls", "at_exit")
+
+    def __init__(self,
+                 interval: Optional[float] = None,
+                 calls: Optional[int] = None,
+                 at_exit: bool = True,
+                 ) -> None:
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Flush interval must be positive: {interval}")
+        if calls is not None and calls < 1:
+            raise ValueError(f"Flush call count must be a positive integer: {calls}")
+
+        self.interval = interval
+        self.calls = calls
+        self.at_exit = at_exit
+
+
+class Accumulator:
+    """Accumulates Profiles of one or more functions according to an Aggregation Policy.
+
+    Each thread accumulates results into its own profile, such that concurrent callers never
+    share an enabled profile. Per-thread profiles are merged into a single report when flushed.
+
+    Args:
+        policy (Aggregate): aggregation policy
+        stream (Statistics): where to output results
+        name (str): name of the profiled function (or session)
+        factory (Callable): creates a new (disabled) profile, e.g. cProfile.Profile
+
+    """
+    __slots__ = ("policy", "stream", "name", "factory", "count", "_slots", "_last", "_lock", "_local")
+
+    def __init__(self, policy: Aggregate, stream: Any, name: str, factory: Callable) -> None:
+        self.policy = policy
+        self.stream = stream
+        self.name = name
+        self.factory = factory
+        self.count = 0
+        self._slots = []
+        self._last = monotonic()
+        self._lock = Lock()
+        self._local = local()
+
+        if policy.at_exit:
+            atexit.register(self.flush)
+
+    def __call__(self, function: Callable, args: tuple, kwargs: dict) -> Any:
+        slot = self.acquire()
+        try:
+            return context.runcall(slot.profile, function, args, kwargs)
+        finally:
+            self.release(slot)
+
+    def acquire(self) -> context.Slot:
+        """Hold the profile of this thread for the duration of a call."""
+        slot = getattr(self._local, "slot", None)
+        with self._lock:
+            if slot is None:
+                slot = self._local.slot = context.Slot(None)
+            if slot.profile is None:
+                slot.profile = self.factory()
+                self._slots.append(slot)
+            slot.depth += 1
+        return slot
+
+    def release(self, slot: context.Slot) -> None:
+        """Release a profile held for the duration of a call, flushing results if due."""
+        with self._lock:
+            slot.depth -= 1
+            if slot.depth:
+                # Recursive calls are folded into the outermost call
+                return
+            self.count += 1
+            policy = self.policy
+            due = (policy.calls is not None and self.count >= policy.calls) or \
+                  (policy.interval is not None and monotonic() - self._last >= policy.interval)
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Output accumulated results (if any) to the stream, merging the profiles of each thread.
+
+        Notes:
+            Profiles held by ongoing calls are left to accumulate, and are output by a later flush.
+
+        """
+        with self._lock:
+            if not self.count:
+                return
+            # Idle profiles are collected, and replaced when their thread next acquires a profile.
+            # Profiles of calls folded into another active profile (see context) recorded nothing.
+            profiles = tuple(slot.profile for slot in self._slots if not slot.depth and slot.profile.getstats())
+            for slot in self._slots:
+                if not slot.depth:
+                    slot.profile = None
+            self._slots = [slot for slot in self._slots if slot.depth]
+            self.count = 0
+            self._last = monotonic()
+
+        if profiles:
+            self.stream.output(profiles, self.name)
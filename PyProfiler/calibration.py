@@ -0,0 +1,262 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/calibration.py
+
+"""
+# Python Dependencies
+import os
+import json
+import platform
+
+from cProfile import Profile
+from pstats import Stats
+from statistics import median
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Optional
+
+from .engines import MONITORING
+from .engines import MonitoringProfile
+from .exporters import MAX_DEPTH
+from .exporters import callees
+
+
+# Globals
+CACHE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "PyProfiler", "calibration.json")
+FACTORIES: Dict[str, Callable] = {
+    "cprofile": Profile,
+    "monitoring": MonitoringProfile if MONITORING else Profile,
+}
+_biases = {}
+_lock = Lock()
+
+
+class Bias:
+    """Instrumentation overhead of a profiling engine, per profiled call (seconds).
+
+    Args:
+        inside (float): overhead attributed to the time of the called function
+        outside (float): overhead attributed to the time of the calling function
+
+    """
+    __slots__ = ("inside", "outside")
+
+    def __init__(self, inside: float, outside: float) -> None:
+        self.inside = inside
+        self.outside = outside
+
+    def __repr__(self) -> str:
+        return f"Bias(inside={self.inside * 1e9:.1f}ns, outside={self.outside * 1e9:.1f}ns)"
+
+
+def _callee() -> None:
+    ...
+
+
+def _loop(n: int) -> None:
+    for _ in range(n):
+        _callee()
+
+
+def _empty(n: int) -> None:
+    for _ in range(n):
+        ...
+
+
+def _best(function: Callable, n: int, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = perf_counter()
+        function(n)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def measure(factory: Callable = Profile, calls: int = 100_000, rounds: int = 5) -> Bias:
+    """Measure the instrumentation overhead of an engine on this machine.
+
+    A loop calling an empty function is timed with and without profiling. The excess time
+    reported for the empty function is its inside bias, and the remainder of the excess time
+    reported for the loop is the outside bias.
+
+    Args:
+        factory (Callable): creates a new (disabled) profile, e.g. cProfile.Profile
+        calls (int): number of calls profiled per round
+        rounds (int): number of rounds (the median bias is kept)
+
+    Returns:
+        (Bias) overhead per profiled call
+
+    """
+    real = _best(_loop, calls, rounds)
+    callee = (real - _best(_empty, calls, rounds)) / calls  # cost of an unprofiled call
+
+    inside, total = [], []
+    for _ in range(rounds):
+        profile = factory()
+        profile.enable()
+        _loop(calls)
+        profile.disable()
+        stats = Stats(profile).stats
+        code_callee, code_loop = _callee.__code__, _loop.__code__
+        tt = stats[(code_callee.co_filename, code_callee.co_firstlineno, code_callee.co_name)][2]
+        ct = stats[(code_loop.co_filename, code_loop.co_firstlineno, code_loop.co_name)][3]
+        inside.append(tt / calls - callee)
+        total.append((ct - real) / calls)
+
+    inside_bias = max(0., median(inside))
+    return Bias(inside_bias, max(0., median(total) - inside_bias))
+
+
+def machine() -> str:
+    """Identify the interpreter and CPU of this machine."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return f"{platform.python_implementation()} {platform.python_version()} | {platform.machine()} | {cpu}"
+
+
+def bias(engine: str = "cprofile", refresh: bool = False, path: Optional[str] = None) -> Bias:
+    """Instrumentation overhead of an engine, measured once and cached on disk.
+
+    Args:
+        engine (str): "cprofile" or "monitoring"
+        refresh (bool): measure again, replacing cached results
+        path (str): cache file (CACHE by default, in the XDG cache directory)
+
+    Returns:
+        (Bias) overhead per profiled call, keyed by engine, interpreter and CPU
+
+    Notes:
+        When the engine is unavailable for measurement (e.g. the interpreter-wide profiler is
+        held by another thread on Python 3.12+), no overhead (zero bias) is returned. It is kept
+        for the rest of the process, but not cached on disk.
+
+    """
+    if engine not in FACTORIES:
+        raise ValueError(f"Calibration is unavailable for engine: {engine}")
+
+    path = path or CACHE
+    key = f"{engine} | {machine()}"
+    with _lock:
+        if not refresh and (path, key) in _biases:
+            return _biases[(path, key)]
+
+        try:
+            with open(path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+
+        if refresh or key not in cache:
+            try:
+                result = measure(FACTORIES[engine])
+            except ValueError:
+                _biases[(path, key)] = result = Bias(0., 0.)
+                return result
+            cache[key] = {"inside": result.inside, "outside": result.outside}
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(f"{path}.{os.getpid()}.tmp", "w") as f:
+                    json.dump(cache, f, indent=2)
+                os.replace(f"{path}.{os.getpid()}.tmp", path)
+            except OSError:
+                pass  # read-only cache: calibrate again in the next process
+
+        _biases[(path, key)] = result = Bias(cache[key]["inside"], cache[key]["outside"])
+        return result
+
+
+def correct(stats: Stats, bias: Bias) -> Stats:
+    """Subtract the instrumentation overhead from the tottime and cumtime of results (in place).
+
+    Args:
+        stats (pstats.Stats): profile results
+        bias (Bias): overhead per profiled call
+
+    Returns:
+        (pstats.Stats) the corrected results
+
+    Notes:
+        The number of calls made beneath each function is estimated from the call counts of
+        the call graph (recursive edges excluded), so corrections of cumtime are approximate.
+        Corrected cumtime is at least the corrected tottime plus the corrected cumtime of its
+        callees.
+
+    """
+    graph = callees(stats)
+    data = stats.stats
+    per_call = {}
+
+    def descendants(key: tuple, active: set, depth: int) -> float:
+        """Estimated number of calls made beneath a single call of key."""
+        if key in per_call:
+            return per_call[key]
+        if key in active or depth > MAX_DEPTH:
+            return 0.
+        active.add(key)
+        calls = sum(edge[1] * (1 + descendants(callee, active, depth + 1))
+                    for callee, edge in graph.get(key, {}).items() if callee != key)
+        active.discard(key)
+        per_call[key] = result = calls / max(data[key][1], 1) if key in data else 0.
+        return result
+
+    both = bias.inside + bias.outside
+    new_tt, new_ct = {}, {}
+    for key, (cc, nc, tt, ct, _) in data.items():
+        subcalls = sum(edge[1] for edge in graph.get(key, {}).values())
+        new_tt[key] = max(0., tt - nc * bias.inside - subcalls * bias.outside)
+        new_ct[key] = max(new_tt[key], ct - cc * bias.inside - cc * descendants(key, set(), 0) * both)
+
+    def scale_ct(key: tuple) -> float:
+        return new_ct[key] / data[key][3] if data[key][3] else 0.
+
+    def settle(key: tuple, active: set, depth: int) -> None:
+        """Bound the cumtime of key by its tottime and the corrected cumtime of its callees."""
+        active.add(key)
+        edges = [(callee, edge) for callee, edge in graph.get(key, {}).items() if callee != key and callee in data]
+        for callee, _ in edges:
+            if callee not in active and callee not in settled and depth < MAX_DEPTH:
+                settle(callee, active, depth + 1)
+        bound = new_tt[key] + sum(edge[3] * scale_ct(callee) for callee, edge in edges)
+        new_ct[key] = min(data[key][3], max(new_ct[key], bound))
+        active.discard(key)
+        settled.add(key)
+
+    settled = set()
+    for key in data:
+        if key not in settled:
+            settle(key, set(), 0)
+
+    corrected = {}
+    for key, (cc, nc, tt, ct, callers) in data.items():
+        scale_tt = new_tt[key] / tt if tt else 0.
+        callers = {k: (v[0], v[1], v[2] * scale_tt, v[3] * scale_ct(key)) for k, v in callers.items()}
+        corrected[key] = (cc, nc, new_tt[key], new_ct[key], callers)
+
+    stats.stats = corrected
+    stats.total_tt = sum(value[2] for value in corrected.values())
+    return stats
@@ -0,0 +1,270 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/callgraph.py
+
+"""
+# Python Dependencies
+import heapq
+
+from fnmatch import fnmatchcase
+from itertools import count
+from pstats import Stats
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .exporters import MAX_DEPTH
+from .exporters import MIN_FRACTION
+from .exporters import entry_points
+from .exporters import label
+
+
+# Globals
+Key = Tuple[str, int, str]  # pstats function key: (filename, line number, function name)
+Edge = Tuple[int, int, float, float]  # (primitive calls, calls, tottime, cumtime)
+
+
+class CallGraph:
+    """Indexed Call Graph of captured profile results, supporting fast queries.
+
+    Callers and callees of every function are indexed in a single pass over the edges (O(edges)),
+    after which queries only visit the part of the graph they concern.
+
+    Args:
+        source (pstats.Stats | str | dict | Any): profile results, i.e. a pstats.Stats, the path of
+            a marshal dump, a raw stats dictionary, or a profile (e.g. cProfile.Profile, or the
+            results of RingBuffer.stats / ShardWriter.collect)
+
+    Example Usage:
+
+        ```python
+
+            from PyProfiler import CallGraph, RingBuffer
+
+            graph = CallGraph(recent.stats(name="handler"))
+            graph.critical_path()             # heaviest chain of calls from the root
+            graph.top_paths(limit=5)          # heaviest call paths (stacks) from the root
+            graph.hotspots(percent=10)        # functions with >= 10% of the root's inclusive time
+            graph.callers(graph.find("*(execute)*")[0])
+        ```
+
+    """
+    __slots__ = ("stats", "_callers", "_callees", "_total", "_bounds_cache")
+
+    def __init__(self, source: Union[Stats, str, dict, Any]) -> None:
+        if isinstance(source, dict):
+            stats = source
+        elif isinstance(source, Stats):
+            stats = source.stats
+        else:
+            stats = Stats(source).stats
+
+        self.stats: Dict[Key, tuple] = stats
+        self._callers: Dict[Key, Dict[Key, Edge]] = {}
+        self._callees: Dict[Key, Dict[Key, Edge]] = {}
+        for callee, (_, _, _, _, callers) in stats.items():
+            self._callers[callee] = callers
+            for caller, edge in callers.items():
+                index = self._callees.get(caller)
+                if index is None:
+                    index = self._callees[caller] = {}
+                index[callee] = edge
+        self._total = sum(value[2] for value in stats.values())
+        self._bounds_cache: Dict[Key, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self.stats
+
+    @property
+    def edges(self) -> int:
+        """Number of caller / callee edges."""
+        return sum(len(i) for i in self._callers.values())
+
+    def callers(self, key: Key) -> Dict[Key, Edge]:
+        """Functions calling key: {caller: (cc, nc, tottime, cumtime)}."""
+        return self._callers.get(key, {})
+
+    def callees(self, key: Key) -> Dict[Key, Edge]:
+        """Functions called by key: {callee: (cc, nc, tottime, cumtime)}."""
+        return self._callees.get(key, {})
+
+    def find(self, pattern: str) -> List[Key]:
+        """Functions whose label (e.g. "name (file.py:12)") or name match a glob pattern."""
+        return [key for key in self.stats if fnmatchcase(label(key), pattern) or fnmatchcase(key[2], pattern)]
+
+    def roots(self) -> List[Key]:
+        """Entry points of the capture, by decreasing inclusive time (see exporters.entry_points)."""
+        return entry_points(self.stats)
+
+    def root(self) -> Optional[Key]:
+        """The root with the largest inclusive time (i.e. the wrapped function of a capture)."""
+        roots = self.roots()
+        return roots[0] if roots else None
+
+    def inclusive(self, key: Key) -> float:
+        """Inclusive time (cumtime) of a function."""
+        return self.stats[key][3]
+
+    def reachable(self, root: Key) -> List[Key]:
+        """Functions reachable from root (including itself), in depth-first order."""
+        seen, stack, result = {root}, [root], []
+        while stack:
+            key = stack.pop()
+            result.append(key)
+            for callee in self.callees(key):
+                if callee not in seen:
+                    seen.add(callee)
+                    stack.append(callee)
+        return result
+
+    def critical_path(self, root: Optional[Key] = None) -> List[Tuple[Key, float]]:
+        """Heaviest chain of calls, following the callee of largest inclusive time from the root.
+
+        Args:
+            root (Key): function from which the path starts (the root of the capture by default)
+
+        Returns:
+            (list) of (function, inclusive time of the call edge leading to it)
+
+        """
+        key = root or self.root()
+        if key is None:
+            return []
+
+        path, seen = [(key, self.stats[key][3])], {key}
+        while len(path) < MAX_DEPTH:
+            candidates = [(edge[3], callee) for callee, edge in self.callees(key).items() if callee not in seen]
+            if not candidates:
+                break
+            time, key = max(candidates)
+            path.append((key, time))
+            seen.add(key)
+        return path
+
+    def _bounds(self, root: Key) -> Dict[Key, float]:
+        """Upper bound of the fraction of a function's inclusive time attributable to a single path.
+
+        Computed once per function in a single depth-first pass over the edges reachable from root
+        (O(edges)), and used to guide the search of `paths` directly towards the heaviest paths.
+        Recursive edges are bounded by 1, so the bounds remain valid whichever path is followed.
+
+        """
+        bounds = self._bounds_cache
+        if root in bounds:
+            return bounds
+
+        stack, active = [(root, iter(self.callees(root)))], {root}
+        while stack:
+            key, callees = stack[-1]
+            for callee in callees:
+                if callee not in bounds and callee not in active:
+                    active.add(callee)
+                    stack.append((callee, iter(self.callees(callee))))
+                    break
+            else:
+                stack.pop()
+                active.discard(key)
+                tt, ct = self.stats[key][2], self.stats[key][3]
+                if not ct:
+                    bounds[key] = 1.
+                    continue
+                bounds[key] = max([min(1., tt / ct)] + [
+                    min(1., edge[3] / ct) * bounds.get(callee, 1.) for callee, edge in self.callees(key).items()
+                ])
+        return bounds
+
+    def paths(self, root: Optional[Key] = None) -> Iterator[Tuple[Tuple[Key, ...], float]]:
+        """Call paths (stacks) from the root, by decreasing time spent in their last function.
+
+        pstats only retains edges, so the time of a function is attributed to each path leading to
+        it in proportion to the cumulative time of each edge (see exporters.stacks). Recursive
+        paths are truncated, and paths below MIN_FRACTION of the root's time are pruned. Paths are
+        generated lazily (best first, guided by `_bounds`), so only the part of the graph leading to
+        the heaviest paths is visited.
+
+        Args:
+            root (Key): function from which paths start (the root of the capture by default)
+
+        Yields:
+            (tuple, float) path of function keys, and the (self) time attributed to its last function
+
+        """
+        root = root or self.root()
+        if root is None:
+            return
+
+        bounds = self._bounds(root)
+        time = self.stats[root][3]
+        threshold = time * MIN_FRACTION
+        tie = count()
+        heap = [(-time * bounds[root], -1, next(tie), (root,), time, False)]
+        while heap:
+            _, _, _, path, time, complete = heapq.heappop(heap)
+            if complete:
+                yield path, time
+                continue
+
+            key = path[-1]
+            _, _, tt, ct, _ = self.stats[key]
+            fraction = min(1., time / ct) if ct else 1.
+            own = tt * fraction
+            if own and own >= threshold:
+                heapq.heappush(heap, (-own, -len(path), next(tie), path, own, True))
+            if len(path) >= MAX_DEPTH:
+                continue
+            for callee, edge in self.callees(key).items():
+                attributed = min(edge[3] * fraction, time)
+                if attributed >= threshold and callee not in path:
+                    priority = attributed * bounds.get(callee, 1.)
+                    heapq.heappush(heap, (-priority, -len(path) - 1, next(tie), path + (callee,), attributed, False))
+
+    def top_paths(self, limit: int = 10, root: Optional[Key] = None) -> List[Tuple[Tuple[Key, ...], float]]:
+        """The limit call paths from the root with the most time spent in their last function (see `paths`)."""
+        result = []
+        for item in self.paths(root):
+            result.append(item)
+            if len(result) >= limit:
+                break
+        return result
+
+    def hotspots(self, percent: float, root: Optional[Key] = None) -> List[Tuple[Key, float]]:
+        """Functions whose inclusive time exceeds a percentage of the root's inclusive time.
+
+        Args:
+            percent (float): threshold, as a percentage (e.g. 5 for 5%)
+            root (Key): reference function, restricting results to the functions it reaches (the
+                root of the capture by default, considering every function)
+
+        Returns:
+            (list) of (function, percentage), by decreasing inclusive time
+
+        """
+        keys = self.stats if root is None else self.reachable(root)
+        root = root or self.root()
+        reference = self.stats[root][3] if root is not None else self._total
+        if not reference:
+            return []
+        result = [(key, self.stats[key][3] / reference * 100) for key in keys
+                  if self.stats[key][3] / reference * 100 >= percent]
+        return sorted(result, key=lambda item: item[1], reverse=True)
@@ -0,0 +1,257 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/cli.py
+
+"""
+# Python Dependencies
+import os
+import argparse
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from fnmatch import fnmatch
+from itertools import islice
+from pstats import Stats
+from pstats import add_callers
+from pstats import add_func_stats
+from sys import stdout
+from typing import IO, Iterable, Iterator, List, Optional
+
+from . import utils
+from .errors import InvalidSortingMethod
+from .exporters import label
+from .exporters import Dump
+from .sinks import load
+
+
+# Globals
+PATTERN = "*.prof*"
+CHUNKSIZE = 64
+
+
+def discover(paths: Iterable[str], pattern: str = PATTERN) -> Iterator[str]:
+    """Lazily yield dump files, walking directories for files matching pattern.
+
+    Args:
+        paths (Iterable[str]): files and / or directories of dumps
+        pattern (str): glob pattern of dump file names within directories
+
+    Yields:
+        (str) path of a dump file
+
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, _, files in os.walk(path):
+            for file in sorted(files):
+                if fnmatch(file, pattern) and not file.endswith(".tmp"):
+                    yield os.path.join(root, file)
+
+
+def chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items, without consuming it entirely."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def combine(target: dict, source: dict) -> dict:
+    """Merge the raw stats dictionary source into target (in place), as pstats.Stats.add does.
+
+    Args:
+        target (dict): raw stats dictionary updated in place
+        source (dict): raw stats dictionary to add
+
+    Returns:
+        (dict) target
+
+    """
+    for key, value in source.items():
+        if key in target:
+            target[key] = add_func_stats(target[key], value)
+        else:
+            cc, nc, tt, ct, callers = value
+            target[key] = (cc, nc, tt, ct, add_callers({}, callers))
+    return target
+
+
+def _merge_chunk(paths: List[str]) -> dict:
+    """Merge a chunk of dumps (executed by worker processes)."""
+    result = {}
+    for path in paths:
+        combine(result, load(path))
+    return result
+
+
+def merge(paths: Iterable[str], workers: Optional[int] = None, chunksize: int = CHUNKSIZE) -> Optional[Stats]:
+    """Merge many dumps into a single Stats, using a pool of processes.
+
+    Dumps are streamed in chunks to the workers, each returning a single partial result which is
+    folded into the total as it arrives, so that only a bounded number of dumps are held in
+    memory at once.
+
+    Args:
+        paths (Iterable[str]): dump files (see `discover`)
+        workers (int): number of worker processes (os.cpu_count() by default, 1 to merge in process)
+        chunksize (int): number of dumps merged by a worker per task
+
+    Returns:
+        (pstats.Stats | None) the merged results, None if no dumps were found
+
+    """
+    total = None
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for partial in map(_merge_chunk, chunks(paths, chunksize)):
+            total = partial if total is None else combine(total, partial)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            pending = set()
+            for chunk in chunks(paths, chunksize):
+                pending.add(pool.submit(_merge_chunk, chunk))
+                # Bound the number of partial results in flight
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        partial = future.result()
+                        total = partial if total is None else combine(total, partial)
+            for future in pending:
+                partial = future.result()
+                total = partial if total is None else combine(total, partial)
+
+    return None if total is None else Stats(Dump(total))
+
+
+def top(stats: Stats, sortby: str = "cumulative", limit: int = 20, stream: Optional[IO] = None) -> None:
+    """Output the top functions of a profile.
+
+    Args:
+        stats (pstats.Stats): profile results
+        sortby (str | pstats.SortKey): method used to sort results
+        limit (int): number of functions to output
+        stream (IO): where to output results (stdout by default)
+
+    """
+    utils.is_valid_sortkey(sortby)
+    stats.stream = stream or stdout
+    stats.sort_stats(sortby).print_stats(limit)
+
+
+def diff(before: Stats, after: Stats, by: str = "tottime") -> List[tuple]:
+    """Rank functions by regression between two profiles.
+
+    Args:
+        before (pstats.Stats): baseline profile
+        after (pstats.Stats): profile to compare with the baseline
+        by (str): "tottime" or "cumtime"
+
+    Returns:
+        (list) of (delta seconds, before seconds, after seconds, before calls, after calls, key),
+        largest regression first
+
+    """
+    index = {"tottime": 2, "cumtime": 3}[by]
+    empty = (0, 0, 0., 0., {})
+    rows = []
+    for key in before.stats.keys() | after.stats.keys():
+        a = before.stats.get(key, empty)
+        b = after.stats.get(key, empty)
+        rows.append((b[index] - a[index], a[index], b[index], a[1], b[1], key))
+    rows.sort(key=lambda i: i[0], reverse=True)
+    return rows
+
+
+def _sortkey(value: str) -> str:
+    try:
+        utils.is_valid_sortkey(value)
+    except InvalidSortingMethod as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def _load(paths: List[str], args) -> Stats:
+    stats = merge(discover(paths, args.pattern), args.workers, args.chunksize)
+    if stats is None:
+        raise SystemExit(f"No profile dumps found: {' '.join(paths)}")
+    return stats
+
+
+def parser() -> argparse.ArgumentParser:
+    """Argument parser of the `python -m PyProfiler` command line tool."""
+    main_parser = argparse.ArgumentParser(prog="python -m PyProfiler",
+                                          description="Merge, summarize and compare binary profile dumps.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: cpu count)")
+    common.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="dumps merged per worker task")
+    common.add_argument("--pattern", default=PATTERN, help=f"dump file names within directories (default: {PATTERN})")
+    commands = main_parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("merge", parents=[common], help="merge dumps into a single dump")
+    command.add_argument("paths", nargs="+", help="dump files or directories")
+    command.add_argument("-o", "--output", required=True, help="path of the merged dump")
+
+    command = commands.add_parser("top", parents=[common], help="print the top functions of merged dumps")
+    command.add_argument("paths", nargs="+", help="dump files or directories")
+    command.add_argument("-s", "--sort", type=_sortkey, default="cumulative", help="pstats sort key")
+    command.add_argument("-n", "--limit", type=int, default=20, help="number of functions")
+
+    command = commands.add_parser("diff", parents=[common], help="rank functions by regression")
+    command.add_argument("before", help="baseline dump file or directory")
+    command.add_argument("after", help="dump file or directory to compare")
+    command.add_argument("-b", "--by", choices=["tottime", "cumtime"], default="tottime", help="time compared")
+    command.add_argument("-n", "--limit", type=int, default=20, help="number of functions")
+
+    return main_parser
+
+
+def main(argv: Optional[List[str]] = None, stream: Optional[IO] = None) -> int:
+    """Entry point of the `python -m PyProfiler` command line tool.
+
+    Args:
+        argv (list): command line arguments (sys.argv[1:] by default)
+        stream (IO): where to output results (stdout by default)
+
+    Returns:
+        (int) exit status
+
+    """
+    args = parser().parse_args(argv)
+    stream = stream or stdout
+
+    if args.command == "merge":
+        _load(args.paths, args).dump_stats(args.output)
+    elif args.command == "top":
+        top(_load(args.paths, args), args.sort, args.limit, stream)
+    elif args.command == "diff":
+        rows = diff(_load([args.before], args), _load([args.after], args), args.by)
+        stream.write(f"{'delta':>12} {'before':>12} {'after':>12} {'calls':>15}  function\n")
+        for delta, a, b, ca, cb, key in rows[:args.limit]:
+            stream.write(f"{delta:>+12.6f} {a:>12.6f} {b:>12.6f} {f'{ca}->{cb}':>15}  {label(key)}\n")
+
+    return 0
@@ -0,0 +1,104 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/context.py
+
+"""
+# Python Dependencies
+from threading import local
+from typing import Any, Callable
+
+
+# Globals
+_state = local()
+
+
+class Slot:
+    """A Profile held by a (possibly ongoing) profiled call.
+
+    Args:
+        profile (cProfile.Profile): profile recording results
+        depth (int): number of ongoing calls holding the profile
+
+    """
+    __slots__ = ("profile", "depth")
+
+    def __init__(self, profile, depth: int = 0) -> None:
+        self.profile = profile
+        self.depth = depth
+
+
+def active() -> Any:
+    """Return the profile currently enabled in this thread (by any Profiler), else None."""
+    return getattr(_state, "profile", None)
+
+
+def enable(profile) -> bool:
+    """Enable a profile in this thread, unless a profile is already active.
+
+    Args:
+        profile (cProfile.Profile): profile to enable
+
+    Returns:
+        (bool) True if the profile was enabled (and must be disabled by the caller). False if the
+        call is instead folded into the profile already active in this thread, or if profiling is
+        unavailable (e.g. another thread holds the interpreter-wide profiler on Python 3.12+).
+
+    """
+    if getattr(_state, "profile", None) is not None:
+        return False
+
+    try:
+        profile.enable()
+    except ValueError:
+        return False
+
+    _state.profile = profile
+    return True
+
+
+def disable(profile) -> None:
+    """Disable a profile previously enabled in this thread."""
+    profile.disable()
+    _state.profile = None
+
+
+def runcall(profile, function: Callable, args: tuple, kwargs: dict) -> Any:
+    """Call a function, recording results with the profile if no other profile is active.
+
+    Args:
+        profile (cProfile.Profile): profile to record results
+        function (Callable): function to call
+        args (tuple): Positional argument values delivered to function
+        kwargs (dict): Keyword argument values delivered to function
+
+    Returns:
+        (Any) the result of the function
+
+    """
+    if not enable(profile):
+        return function(*args, **kwargs)
+
+    try:
+        return function(*args, **kwargs)
+    finally:
+        disable(profile)
@@ -0,0 +1,94 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/coroutines.py
+
+"""
+# Python Dependencies
+from types import coroutine
+from typing import Any, Awaitable
+
+from . import context
+
+
+@coroutine
+def stepped(awaitable: Awaitable, profile) -> Any:
+    """Await an object, enabling the profile only while it executes (excluding suspensions).
+
+    Each resumption of the awaitable is driven manually, such that time spent suspended in the
+    event loop (e.g. awaiting I/O, or executing other tasks) is not recorded by the profile.
+
+    Args:
+        awaitable (Awaitable): coroutine (or other awaitable) to drive
+        profile (cProfile.Profile): profile enabled while the awaitable executes
+
+    Returns:
+        (Any) the result of the awaitable
+
+    """
+    iterator = awaitable.__await__()
+    send, throw = iterator.send, iterator.throw
+    value, error = None, None
+
+    while True:
+        enabled = context.enable(profile)
+        try:
+            yielded = send(value) if error is None else throw(error)
+        except StopIteration as e:
+            return e.value
+        finally:
+            if enabled:
+                context.disable(profile)
+
+        try:
+            value, error = (yield yielded), None
+        except BaseException as e:
+            value, error = None, e
+
+
+async def awaited(awaitable: Awaitable, profile) -> Any:
+    """Await an object, enabling the profile for its entire duration (including suspensions).
+
+    Args:
+        awaitable (Awaitable): coroutine (or other awaitable) to await
+        profile (cProfile.Profile): profile enabled while awaiting
+
+    Returns:
+        (Any) the result of the awaitable
+
+    Notes:
+        cProfile records the entire thread, so other tasks executed by the event loop while the
+        awaitable is suspended are also recorded.
+
+    """
+    if not context.enable(profile):
+        return await awaitable
+
+    try:
+        return await awaitable
+    finally:
+        context.disable(profile)
+
+
+async def plain(awaitable: Awaitable, profile) -> Any:
+    """Await an object without profiling."""
+    return await awaitable
@@ -0,0 +1,226 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/engines.py
+
+"""
+# Python Dependencies
+import sys
+
+from threading import get_ident
+from time import perf_counter_ns
+from types import BuiltinFunctionType
+from types import ClassMethodDescriptorType
+from types import MethodDescriptorType
+from types import ModuleType
+from types import WrapperDescriptorType
+from typing import Any, Optional
+
+
+# Globals
+MONITORING = hasattr(sys, "monitoring")  # PEP 669, Python 3.12+
+DESCRIPTORS = (MethodDescriptorType, WrapperDescriptorType, ClassMethodDescriptorType)
+
+
+class Engine:
+    """Base Profiling Engine, recording the results of profiled calls.
+
+    An engine is created (by a factory supplied to `register_engine`) for every profiled call, or
+    for every aggregated session, and must be compatible with `pstats.Stats`.
+
+    Notes:
+        - Only one profile is enabled at once in a given thread (see PyProfiler.context). When
+          enable raises ValueError (e.g. the profiler is held by another thread), the call is
+          instead executed without profiling.
+
+    """
+    __slots__ = ()
+
+    def enable(self) -> None:
+        """Start recording the calls of the current thread."""
+        raise NotImplementedError
+
+    def disable(self) -> None:
+        """Stop recording calls."""
+        raise NotImplementedError
+
+    def getstats(self) -> list:
+        """Recorded results, empty (i.e. False) if nothing was recorded."""
+        raise NotImplementedError
+
+    def create_stats(self) -> None:
+        """Populate the `stats` attribute, in pstats format: {(filename, line, name): (cc, nc, tt, ct, callers)}"""
+        raise NotImplementedError
+
+
+def builtin_key(function: Any) -> Optional[tuple]:
+    """pstats key of a builtin function or method (as labelled by cProfile), None for other callables."""
+    kind = type(function)
+    if kind is BuiltinFunctionType:
+        owner = function.__self__
+        if owner is None or isinstance(owner, ModuleType):
+            module = function.__module__ or getattr(owner, "__name__", "builtins")
+            return "~", 0, f"<built-in method {module}.{function.__name__}>"
+        return "~", 0, f"<method '{function.__name__}' of '{type(owner).__name__}' objects>"
+    if kind in DESCRIPTORS:
+        return "~", 0, f"<method '{function.__name__}' of '{function.__objclass__.__name__}' objects>"
+    return None
+
+
+class MonitoringProfile(Engine):
+    """Deterministic Profiler built on sys.monitoring (PEP 669), producing pstats compatible results.
+
+    Only events of the thread which enabled the profile are recorded, i.e. the call tree of the
+    profiled call. Python function calls (including resumptions of generators and coroutines) are
+    recorded, as well as calls of builtin functions and methods.
+
+    Args:
+        builtins (bool): Record calls of builtin functions and methods (as cProfile does).
+        saturate (int): Optionally stop recording a function after this many calls, disabling its
+            events (sys.monitoring.DISABLE) to eliminate the overhead of hot functions. The
+            statistics of saturated functions then cover their first calls only.
+
+    Notes:
+        - Requires Python 3.12+. Use the "monitoring" engine of Profiler, which falls back to
+          cProfile on older interpreters.
+        - As with cProfile on Python 3.12+, a single profile may be enabled at once (interpreter
+          wide), using the sys.monitoring PROFILER_ID tool.
+
+    """
+    __slots__ = ("builtins", "saturate", "stats", "_data", "_stack", "_active", "_counts", "_thread")
+
+    def __init__(self, builtins: bool = True, saturate: Optional[int] = None) -> None:
+        if not MONITORING:
+            raise RuntimeError("sys.monitoring is unavailable (Python 3.12+ is required).")
+        if saturate is not None and saturate < 1:
+            raise ValueError(f"Saturation must be a positive number of calls: {saturate}")
+
+        self.builtins = builtins
+        self.saturate = saturate
+        self.stats = {}
+        self._data = {}
+        self._stack = []
+        self._active = {}
+        self._counts = {}
+        self._thread = None
+
+    def enable(self) -> None:
+        monitoring = sys.monitoring
+        tool, events = monitoring.PROFILER_ID, monitoring.events
+        monitoring.use_tool_id(tool, "PyProfiler")  # ValueError when held by another profiler
+
+        self._thread = get_ident()
+        monitoring.register_callback(tool, events.PY_START, self._start)
+        monitoring.register_callback(tool, events.PY_RESUME, self._start)
+        monitoring.register_callback(tool, events.PY_THROW, self._start)
+        monitoring.register_callback(tool, events.PY_RETURN, self._return)
+        monitoring.register_callback(tool, events.PY_YIELD, self._return)
+        monitoring.register_callback(tool, events.PY_UNWIND, self._return)
+        selected = events.PY_START | events.PY_RESUME | events.PY_THROW | events.PY_RETURN \
+            | events.PY_YIELD | events.PY_UNWIND
+        if self.builtins:
+            monitoring.register_callback(tool, events.CALL, self._call)
+            monitoring.register_callback(tool, events.C_RETURN, self._c_return)
+            monitoring.register_callback(tool, events.C_RAISE, self._c_return)
+            selected |= events.CALL | events.C_RETURN | events.C_RAISE
+        monitoring.set_events(tool, selected)
+
+    def disable(self) -> None:
+        monitoring = sys.monitoring
+        tool = monitoring.PROFILER_ID
+        monitoring.set_events(tool, 0)
+        for event in (monitoring.events.PY_START, monitoring.events.PY_RESUME, monitoring.events.PY_THROW,
+                      monitoring.events.PY_RETURN, monitoring.events.PY_YIELD, monitoring.events.PY_UNWIND,
+                      monitoring.events.CALL, monitoring.events.C_RETURN, monitoring.events.C_RAISE):
+            monitoring.register_callback(tool, event, None)
+        monitoring.free_tool_id(tool)
+        if self.saturate is not None:
+            monitoring.restart_events()  # events disabled by saturation apply interpreter wide
+
+        # Calls still ongoing (i.e. disabling the profile itself) are discarded
+        self._stack.clear()
+        self._active.clear()
+        self._thread = None
+
+    def _push(self, key: tuple, marker: Any) -> None:
+        self._stack.append([key, perf_counter_ns(), 0, marker])
+        self._active[key] = self._active.get(key, 0) + 1
+
+    def _pop(self) -> None:
+        key, start, subcalls, _ = self._stack.pop()
+        elapsed = perf_counter_ns() - start
+        stack, active = self._stack, self._active
+        active[key] -= 1
+        recursive = active[key] > 0
+
+        data = self._data.get(key)
+        if data is None:
+            data = self._data[key] = [0, 0, 0, 0, {}]
+        edges = [data]
+        if stack:
+            stack[-1][2] += elapsed
+            edge = data[4].get(stack[-1][0])
+            if edge is None:
+                edge = data[4][stack[-1][0]] = [0, 0, 0, 0]
+            edges.append(edge)
+
+        for item in edges:
+            item[1] += 1
+            item[2] += elapsed - subcalls
+            if not recursive:
+                item[0] += 1
+                item[3] += elapsed
+
+    def _start(self, code, offset: int, exception: Any = None):
+        if get_ident() != self._thread:
+            return
+        if self.saturate is not None:
+            count = self._counts.get(code, 0)
+            if count >= self.saturate:
+                return sys.monitoring.DISABLE
+            self._counts[code] = count + 1
+        self._push((code.co_filename, code.co_firstlineno, code.co_name), sys._getframe(1))
+
+    def _return(self, code, offset: int, value: Any):
+        # Returns of calls started before enable, or of saturated functions, are ignored
+        if get_ident() == self._thread and self._stack and self._stack[-1][3] is sys._getframe(1):
+            self._pop()
+
+    def _call(self, code, offset: int, function: Any, arg0: Any):
+        if get_ident() != self._thread:
+            return
+        key = builtin_key(function)
+        if key is not None:
+            self._push(key, function)
+
+    def _c_return(self, code, offset: int, function: Any, arg0: Any):
+        if get_ident() == self._thread and self._stack and self._stack[-1][3] is function:
+            self._pop()
+
+    def getstats(self) -> list:
+        return list(self._data)
+
+    def create_stats(self) -> None:
+        self.stats = {
+            key: (cc, nc, tt / 1e9, ct / 1e9, {k: (v[0], v[1], v[2] / 1e9, v[3] / 1e9) for k, v in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in self._data.items()
+        }
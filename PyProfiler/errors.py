@@ -33,3 +33,18 @@ class InvalidMode(Exception):
 class InvalidSortingMethod(Exception):
     """Invalid Sorting Method"""
     ...
+
+
+class InvalidEngine(Exception):
+    """Invalid Profiling Engine"""
+    ...
+
+
+class InvalidFormat(Exception):
+    """Invalid Output Format"""
+    ...
+
+
+class InvalidCompression(Exception):
+    """Invalid Compression Method"""
+    ...
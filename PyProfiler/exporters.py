@@ -0,0 +1,212 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/exporters.py
+
+"""
+# Python Dependencies
+import json
+import marshal
+
+from os.path import abspath
+from os.path import basename
+from os.path import dirname
+from os.path import sep
+from pstats import Stats
+from typing import Callable, Dict, IO, Iterator, Tuple
+
+
+# Globals
+MIN_FRACTION = 1e-6  # prune call paths contributing less than this fraction of total time
+MAX_DEPTH = 256
+_PACKAGE = dirname(abspath(__file__)) + sep
+
+
+class Dump:
+    """Loaded marshal dump, accepted by `pstats.Stats` as though it were a profile."""
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        ...
+
+
+def label(key: tuple) -> str:
+    """Readable label of a pstats function key (filename, line number, function name)."""
+    filename, line, name = key
+    if filename == "~" and line == 0:
+        return name  # builtins
+    return f"{name} ({basename(filename)}:{line})"
+
+
+def is_profiler(key: tuple) -> bool:
+    """Whether a pstats function key belongs to the profiler itself (e.g. context.disable)."""
+    filename, line, name = key
+    return filename.startswith(_PACKAGE) or (filename == "~" and name.startswith("<method 'disable' of "))
+
+
+def entry_points(stats: dict) -> list:
+    """Entry points of a profile (e.g. the wrapped function of a capture), by decreasing cumtime.
+
+    Entry points are the functions without callers, other than themselves (i.e. recursive calls),
+    excluding the frames of the profiler itself. Should every function have callers (e.g. mutually
+    recursive functions), the function of largest cumtime is the entry point.
+
+    Args:
+        stats (dict): raw pstats dictionary {(filename, line, name): (cc, nc, tt, ct, callers)}
+
+    Returns:
+        (list) of function keys
+
+    """
+    keys = [key for key in stats if not is_profiler(key)]
+    result = [key for key in keys if not any(caller != key for caller in stats[key][4])]
+    if not result and keys:
+        result = [max(keys, key=lambda key: stats[key][3])]
+    return sorted(result, key=lambda key: stats[key][3], reverse=True)
+
+
+def callees(stats: Stats) -> Dict[tuple, Dict[tuple, tuple]]:
+    """Invert caller relations of pstats into {caller: {callee: (cc, nc, tt, ct)}}."""
+    result = {key: {} for key in stats.stats}
+    for callee, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            result.setdefault(caller, {})[callee] = edge
+    return result
+
+
+def stacks(stats: Stats) -> Iterator[Tuple[tuple, float]]:
+    """Reconstruct call stacks (root to leaf) with the self time (seconds) attributed to each.
+
+    pstats only retains caller / callee edges (not complete stacks), so the time of a function is
+    attributed to each path leading to it in proportion to the cumulative time of each edge.
+    Stacks start from the entry points of the profile, excluding the frames of the profiler
+    itself. Recursive paths are truncated, and paths contributing less than MIN_FRACTION of the
+    total time are pruned.
+
+    Args:
+        stats (pstats.Stats): profile statistics
+
+    Yields:
+        (tuple, float) stack of function keys, and the self time attributed to the stack
+
+    """
+    children = callees(stats)
+    total = sum(value[2] for key, value in stats.stats.items() if not is_profiler(key)) or 1.
+    threshold = total * MIN_FRACTION
+
+    def descend(path: tuple, key: tuple, time: float):
+        cc, nc, tt, ct, _ = stats.stats[key]
+        fraction = min(1., time / ct) if ct else 1.
+        if tt * fraction > 0:
+            yield path, tt * fraction
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge in children.get(key, {}).items():
+            attributed = edge[3] * fraction
+            if callee in path or attributed < threshold or is_profiler(callee):
+                continue
+            yield from descend(path + (callee,), callee, attributed)
+
+    for root in entry_points(stats.stats):
+        yield from descend((root,), root, stats.stats[root][3])
+
+
+def pstats_text(stats: Stats, stream: IO, name: str, sortby) -> None:
+    """The standard pstats text table."""
+    stream.write(f"Profiling {name}()\n")
+    stats.stream = stream
+    stats.sort_stats(sortby)
+    stats.print_stats()
+
+
+def collapsed(stats: Stats, stream: IO, name: str, sortby) -> None:
+    """Brendan Gregg's collapsed stack format ("root;caller;leaf microseconds" per line).
+
+    Loadable by flamegraph.pl, speedscope, and most flamegraph viewers.
+
+    """
+    for path, time in stacks(stats):
+        value = round(time * 1e6)
+        if value:
+            stream.write(f"{';'.join(label(key) for key in path)} {value}\n")
+
+
+def speedscope(stats: Stats, stream: IO, name: str, sortby) -> None:
+    """Speedscope JSON (sampled profile, weighted in seconds). See https://www.speedscope.app"""
+    frames, index, samples, weights = [], {}, [], []
+    for path, time in stacks(stats):
+        for key in path:
+            if key not in index:
+                index[key] = len(frames)
+                frames.append({"name": key[2], "file": key[0], "line": key[1]})
+        samples.append([index[key] for key in path])
+        weights.append(time)
+
+    json.dump({
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+        "name": name,
+        "exporter": "PyProfiler",
+    }, stream)
+    stream.write("\n")
+
+
+def callgrind(stats: Stats, stream: IO, name: str, sortby) -> None:
+    """Callgrind format (times in microseconds), loadable by KCachegrind / QCachegrind."""
+    stream.write(f"# callgrind format\nversion: 1\ncreator: PyProfiler\ncmd: {name}\n")
+    stream.write("positions: line\nevents: Microseconds\n\n")
+    for key, edges in callees(stats).items():
+        if key not in stats.stats or is_profiler(key):
+            continue
+        filename, line, function = key
+        stream.write(f"fl={filename}\nfn={function}:{line}\n{line} {round(stats.stats[key][2] * 1e6)}\n")
+        for (c_filename, c_line, c_function), (cc, nc, tt, ct) in edges.items():
+            if is_profiler((c_filename, c_line, c_function)):
+                continue
+            stream.write(f"cfl={c_filename}\ncfn={c_function}:{c_line}\ncalls={nc} {c_line}\n{line} {round(ct * 1e6)}\n")
+        stream.write("\n")
+
+
+def binary(stats: Stats, stream: IO, name: str, sortby) -> None:
+    """Binary (marshal) dump, as written by `pstats.Stats.dump_stats`. Requires a binary stream."""
+    stream.write(marshal.dumps(stats.stats))
+
+
+FORMATS: Dict[str, Callable] = {
+    "pstats": pstats_text,
+    "marshal": binary,
+    "collapsed": collapsed,
+    "speedscope": speedscope,
+    "callgrind": callgrind,
+}
@@ -0,0 +1,175 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/histogram.py
+
+"""
+# Python Dependencies
+import json
+
+from array import array
+from typing import Dict, IO, Optional
+
+
+# Globals
+SUB_BITS = 4  # 16 linear sub-buckets per power of two (relative error < 1 / 16)
+SUB_BUCKETS = 1 << SUB_BITS
+LINEAR = SUB_BUCKETS << 1
+BUCKETS = (64 - SUB_BITS) * SUB_BUCKETS + LINEAR
+
+_registry: Dict[str, "Timings"] = {}
+
+
+def bucket_index(value: int) -> int:
+    """Log-Linear bucket index of a (non-negative) integer value."""
+    shift = value.bit_length() - SUB_BITS - 1
+    if shift <= 0:
+        return value
+    return shift * SUB_BUCKETS + (value >> shift)
+
+
+def bucket_bounds(index: int) -> tuple:
+    """Inclusive lower and upper bound of values recorded in a given bucket."""
+    if index < LINEAR:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index - shift * SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """Compact, array backed Log-Linear Histogram of integer values (e.g. nanoseconds).
+
+    Values are recorded into buckets whose width grows with the magnitude of the value, keeping
+    a bounded relative error (~6%) with a fixed memory footprint, regardless of the number of
+    values recorded.
+
+    Notes:
+        Updates are not synchronized. Under heavy contention from many threads, a concurrent
+        update may rarely be lost, which is acceptable for latency statistics.
+
+    """
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Record a single (non-negative) integer value."""
+        shift = value.bit_length() - SUB_BITS - 1
+        self.counts[value if shift <= 0 else shift * SUB_BUCKETS + (value >> shift)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> int:
+        """Estimate the value at a given percentile (between 0 and 100).
+
+        Args:
+            p (float): percentile
+
+        Returns:
+            (int) midpoint of the bucket containing the percentile (0 if no values are recorded)
+
+        """
+        if not self.count:
+            return 0
+
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                lower, upper = bucket_bounds(index)
+                return min((lower + upper) // 2, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Summarize recorded values as count, mean, p50, p90, p99 and max."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def clear(self) -> None:
+        """Discard all recorded values."""
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = self.total = self.max = 0
+
+
+class Timings:
+    """Wall clock and CPU time Histograms (in nanoseconds) of a single function.
+
+    Args:
+        name (str): name of the function, under which timings are registered
+
+    """
+    __slots__ = ("name", "wall", "cpu")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.wall = Histogram()
+        self.cpu = Histogram()
+
+    def record(self, wall: int, cpu: int) -> None:
+        self.wall.record(wall)
+        self.cpu.record(cpu)
+
+    def summary(self) -> dict:
+        return {"wall": self.wall.summary(), "cpu": self.cpu.summary()}
+
+
+def register(name: str) -> Timings:
+    """Return the Timings registered under a name, registering new Timings if necessary."""
+    timings = _registry.get(name)
+    if timings is None:
+        timings = _registry[name] = Timings(name)
+    return timings
+
+
+def registered() -> Dict[str, Timings]:
+    """Return a copy of the registry of all Timings."""
+    return dict(_registry)
+
+
+def dump(stream: Optional[IO] = None) -> dict:
+    """Export summaries of every registered Timings.
+
+    Args:
+        stream (IO): Optionally, write summaries as JSON to this stream
+
+    Returns:
+        (dict) {name: {"wall": summary, "cpu": summary}} of all registered functions (nanoseconds)
+
+    """
+    summaries = {name: timings.summary() for name, timings in sorted(_registry.items())}
+    if stream is not None:
+        json.dump(summaries, stream, indent=2)
+    return summaries
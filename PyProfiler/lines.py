@@ -0,0 +1,286 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/lines.py
+
+"""
+# Python Dependencies
+import os
+import sys
+import inspect
+import linecache
+
+from threading import get_ident
+from time import perf_counter_ns
+from types import CodeType, FrameType
+from typing import Any, Dict, IO, Optional, Tuple
+
+from .engines import MONITORING
+from .exporters import label
+
+
+# Globals
+_PACKAGE = os.path.dirname(os.path.abspath(__file__)) + os.sep
+Key = Tuple[str, int, str]  # (filename, first line number, function name)
+
+
+class LineProfile:
+    """Line Level Profile, recording the hits and time of each line of the profiled function.
+
+    The profiled function is the function called (or resumed) by the wrapper which enabled the
+    profile, and optionally, the functions it calls directly. Only the code of these functions is
+    traced line by line: on Python 3.12+ with sys.monitoring LINE events, enabled locally on their
+    code objects, and otherwise with sys.settrace, tracing only their frames.
+
+    The time of a line lasts until the next line of the same frame starts (or the frame returns), and
+    hence includes the time of the functions it calls.
+
+    Args:
+        callees (bool): Also trace the functions called directly by the profiled function.
+        settrace (bool): Use sys.settrace, even when sys.monitoring is available.
+
+    Notes:
+        - As with cProfile on Python 3.12+, a single profile may be enabled at once (interpreter
+          wide, using the sys.monitoring PROFILER_ID tool). With sys.settrace, a profile cannot be
+          enabled while another trace function (e.g. a debugger, or coverage) is set.
+        - Only the thread which enabled the profile is traced.
+
+    """
+    __slots__ = ("callees", "settrace", "profile", "lines", "calls", "_codes", "_frames", "_origins",
+                 "_thread", "_previous")
+
+    def __init__(self, callees: bool = False, settrace: bool = False) -> None:
+        self.callees = callees
+        self.settrace = settrace or not MONITORING
+        self.profile = None  # line profiles are standalone (see utils.output_stats)
+        self.lines: Dict[Key, Dict[int, list]] = {}  # {function: {line number: [hits, nanoseconds]}}
+        self.calls: Dict[Key, int] = {}
+        self._codes: Dict[CodeType, Key] = {}
+        self._frames: Dict[FrameType, list] = {}  # {frame: [current line number, start]}
+        self._origins = ()
+        self._thread = None
+        self._previous = None
+
+    def _select(self, frame: FrameType) -> Optional[Key]:
+        """Key of a frame's code, if traced (i.e. the profiled function, or one of its callees)."""
+        code = frame.f_code
+        key = self._codes.get(code)
+        if key is not None:
+            return key
+        caller = frame.f_back
+        if code.co_filename.startswith(_PACKAGE) or not (
+            caller in self._origins or (self.callees and caller is not None and caller.f_code in self._codes
+                                        and caller.f_back in self._origins)
+        ):
+            return None
+
+        key = self._codes[code] = (code.co_filename, code.co_firstlineno, code.co_name)
+        self.lines.setdefault(key, {})
+        self.calls.setdefault(key, 0)
+        if not self.settrace:
+            events = sys.monitoring.events
+            sys.monitoring.set_local_events(sys.monitoring.PROFILER_ID, code,
+                                            events.LINE | events.PY_RETURN | events.PY_YIELD)
+        return key
+
+    def enable(self) -> None:
+        # The wrapper (and helpers) enabling the profile, whose calls are those of the profiled function
+        frame, origins = sys._getframe(1), []
+        while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE):
+            origins.append(frame)
+            frame = frame.f_back
+        origins = origins or [sys._getframe(1)]  # enabled directly
+
+        if self.settrace:
+            if sys.gettrace() is not None:
+                raise ValueError("Another trace function is set (e.g. a debugger, or coverage).")
+            self._origins, self._thread = tuple(origins), get_ident()
+            sys.settrace(self._trace)
+            return
+
+        monitoring = sys.monitoring
+        tool, events = monitoring.PROFILER_ID, monitoring.events
+        monitoring.use_tool_id(tool, "PyProfiler")  # ValueError when held by another profiler
+        self._origins, self._thread = tuple(origins), get_ident()
+        monitoring.register_callback(tool, events.PY_START, self._start)
+        monitoring.register_callback(tool, events.PY_RESUME, self._resume)
+        monitoring.register_callback(tool, events.LINE, self._line)
+        monitoring.register_callback(tool, events.PY_RETURN, self._return)
+        monitoring.register_callback(tool, events.PY_YIELD, self._return)
+        monitoring.register_callback(tool, events.PY_UNWIND, self._return)
+        monitoring.set_events(tool, events.PY_START | events.PY_RESUME | events.PY_UNWIND)
+        # Traced functions are enabled locally, as they are first called
+        for code in self._codes:
+            monitoring.set_local_events(tool, code, events.LINE | events.PY_RETURN | events.PY_YIELD)
+
+    def disable(self) -> None:
+        if self.settrace:
+            sys.settrace(None)
+        else:
+            monitoring = sys.monitoring
+            tool, events = monitoring.PROFILER_ID, monitoring.events
+            monitoring.set_events(tool, 0)
+            for code in self._codes:
+                monitoring.set_local_events(tool, code, 0)
+            for event in (events.PY_START, events.PY_RESUME, events.LINE, events.PY_RETURN, events.PY_YIELD,
+                          events.PY_UNWIND):
+                monitoring.register_callback(tool, event, None)
+            monitoring.free_tool_id(tool)
+            monitoring.restart_events()  # events disabled for untraced functions apply interpreter wide
+
+        # Frames still executing are accounted for up to now
+        for frame in list(self._frames):
+            self._leave(frame)
+        self._origins = ()
+        self._thread = None
+
+    def _enter(self, frame: FrameType, key: Key, start: bool) -> None:
+        if start:
+            self.calls[key] += 1
+        self._frames[frame] = [None, 0]
+
+    def _step(self, frame: FrameType, line: int) -> None:
+        now = perf_counter_ns()
+        state = self._frames.get(frame)
+        if state is None:
+            key = self._codes.get(frame.f_code)
+            if key is None:
+                return
+            state = self._frames[frame] = [None, 0]
+        lines = self.lines[self._codes[frame.f_code]]
+        if state[0] is not None:
+            lines[state[0]][1] += now - state[1]
+        entry = lines.get(line)
+        if entry is None:
+            entry = lines[line] = [0, 0]
+        entry[0] += 1
+        state[0], state[1] = line, perf_counter_ns()
+
+    def _leave(self, frame: FrameType) -> None:
+        now = perf_counter_ns()
+        state = self._frames.pop(frame, None)
+        if state is not None and state[0] is not None:
+            self.lines[self._codes[frame.f_code]][state[0]][1] += now - state[1]
+
+    # sys.settrace backend
+    def _trace(self, frame: FrameType, event: str, arg: Any):
+        if event != "call":
+            return None
+        key = self._select(frame)
+        if key is None:
+            return None
+        # Generators and coroutines are "called" again on each resumption (at their last line)
+        self._enter(frame, key, frame.f_lineno == frame.f_code.co_firstlineno)
+        return self._local
+
+    def _local(self, frame: FrameType, event: str, arg: Any):
+        if event == "line":
+            self._step(frame, frame.f_lineno)
+        elif event == "return":
+            self._leave(frame)
+        return self._local
+
+    # sys.monitoring backend
+    def _start(self, code: CodeType, offset: int):
+        if get_ident() != self._thread:
+            return
+        frame = sys._getframe(1)
+        key = self._select(frame)
+        if key is None:
+            # Untraced functions stop reporting their calls, until the profile is disabled
+            return None if self.callees else sys.monitoring.DISABLE
+        self._enter(frame, key, True)
+
+    def _resume(self, code: CodeType, offset: int):
+        if get_ident() != self._thread:
+            return
+        frame = sys._getframe(1)
+        key = self._select(frame)
+        if key is None:
+            return None if self.callees else sys.monitoring.DISABLE
+        self._enter(frame, key, False)
+
+    def _line(self, code: CodeType, line: int):
+        if get_ident() == self._thread:
+            self._step(sys._getframe(1), line)
+
+    def _return(self, code: CodeType, offset: int, value: Any):
+        if get_ident() == self._thread:
+            self._leave(sys._getframe(1))
+
+    def getstats(self) -> list:
+        """Traced functions, empty if nothing was recorded."""
+        return [key for key, lines in self.lines.items() if lines]
+
+    def merge(self, other: "LineProfile") -> "LineProfile":
+        """Merge the results of another LineProfile into this one (in place)."""
+        for key, lines in other.lines.items():
+            mine = self.lines.setdefault(key, {})
+            for line, (hits, time) in lines.items():
+                entry = mine.setdefault(line, [0, 0])
+                entry[0] += hits
+                entry[1] += time
+            self.calls[key] = self.calls.get(key, 0) + other.calls.get(key, 0)
+        return self
+
+    def write_report(self, stream: IO, name: str) -> None:
+        """Write an annotated source listing of every traced function, heaviest first."""
+        stream.write(f"Line Profiling {name}()\n")
+        totals = {key: sum(time for _, time in lines.values()) for key, lines in self.lines.items() if lines}
+        for key in sorted(totals, key=totals.get, reverse=True):
+            filename, first, _ = key
+            lines, total = self.lines[key], totals[key] or 1
+            stream.write(f"\n  {label(key)}  calls: {self.calls.get(key, 0)}  time: {totals[key] / 1e6:.3f} ms\n")
+            stream.write(f"  {'Line':>6} {'Hits':>9} {'Time (ms)':>12} {'Per Hit (us)':>13} {'% Time':>7}  Source\n")
+            stream.write(f"  {'-' * 6} {'-' * 9} {'-' * 12} {'-' * 13} {'-' * 7}  {'-' * 6}\n")
+            for number, source in source_lines(filename, first, max(lines)):
+                entry = lines.get(number)
+                if entry is None:
+                    stream.write(f"  {number:>6} {'':>9} {'':>12} {'':>13} {'':>7}  {source}\n")
+                    continue
+                hits, time = entry
+                stream.write(f"  {number:>6} {hits:>9} {time / 1e6:>12.3f} {time / hits / 1e3:>13.1f} "
+                             f"{time / total * 100:>7.1f}  {source}\n")
+        stream.write("\n")
+
+
+def source_lines(filename: str, first: int, last: int) -> list:
+    """Numbered source lines of the function defined at first (at least up to line last).
+
+    Args:
+        filename (str): source file of the function
+        first (int): first line number of the function (i.e. code.co_firstlineno)
+        last (int): last line number recorded (listed even when the source cannot be parsed)
+
+    Returns:
+        (list) of (line number, source line without trailing whitespace)
+
+    """
+    lines = linecache.getlines(filename)
+    if not lines:
+        return [(number, "") for number in range(first, last + 1)]
+    try:
+        block = inspect.getblock(lines[first - 1:])
+    except (IndexError, SyntaxError, inspect.EndOfBlock):
+        block = []
+    end = max(first + len(block) - 1, last)
+    return [(number, lines[number - 1].rstrip() if number <= len(lines) else "") for number in range(first, end + 1)]
@@ -0,0 +1,187 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/memory.py
+
+"""
+# Python Dependencies
+import os
+import linecache
+import tracemalloc
+
+from threading import Lock
+from typing import Any, Dict, IO, Optional
+
+
+# Globals
+_PACKAGE = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, _PACKAGE + "*"),
+)
+# tracemalloc is process wide: it is started by the first enabled profile (unless already tracing),
+# and stopped once the last enabled profile (of any thread) is disabled
+_lock = Lock()
+_users = 0
+_owned = False
+
+
+def _acquire(depth: int) -> None:
+    """Start tracing allocations if necessary, and register an enabled profile."""
+    global _users, _owned
+    with _lock:
+        if not _users and not tracemalloc.is_tracing():
+            tracemalloc.start(depth)
+            _owned = True
+        _users += 1
+
+
+def _release() -> None:
+    """Unregister an enabled profile, and stop tracing if started by the last one."""
+    global _users, _owned
+    with _lock:
+        _users -= 1
+        if not _users and _owned:
+            tracemalloc.stop()
+            _owned = False
+
+
+def format_size(size: float, sign: bool = False) -> str:
+    """Human readable size in bytes (e.g. 1.5 KiB)."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{size:+.1f} {unit}" if sign else f"{size:.1f} {unit}"
+
+
+class MemoryProfile:
+    """Memory Allocation Profile, built on tracemalloc.
+
+    Snapshots allocations when enabled and disabled, recording the peak memory, the net allocated
+    bytes, and the allocations of each traceback (or line). May be used on its own, or alongside
+    another profile (e.g. cProfile.Profile), which is enabled and disabled with it.
+
+    Args:
+        limit (int): Number of top allocating tracebacks (or lines) to report
+        depth (int): Number of frames retained per traceback. Larger depths give more context, at
+            the expense of tracing overhead. With a depth of 1, allocations are reported per line.
+        profile (Any): Optional profile (e.g. cProfile.Profile) enabled alongside
+
+    Notes:
+        - If tracemalloc is already tracing, its current traceback depth is retained.
+        - Peak memory is relative to the memory traced when enabled. As tracemalloc is process
+          wide, profiles enabled concurrently (in other threads) share the peak, and tracing stops
+          only once the last of them is disabled.
+
+    """
+
+    def __init__(self, limit: int = 10, depth: int = 1, profile: Optional[Any] = None) -> None:
+        if limit < 1 or depth < 1:
+            raise ValueError(f"Memory limit and depth must be positive integers: ({limit}, {depth})")
+        self.limit = limit
+        self.depth = depth
+        self.profile = profile
+        self.calls = 0
+        self.peak = 0
+        self.net = 0
+        self.allocations: Dict[tuple, list] = {}
+        self._started = False
+        self._snapshot = None
+        self._baseline = 0
+
+    def enable(self) -> None:
+        _acquire(self.depth)
+        self._started = True
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        self._baseline = tracemalloc.get_traced_memory()[0]
+
+        if self.profile is not None:
+            try:
+                self.profile.enable()
+            except ValueError:
+                self._snapshot = None
+                self._stop()
+                raise
+
+    def _stop(self) -> None:
+        if self._started:
+            _release()
+            self._started = False
+
+    def disable(self) -> None:
+        if self.profile is not None:
+            self.profile.disable()
+        if self._snapshot is None:
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        key_type = "traceback" if self.depth > 1 else "lineno"
+        for stat in snapshot.compare_to(self._snapshot, key_type):
+            if stat.size_diff or stat.count_diff:
+                key = tuple(
+                    (frame.filename, frame.lineno) for frame in stat.traceback
+                    if not frame.filename.startswith(_PACKAGE)
+                ) or ((stat.traceback[-1].filename, stat.traceback[-1].lineno),)
+                entry = self.allocations.setdefault(key, [0, 0])
+                entry[0] += stat.size_diff
+                entry[1] += stat.count_diff
+
+        self.calls += 1
+        self.net += current - self._baseline
+        self.peak = max(self.peak, peak - self._baseline)
+        self._snapshot = None
+        self._stop()
+
+    def getstats(self) -> list:
+        """Return (calls, peak, net) if any call has been recorded, else an empty list."""
+        return [(self.calls, self.peak, self.net)] if self.calls else []
+
+    def merge(self, other: "MemoryProfile") -> "MemoryProfile":
+        """Merge the results of another MemoryProfile into this one (in place)."""
+        self.calls += other.calls
+        self.net += other.net
+        self.peak = max(self.peak, other.peak)
+        for key, (size, count) in other.allocations.items():
+            entry = self.allocations.setdefault(key, [0, 0])
+            entry[0] += size
+            entry[1] += count
+        return self
+
+    def write_report(self, stream: IO, name: str) -> None:
+        """Write a report of peak memory, net allocations, and top allocating tracebacks."""
+        stream.write(f"Memory Profiling {name}()\n")
+        stream.write(f"  calls: {self.calls}  peak: {format_size(self.peak)}  net: {format_size(self.net, True)}\n")
+
+        top = sorted(self.allocations.items(), key=lambda item: abs(item[1][0]), reverse=True)[:self.limit]
+        stream.write(f"  Top {len(top)} allocations (traceback depth {self.depth}):\n")
+        for rank, (traceback, (size, count)) in enumerate(top, 1):
+            filename, lineno = traceback[-1]  # most recent frame (i.e. where memory is allocated)
+            stream.write(f"  #{rank}: {format_size(size, True)} ({count:+d} blocks) {filename}:{lineno}\n")
+            for filename, lineno in traceback:
+                line = linecache.getline(filename, lineno).strip()
+                if line:
+                    stream.write(f"      {filename}:{lineno}: {line}\n" if len(traceback) > 1 else f"      {line}\n")
+        stream.write("\n")
@@ -0,0 +1,138 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/registry.py
+
+"""
+# Python Dependencies
+import os
+
+from fnmatch import fnmatchcase
+from threading import RLock
+from typing import Dict, List, Optional
+
+
+# Globals
+ENVIRONMENT = "PYPROFILER"
+STRIP = ("0", "off", "false", "no")
+
+_registry: Dict[str, List["Entry"]] = {}
+_lock = RLock()  # reentrant: enable / disable may be called from signal handlers (main thread)
+
+
+def _patterns() -> Optional[List[str]]:
+    """Read the patterns of functions enabled by the environment (None if unrestricted)."""
+    value = os.environ.get(ENVIRONMENT)
+    if value is None or value.strip().lower() in ("", "*", "1", "on", "true", "yes"):
+        return None
+    if value.strip().lower() in STRIP:
+        return []
+    return [i.strip() for i in value.split(",") if i.strip()]
+
+
+# Read once, at import time
+_PATTERNS = _patterns()
+
+
+class Entry:
+    """Registered Profiler decorated function, whose profiling may be enabled or disabled at runtime.
+
+    Args:
+        name (str): fully qualified name of the function (module.qualname)
+        enabled (bool): whether profiling is enabled
+
+    """
+    __slots__ = ("name", "enabled")
+
+    def __init__(self, name: str, enabled: bool = True) -> None:
+        self.name = name
+        self.enabled = enabled
+
+
+def stripped() -> bool:
+    """True if profiling is switched off entirely by the environment (e.g. PYPROFILER=0).
+
+    In which case, Profiler hands back decorated functions unmodified, at no cost whatsoever.
+    Profiling of these functions may not be enabled at runtime.
+
+    """
+    return _PATTERNS == []
+
+
+def register(name: str) -> Entry:
+    """Register a decorated function, enabled according to the environment.
+
+    Args:
+        name (str): fully qualified name of the function (module.qualname)
+
+    Returns:
+        (Entry) registered entry
+
+    """
+    enabled = _PATTERNS is None or any(fnmatchcase(name, pattern) for pattern in _PATTERNS)
+    entry = Entry(name, enabled)
+    with _lock:
+        _registry.setdefault(name, []).append(entry)
+    return entry
+
+
+def _switch(pattern: str, enabled: bool) -> List[str]:
+    with _lock:
+        names = [name for name in _registry if fnmatchcase(name, pattern)]
+        for name in names:
+            for entry in _registry[name]:
+                entry.enabled = enabled
+    return names
+
+
+def enable(pattern: str = "*") -> List[str]:
+    """Enable profiling of every registered function whose name matches a (fnmatch) pattern.
+
+    Args:
+        pattern (str): pattern matched against module.qualname (e.g. "myapp.handlers.*")
+
+    Returns:
+        (list) names of the functions enabled
+
+    """
+    return _switch(pattern, True)
+
+
+def disable(pattern: str = "*") -> List[str]:
+    """Disable profiling of every registered function whose name matches a (fnmatch) pattern.
+
+    Disabled functions are called directly, without resolving the keyword toggle.
+
+    Args:
+        pattern (str): pattern matched against module.qualname (e.g. "myapp.handlers.*")
+
+    Returns:
+        (list) names of the functions disabled
+
+    """
+    return _switch(pattern, False)
+
+
+def registered() -> Dict[str, bool]:
+    """Return {name: enabled} of every registered function."""
+    with _lock:
+        return {name: any(i.enabled for i in entries) for name, entries in sorted(_registry.items())}
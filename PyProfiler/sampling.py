@@ -0,0 +1,111 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/sampling.py
+
+"""
+# Python Dependencies
+from random import random
+from itertools import count
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+
+class Sampler:
+    """Base Sampling Policy, deciding whether a (toggled) call should be profiled.
+
+    Subclasses implement `__call__`, which is consulted once per call after the keyword toggle
+    resolves to True. Calls which are not sampled are delivered straight to the function.
+
+    """
+    __slots__ = ()
+
+    def __call__(self) -> bool:
+        raise NotImplementedError
+
+
+class EveryN(Sampler):
+    """Profile every Nth call.
+
+    Args:
+        n (int): Sampling interval (n=1 profiles every call)
+
+    """
+    __slots__ = ("n", "_counter")
+
+    def __init__(self, n: int) -> None:
+        if n < 1:
+            raise ValueError(f"Sampling interval must be a positive integer: {n}")
+        self.n = n
+        self._counter = count()
+
+    def __call__(self) -> bool:
+        return next(self._counter) % self.n == 0
+
+
+class Probability(Sampler):
+    """Profile a random fraction of calls.
+
+    Args:
+        p (float): Probability a given call is profiled (between 0 and 1)
+
+    """
+    __slots__ = ("p",)
+
+    def __init__(self, p: float) -> None:
+        if not 0. <= p <= 1.:
+            raise ValueError(f"Sampling probability must be between 0 and 1: {p}")
+        self.p = p
+
+    def __call__(self) -> bool:
+        return random() < self.p
+
+
+class TokenBucket(Sampler):
+    """Profile at most a fixed number of calls per second.
+
+    Args:
+        rate (float): Number of profiles permitted per second (token refill rate)
+        burst (float): Maximum number of tokens which may accumulate (defaults to rate)
+
+    """
+    __slots__ = ("rate", "burst", "_tokens", "_last", "_lock")
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"Sampling rate must be positive: {rate}")
+        self.rate = rate
+        self.burst = max(1., float(burst if burst is not None else rate))
+        self._tokens = self.burst
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def __call__(self) -> bool:
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1.:
+                self._tokens -= 1.
+                return True
+            return False
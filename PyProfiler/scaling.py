@@ -0,0 +1,273 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/scaling.py
+
+"""
+# Python Dependencies
+import math
+
+from pstats import Stats
+from threading import Lock
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+
+from .exporters import callees
+from .exporters import label
+
+
+# Globals
+COMPLEXITY = (  # (upper bound of log-log slope, estimated complexity)
+    (0.25, "O(1)"),
+    (0.75, "O(√n)"),
+    (1.15, "O(n)"),
+    (1.5, "O(n log n)"),
+    (2.5, "O(n²)"),
+    (3.5, "O(n³)"),
+)
+
+
+def fit(points: List[Tuple[float, float, int]]) -> Optional[Tuple[float, float]]:
+    """Weighted least squares fit of log(time) against log(size).
+
+    Args:
+        points (list): of (size, seconds, weight), with positive size and seconds
+
+    Returns:
+        (tuple | None) slope and intercept of the fit, None with fewer than two distinct sizes
+
+    """
+    points = [(math.log(n), math.log(t), w) for n, t, w in points if n > 0 and t > 0 and w > 0]
+    if len({x for x, _, _ in points}) < 2:
+        return None
+
+    total = sum(w for _, _, w in points)
+    mx = sum(x * w for x, _, w in points) / total
+    my = sum(y * w for _, y, w in points) / total
+    sxx = sum(w * (x - mx) ** 2 for x, _, w in points)
+    sxy = sum(w * (x - mx) * (y - my) for x, y, w in points)
+    slope = sxy / sxx
+    return slope, my - slope * mx
+
+
+def complexity(slope: Optional[float]) -> str:
+    """Estimated complexity class of a log-log slope (e.g. 1.98 -> O(n²))."""
+    if slope is None:
+        return "?"
+    for bound, value in COMPLEXITY:
+        if slope < bound:
+            return value
+    return f"O(n^{round(slope)})"
+
+
+class Bucket:
+    """Calls of sizes within a power of two.
+
+    Args:
+        calls (int): number of calls recorded
+        size (float): sum of the sizes of calls
+        seconds (float): sum of the wall clock time (seconds) of calls
+        stats (pstats.Stats): merged profile of calls (None if no call was profiled)
+
+    """
+    __slots__ = ("calls", "size", "seconds", "stats")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.size = 0.
+        self.seconds = 0.
+        self.stats = None
+
+
+class Scaling:
+    """Input Size Aware Profiling Policy, estimating how a function scales with its input.
+
+    Each profiled call is tagged with the size of its input, and its wall clock time and profile
+    are bucketed by size (powers of two). The report fits time against size on a log-log scale,
+    showing the slope and estimated complexity of the function and of its top callees.
+
+    Args:
+        size (Callable): extracts the input size of a call, with signature (args, kwargs) -> number
+        callees (int): number of callees (by cumulative time) fitted in the report
+
+    Example Usage:
+
+        ```python
+
+            from PyProfiler import Profiler, Scaling
+
+            @Profiler(scaling=Scaling(size=lambda args, kwargs: len(args[0])))
+            def process(records, debug=True):
+                ...
+
+            for n in (100, 1_000, 10_000):
+                process(list(range(n)))
+
+            process.scaling.summary()  # {"slope": 1.02, "complexity": "O(n)", ...}
+            process.flush()  # output the report to the stream of the Profiler, and reset
+        ```
+
+    Notes:
+        - Calls of non-positive size are counted (see `ignored`), but excluded from the fit.
+        - Results are output (and recording starts afresh) when flushed explicitly, or at exit.
+        - State is held by the policy, so a Scaling instance should not be shared by several
+          decorated functions.
+
+    """
+    __slots__ = ("size", "callees", "key", "buckets", "ignored", "profile", "stats", "_lock")
+
+    def __init__(self, size: Callable[[tuple, dict], float], callees: int = 5) -> None:
+        if not callable(size):
+            raise ValueError(f"Size extractor must be callable: {size}")
+        if callees < 0:
+            raise ValueError(f"Number of callees must be non-negative: {callees}")
+
+        self.size = size
+        self.callees = callees
+        self.key = None
+        self.buckets: Dict[int, Bucket] = {}
+        self.ignored = 0
+        self.profile = None  # no inner pstats profile is output alongside the report
+        self.stats = {}
+        self._lock = Lock()
+
+    def bind(self, function: Callable) -> None:
+        """Identify the decorated function within recorded profiles."""
+        code = function.__code__
+        self.key = (code.co_filename, code.co_firstlineno, code.co_name)
+
+    def record(self, size: float, seconds: float, profile: Any = None) -> None:
+        """Record a call of a given size, its wall clock time, and profile (if any)."""
+        if size <= 0:
+            with self._lock:
+                self.ignored += 1
+            return
+
+        index = math.frexp(size)[1]
+        stats = Stats(profile) if profile is not None and profile.getstats() else None
+        with self._lock:
+            bucket = self.buckets.get(index)
+            if bucket is None:
+                bucket = self.buckets[index] = Bucket()
+            bucket.calls += 1
+            bucket.size += size
+            bucket.seconds += seconds
+            if stats is not None:
+                if bucket.stats is None:
+                    bucket.stats = stats
+                else:
+                    bucket.stats.add(stats)
+
+    def _buckets(self) -> List[Bucket]:
+        with self._lock:
+            return [self.buckets[i] for i in sorted(self.buckets)]
+
+    def _callees(self, buckets: List[Bucket]) -> List[Tuple[tuple, Optional[float], float]]:
+        """Fit the cumulative time of each callee per call of the function, across buckets."""
+        points, totals = {}, {}
+        for bucket in buckets:
+            if bucket.stats is None or self.key not in bucket.stats.stats:
+                continue
+            calls = bucket.stats.stats[self.key][1]
+            for callee, (_, _, _, ct) in callees(bucket.stats).get(self.key, {}).items():
+                points.setdefault(callee, []).append((bucket.size / bucket.calls, ct / calls, calls))
+                totals[callee] = totals.get(callee, 0.) + ct
+
+        top = sorted(totals, key=totals.get, reverse=True)[:self.callees]
+        return [(callee, (fit(points[callee]) or (None,))[0], totals[callee]) for callee in top]
+
+    def summary(self) -> dict:
+        """Summary of the fit of the function, and of its top callees."""
+        buckets = self._buckets()
+        result = fit([(i.size / i.calls, i.seconds / i.calls, i.calls) for i in buckets])
+        slope = None if result is None else result[0]
+        return {
+            "calls": sum(i.calls for i in buckets),
+            "ignored": self.ignored,
+            "slope": slope,
+            "complexity": complexity(slope),
+            "buckets": [{"size": i.size / i.calls, "calls": i.calls, "mean": i.seconds / i.calls} for i in buckets],
+            "callees": [{"function": label(key), "slope": value, "complexity": complexity(value), "cumtime": total}
+                        for key, value, total in self._callees(buckets)],
+        }
+
+    def detach(self) -> "Scaling":
+        """Hand over the recorded calls to a new Scaling (returned), and start recording afresh."""
+        snapshot = Scaling(self.size, self.callees)
+        snapshot.key = self.key
+        with self._lock:
+            snapshot.buckets, snapshot.ignored = self.buckets, self.ignored
+            self.buckets, self.ignored = {}, 0
+        return snapshot
+
+    def clear(self) -> None:
+        """Discard every recorded call."""
+        with self._lock:
+            self.buckets = {}
+            self.ignored = 0
+
+    def create_stats(self) -> None:
+        """Merge the profiles of every size into the `stats` attribute, for use by `pstats.Stats`."""
+        merged = Stats()
+        for bucket in self._buckets():
+            if bucket.stats is not None:
+                merged.add(bucket.stats)
+        self.stats = merged.stats
+
+    def getstats(self) -> list:
+        return [bucket for bucket in self._buckets() if bucket.calls]
+
+    def merge(self, other: "Scaling") -> "Scaling":
+        """Merge the recorded calls of another Scaling into this one (in place)."""
+        if other is self:
+            return self
+        for index, bucket in other.buckets.items():
+            target = self.buckets.setdefault(index, Bucket())
+            target.calls += bucket.calls
+            target.size += bucket.size
+            target.seconds += bucket.seconds
+            if bucket.stats is not None:
+                target.stats = target.stats or Stats()
+                target.stats.add(bucket.stats)
+        self.ignored += other.ignored
+        return self
+
+    def write_report(self, stream: IO, name: str) -> None:
+        """Write a report of mean time per size bucket, and the log-log fit of the function and its callees."""
+        summary = self.summary()
+        stream.write(f"Scaling {name}()\n")
+        stream.write(f"  calls: {summary['calls']}  ignored (size <= 0): {summary['ignored']}\n")
+        stream.write(f"  {'size':>12} {'calls':>9} {'mean (s)':>12}\n")
+        for bucket in summary["buckets"]:
+            stream.write(f"  {bucket['size']:>12.4g} {bucket['calls']:>9d} {bucket['mean']:>12.6f}\n")
+
+        slope = summary["slope"]
+        if slope is None:
+            stream.write("  log-log slope: ? (at least two size buckets are required)\n\n")
+            return
+        stream.write(f"  log-log slope: {slope:.2f}  ~ {summary['complexity']}\n")
+
+        if summary["callees"]:
+            stream.write(f"  Top {len(summary['callees'])} callees (cumulative time per call):\n")
+            for callee in summary["callees"]:
+                value = "?" if callee["slope"] is None else f"{callee['slope']:.2f}"
+                stream.write(f"    {value:>6}  ~ {callee['complexity']:<11} {callee['function']}\n")
+        stream.write("\n")
@@ -0,0 +1,760 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/sinks.py
+
+"""
+# Python Dependencies
+import os
+import gzip
+import time
+import atexit
+import re
+import marshal
+import shutil
+import socket
+
+from collections import deque
+from fnmatch import fnmatchcase
+from glob import glob
+from glob import escape as glob_escape
+from pstats import Stats
+from queue import Full
+from queue import Queue
+from sys import stderr
+from sys import stdout
+from threading import Event
+from threading import Lock
+from threading import Thread
+from traceback import print_exc
+from typing import Any, Callable, IO, Optional, Union
+
+from . import utils
+from .exporters import Dump
+from .exporters import entry_points
+from .exporters import label
+
+
+# Globals
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst", None: ""}
+_INVALID = re.compile(r"[^A-Za-z0-9_.\-]+")  # characters not allowed in StatsD metric names
+
+
+class Sink:
+    """Base Output Sink, receiving profile results from a Profiler.
+
+    A Sink may be supplied to a Profiler in place of a filepath or stream, in which case the
+    Profiler's mode, sortby and format arguments are ignored in favor of the configuration of the sink.
+
+    Attributes:
+        pstats_only (bool): whether the sink only accepts pstats compatible profiles, i.e. not the
+            reports of the "memory" and "line" engines, or of the memory option (see MemoryProfile
+            and LineProfile)
+
+    """
+    __slots__ = ()
+    pstats_only = False
+
+    def output(self, profile, name: str) -> None:
+        """Receive the results of a profile.
+
+        Args:
+            profile (cProfile.Profile): profile class containing results
+            name (str): qualified name of the profiled function
+
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Ensure all results received so far have been output."""
+        ...
+
+    def close(self) -> None:
+        """Flush results and release any resources held by the sink."""
+        self.flush()
+
+
+def as_sink(filepath: Any, mode: utils.MODE, sortby: Any, format: Union[str, Callable] = "pstats",
+            calibrate: Optional[str] = None):
+    """Return the filepath if it is already a Sink, else a Statistics instance directing output.
+
+    Args:
+        filepath (str | IO | Sink): output destination
+        mode (MODE): mode used to write to filepath
+        sortby (str | pstats.SortKey): method used to sort results
+        format (str | Callable): output format (see exporters.FORMATS)
+        calibrate (str): engine whose overhead is subtracted from results (see calibration)
+
+    Returns:
+        (Sink | Statistics) object with an output(profile, name) method
+
+    """
+    if isinstance(filepath, Sink):
+        return filepath
+    return utils.Statistics(stream=filepath, mode=mode, sortby=sortby, format=format, calibrate=calibrate)
+
+
+class BackgroundWriter(Sink):
+    """Asynchronous Sink delegating formatting and writing of results to a worker thread.
+
+    The profiled call only hands the (disabled) profile to a bounded queue. Sorting, formatting
+    and writing are performed by a daemon worker thread, keeping this cost out of the latency of
+    the profiled call.
+
+    Args:
+        filepath (str | IO | Sink): output destination (stdout by default)
+        mode (MODE): mode used to write to filepath
+        sortby (str | pstats.SortKey): method used to sort results
+        format (str | Callable): output format (see exporters.FORMATS)
+        maxsize (int): maximum number of profiles awaiting output
+        block (bool): When the queue is full, block the profiled call until space is available
+            (True), or drop the profile (False, default). Dropped profiles are counted.
+        calibrate (str): engine whose instrumentation overhead is subtracted from results, e.g.
+            "cprofile" (see PyProfiler.calibration)
+
+    """
+    __slots__ = ("sink", "block", "dropped", "_queue", "_thread")
+
+    def __init__(self,
+                 filepath: Any = None,
+                 mode: utils.MODE = "a",
+                 sortby: Any = "cumulative",
+                 format: Union[str, Callable] = "pstats",
+                 maxsize: int = 1024,
+                 block: bool = False,
+                 calibrate: Optional[str] = None,
+                 ) -> None:
+        utils.is_valid_mode(mode)
+        utils.is_valid_sortkey(sortby)
+        utils.is_valid_format(format)
+
+        self.sink = as_sink(filepath, mode, sortby, format, calibrate)
+        self.block = block
+        self.dropped = 0
+        self._queue = Queue(maxsize)
+        self._thread = Thread(target=self._work, name="PyProfiler-BackgroundWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pstats_only(self) -> bool:
+        return getattr(self.sink, "pstats_only", False)
+
+    def output(self, profile, name: str) -> None:
+        try:
+            self._queue.put((profile, name), block=self.block)
+        except Full:
+            self.dropped += 1
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.sink.output(*item)
+            except Exception:  # Never let the worker thread die
+                print("Warning: Failed to output profile:", file=stderr)
+                print_exc(file=stderr)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued profile has been output."""
+        if self._thread.is_alive():
+            self._queue.join()
+        self.sink.flush()
+
+    def close(self) -> None:
+        """Output all queued profiles and stop the worker thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self.sink.close()
+
+
+class ShardWriter(Sink):
+    """Multiprocess-aware Sink, writing a binary (marshal) profile dump per process.
+
+    Each process (e.g. workers of a ProcessPoolExecutor) merges the results it receives into a
+    single shard file named after its process id, which is atomically replaced after every output.
+    Shards are loadable by `pstats.Stats`, and may be merged by the parent process into a single
+    report once the workers have completed (see `collect` and `report`).
+
+    Args:
+        directory (str): directory where shards are written (created if necessary)
+        prefix (str): file name prefix of shards
+
+    Example Usage:
+
+        ```python
+
+            from concurrent.futures import ProcessPoolExecutor
+            from PyProfiler import Profiler, ShardWriter
+
+            shards = ShardWriter("profiles/")
+
+            @Profiler(filepath=shards)
+            def task(n, debug=True):
+                return sum(range(n))
+
+            with ProcessPoolExecutor() as pool:
+                list(pool.map(task, range(1000)))
+
+            shards.report()  # single sorted report of all workers
+        ```
+
+    """
+    __slots__ = ("directory", "prefix", "_pid", "_stats", "_lock")
+    pstats_only = True
+
+    def __init__(self, directory: str, prefix: str = "profile") -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self._pid = None
+        self._stats = None
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        """Path of the shard written by the current process."""
+        return os.path.join(self.directory, f"{self.prefix}.{os.getpid()}.prof")
+
+    def output(self, profile, name: str) -> None:
+        profiles = profile if isinstance(profile, tuple) else (profile,)
+        with self._lock:
+            # A forked child must not re-emit the results inherited from its parent
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stats = None
+
+            if self._stats is None:
+                self._stats = Stats(*profiles)
+            else:
+                self._stats.add(*profiles)
+
+            path = self.path
+            self._stats.dump_stats(f"{path}.tmp")
+            os.replace(f"{path}.tmp", path)
+
+    def shards(self) -> list:
+        """List the shard files written by every process."""
+        return sorted(glob(os.path.join(glob_escape(self.directory), f"{glob_escape(self.prefix)}.*.prof")))
+
+    def collect(self) -> Optional[Stats]:
+        """Merge the shards of every process into a single Stats (None if no shards exist)."""
+        stats = None
+        for shard in self.shards():
+            if stats is None:
+                stats = Stats(shard)
+            else:
+                stats.add(shard)
+        return stats
+
+    def report(self, stream: Optional[IO] = None, sortby: Any = "cumulative") -> None:
+        """Output a single sorted report merging the shards of every process.
+
+        Args:
+            stream (IO): where to output results (stdout by default)
+            sortby (str | pstats.SortKey): method used to sort results
+
+        """
+        utils.is_valid_sortkey(sortby)
+        stats = self.collect()
+        if stats is None:
+            return
+        stats.stream = stream or stdout
+        stats.sort_stats(sortby).print_stats()
+
+
+def _opener(compress: utils.COMPRESSION) -> Callable:
+    """File opener of a given compression method."""
+    if compress == "gzip":
+        return gzip.open
+    if compress == "zstd":
+        import zstandard
+        return zstandard.open
+    return open
+
+
+def load(path: str) -> dict:
+    """Load the raw stats dictionary of a marshal dump, decompressing it if required.
+
+    Args:
+        path (str): path of a dump written by pstats / ShardWriter / RotatingWriter
+
+    Returns:
+        (dict) {(filename, line, function): (cc, nc, tt, ct, callers)}
+
+    """
+    suffix = os.path.splitext(path)[1]
+    compress = next((k for k, v in SUFFIXES.items() if v and v == suffix), None)
+    with _opener(compress)(path, "rb") as f:
+        return marshal.loads(f.read())
+
+
+class RotatingWriter(Sink):
+    """Size / Time Rotating Sink, writing binary (marshal) profile dumps.
+
+    Results are merged into the current segment, whose file is kept open and rewritten in place
+    after every output, so it is always loadable by `pstats.Stats(filepath)`. Once the segment
+    exceeds max_bytes, or is older than interval seconds, it is closed, compressed, and renamed
+    to `{filepath}.{index}{suffix}`, only the most recent `backups` segments being retained.
+
+    Args:
+        filepath (str): path of the current segment
+        max_bytes (int): size after which the segment is rotated (0 to disable)
+        interval (float): age in seconds after which the segment is rotated (None to disable)
+        backups (int): number of closed segments retained
+        compress (COMPRESSION): compression of closed segments ("gzip", "zstd", or None)
+
+    Notes:
+        - A non-empty file already present at filepath is rotated before the first output.
+        - Every process must write to its own filepath (see ShardWriter for multiple processes).
+
+    """
+    __slots__ = ("filepath", "max_bytes", "interval", "backups", "compress", "_stats", "_file", "_opened", "_lock")
+    pstats_only = True
+
+    def __init__(self,
+                 filepath: str,
+                 max_bytes: int = 16 * 1024 * 1024,
+                 interval: Optional[float] = None,
+                 backups: int = 5,
+                 compress: utils.COMPRESSION = "gzip",
+                 ) -> None:
+        utils.is_valid_compression(compress)
+        if max_bytes < 0 or backups < 0 or (interval is not None and interval <= 0):
+            raise ValueError("max_bytes and backups must be non-negative, and interval positive.")
+
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backups = backups
+        self.compress = compress
+        self._stats = None
+        self._file = None
+        self._opened = 0.
+        self._lock = Lock()
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atexit.register(self.close)
+
+    def output(self, profile, name: str) -> None:
+        profiles = profile if isinstance(profile, tuple) else (profile,)
+        with self._lock:
+            if self._file is not None and self.interval is not None and time.monotonic() - self._opened >= self.interval:
+                self.rotate()
+            if self._file is None:
+                if os.path.exists(self.filepath) and os.path.getsize(self.filepath):
+                    self._rotate()
+                self._file = open(self.filepath, "wb")
+                self._opened = time.monotonic()
+
+            if self._stats is None:
+                self._stats = Stats(*profiles)
+            else:
+                self._stats.add(*profiles)
+
+            self._file.seek(0)
+            marshal.dump(self._stats.stats, self._file)
+            self._file.truncate()
+            self._file.flush()
+
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self.rotate()
+
+    def _index(self, path: str) -> int:
+        return int(path[len(self.filepath) + 1:].split(".")[0])
+
+    def segments(self) -> list:
+        """List the closed segments, oldest first."""
+        suffix = SUFFIXES[self.compress]
+        paths = glob(f"{glob_escape(self.filepath)}.[0-9]*{suffix}")
+        return sorted((i for i in paths if i[len(self.filepath) + 1:-len(suffix) or None].isdigit()), key=self._index)
+
+    def rotate(self) -> None:
+        """Close the current segment, compress it and apply the retention policy."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._stats = None
+        if os.path.exists(self.filepath) and os.path.getsize(self.filepath):
+            self._rotate()
+
+    def _rotate(self) -> None:
+        segments = self.segments()
+        index = self._index(segments[-1]) + 1 if segments else 1
+        target = f"{self.filepath}.{index}{SUFFIXES[self.compress]}"
+        with open(self.filepath, "rb") as src, _opener(self.compress)(f"{target}.tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(f"{target}.tmp", target)
+        os.remove(self.filepath)
+
+        for segment in self.segments()[:-self.backups or None]:
+            os.remove(segment)
+
+    def collect(self) -> Optional[Stats]:
+        """Merge the retained segments and the current segment into a single Stats (None if empty)."""
+        self.flush()
+        stats = None
+        for path in [*self.segments(), self.filepath]:
+            if not os.path.exists(path) or not os.path.getsize(path):
+                continue
+            dump = Dump(load(path))
+            if stats is None:
+                stats = Stats(dump)
+            else:
+                stats.add(dump)
+        return stats
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Close the current segment, which is left uncompressed and loadable at filepath."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._stats = None
+
+
+class Record:
+    """Compact record of a single profile held by a RingBuffer.
+
+    Args:
+        name (str): qualified name of the profiled function
+        timestamp (float): time (time.time()) the profile was received
+        duration (float): total time (seconds) of the profile
+        data (bytes): marshal dump of the raw stats dictionary
+
+    """
+    __slots__ = ("name", "timestamp", "duration", "data")
+
+    def __init__(self, name: str, timestamp: float, duration: float, data: bytes) -> None:
+        self.name = name
+        self.timestamp = timestamp
+        self.duration = duration
+        self.data = data
+
+    @property
+    def stats(self) -> dict:
+        """Raw stats dictionary of the profile."""
+        return marshal.loads(self.data)
+
+    def __repr__(self) -> str:
+        return f"Record({self.name!r}, timestamp={self.timestamp:.3f}, duration={self.duration:.6f})"
+
+
+class RingBuffer(Sink):
+    """Bounded in memory Sink, retaining the most recent profiles for inspection on demand.
+
+    Profiles are stored as marshal dumps of their raw stats (not formatted text), and the oldest
+    records are evicted once either budget, by count or by bytes, is exceeded.
+
+    Args:
+        maxlen (int): maximum number of records retained (None for no limit)
+        maxbytes (int): maximum total size of the retained dumps (None for no limit)
+
+    Example Usage:
+
+        ```python
+
+            from PyProfiler import Profiler, RingBuffer
+
+            recent = RingBuffer(maxlen=500, maxbytes=16 * 1024 * 1024)
+
+            @Profiler(filepath=recent)
+            def handler(request, debug=True):
+                ...
+
+            # e.g. from a debug endpoint: merge the slow calls of the last minute
+            stats = recent.stats(name="handler", since=time.time() - 60, min_duration=0.1)
+        ```
+
+    """
+    __slots__ = ("maxlen", "maxbytes", "nbytes", "evicted", "_records", "_lock")
+    pstats_only = True
+
+    def __init__(self, maxlen: Optional[int] = 256, maxbytes: Optional[int] = None) -> None:
+        if (maxlen is not None and maxlen < 1) or (maxbytes is not None and maxbytes < 1):
+            raise ValueError("maxlen and maxbytes must be positive (or None).")
+
+        self.maxlen = maxlen
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.evicted = 0
+        self._records = deque()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def output(self, profile, name: str) -> None:
+        profiles = profile if isinstance(profile, tuple) else (profile,)
+        stats = Stats(*profiles)
+        record = Record(name, time.time(), stats.total_tt, marshal.dumps(stats.stats))
+
+        with self._lock:
+            self._records.append(record)
+            self.nbytes += len(record.data)
+            while self._records and (
+                (self.maxlen is not None and len(self._records) > self.maxlen)
+                or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+            ):
+                self.nbytes -= len(self._records.popleft().data)
+                self.evicted += 1
+
+    def select(self,
+               name: Optional[str] = None,
+               since: Optional[float] = None,
+               until: Optional[float] = None,
+               min_duration: Optional[float] = None,
+               max_duration: Optional[float] = None,
+               ) -> list:
+        """Select the retained records matching every given criteria, oldest first.
+
+        Args:
+            name (str): qualified name of the profiled function (glob patterns accepted)
+            since (float): earliest timestamp (time.time()) of records
+            until (float): latest timestamp (time.time()) of records
+            min_duration (float): minimum total time (seconds) of records
+            max_duration (float): maximum total time (seconds) of records
+
+        Returns:
+            (list) of Record
+
+        """
+        with self._lock:
+            records = list(self._records)
+
+        return [
+            i for i in records
+            if (name is None or fnmatchcase(i.name, name))
+            and (since is None or i.timestamp >= since)
+            and (until is None or i.timestamp <= until)
+            and (min_duration is None or i.duration >= min_duration)
+            and (max_duration is None or i.duration <= max_duration)
+        ]
+
+    def stats(self, **criteria) -> Optional[Stats]:
+        """Merge the records matching criteria (see `select`) into a single Stats (None if no match)."""
+        stats = None
+        for record in self.select(**criteria):
+            dump = Dump(record.stats)
+            if stats is None:
+                stats = Stats(dump)
+            else:
+                stats.add(dump)
+        return stats
+
+    def clear(self) -> None:
+        """Discard every retained record."""
+        with self._lock:
+            self._records.clear()
+            self.nbytes = 0
+
+
+def _metric(name: str) -> str:
+    """Sanitize a name for use as a StatsD metric (reserved characters replaced by underscores)."""
+    return _INVALID.sub("_", name).strip("_.") or "_"
+
+
+def _function(key: tuple) -> str:
+    """StatsD metric name of a pstats function key, i.e. "{module}.{function}" (or builtin name)."""
+    filename, line, name = key
+    if filename == "~" and line == 0:
+        return _metric(name)
+    return f"{_metric(os.path.splitext(os.path.basename(filename))[0])}.{_metric(name)}"
+
+
+class _Timer:
+    """Bounded samples of a StatsD timer, observed between two flushes."""
+    __slots__ = ("samples", "observed")
+
+    def __init__(self) -> None:
+        self.samples = []
+        self.observed = 0
+
+
+class StatsdWriter(Sink):
+    """Sink streaming per function call counts and timings to a StatsD agent over UDP.
+
+    Results are aggregated in process (counters are summed, and timers keep at most max_samples
+    samples, sent with the corresponding StatsD sample rate), and flushed every interval seconds by
+    a daemon thread in datagrams of at most max_packet bytes, each batching many metrics. Datagrams
+    are sent through a non-blocking socket: an agent which is down or slow only causes datagrams to
+    be dropped (and counted), and never adds latency to the profiled call.
+
+    Metrics of each profiled function (name) are emitted as `{prefix}.{name}.calls` (counter) and
+    `{prefix}.{name}.time` (timer, milliseconds). Optionally, the functions called by the profiled
+    function are emitted likewise, as `{prefix}.{name}.{module}.{function}`.
+
+    Args:
+        host (str): address of the StatsD agent
+        port (int): UDP port of the StatsD agent
+        prefix (str): prefix of every metric name
+        interval (float): seconds between flushes (None to only flush explicitly, and at exit)
+        functions (str): glob pattern of the called functions (e.g. "*" or "*(db.py:*)", matched
+            against labels such as "execute (db.py:12)") whose metrics are also emitted
+        max_samples (int): maximum number of samples retained per timer between two flushes
+        max_packet (int): maximum size (bytes) of a datagram
+
+    Example Usage:
+
+        ```python
+
+            from PyProfiler import Profiler, StatsdWriter
+
+            metrics = StatsdWriter(prefix="myapp.profile", interval=10)
+
+            @Profiler(filepath=metrics)
+            def handler(request, debug=True):
+                ...
+        ```
+
+    """
+    __slots__ = ("address", "prefix", "interval", "functions", "max_samples", "max_packet",
+                 "sent", "dropped", "_counters", "_timers", "_lock", "_socket", "_stop", "_thread")
+    pstats_only = True
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 8125,
+                 prefix: str = "pyprofiler",
+                 interval: Optional[float] = 10.,
+                 functions: Optional[str] = None,
+                 max_samples: int = 64,
+                 max_packet: int = 1432,
+                 ) -> None:
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Flush interval must be positive: {interval}")
+        if max_samples < 1 or max_packet < 64:
+            raise ValueError("max_samples must be positive, and max_packet at least 64 bytes.")
+
+        self.address = (host, port)
+        self.prefix = _metric(prefix)
+        self.interval = interval
+        self.functions = functions
+        self.max_samples = max_samples
+        self.max_packet = max_packet
+        self.sent = 0
+        self.dropped = 0
+        self._counters = {}
+        self._timers = {}
+        self._lock = Lock()
+        self._socket = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._stop = Event()
+        self._thread = None
+        if interval is not None:
+            self._thread = Thread(target=self._work, name="PyProfiler-StatsdWriter", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def output(self, profile, name: str) -> None:
+        profiles = profile if isinstance(profile, tuple) else (profile,)
+        stats = Stats(*profiles).stats
+        roots = entry_points(stats)
+        if not roots:
+            return
+        # The profiled function is the entry point of largest inclusive time (called several times
+        # when profiles are aggregated), whose primitive calls exclude its recursive calls
+        root = roots[0]
+        base = f"{self.prefix}.{_metric(name)}"
+        metrics = [(base, stats[root][0], stats[root][3])]
+        if self.functions is not None:
+            metrics.extend(
+                (f"{base}.{_function(key)}", value[0], value[3]) for key, value in stats.items()
+                if key != root and value[0] and fnmatchcase(label(key), self.functions)
+            )
+
+        with self._lock:
+            for metric, count, seconds in metrics:
+                self._counters[f"{metric}.calls"] = self._counters.get(f"{metric}.calls", 0) + count
+                timer = self._timers.get(f"{metric}.time")
+                if timer is None:
+                    timer = self._timers[f"{metric}.time"] = _Timer()
+                # An aggregated profile is recorded as a single sample (its mean) standing for count calls
+                timer.observed += count
+                if len(timer.samples) < self.max_samples:
+                    timer.samples.append((seconds * 1000. / count, count))
+
+    def lines(self) -> list:
+        """Swap out the metrics aggregated since the previous flush, formatted as StatsD lines."""
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            timers, self._timers = self._timers, {}
+
+        result = [f"{metric}:{count}|c" for metric, count in counters.items()]
+        for metric, timer in timers.items():
+            recorded = sum(count for _, count in timer.samples)
+            for value, count in timer.samples:
+                # Each sample stands for count calls, scaled up by the samples exceeding max_samples
+                rate = recorded / (count * timer.observed)
+                result.append(f"{metric}:{value:.6g}|ms" + (f"|@{rate:.6g}" if rate < 1. else ""))
+        return result
+
+    def packets(self, lines: list) -> list:
+        """Batch lines into newline separated datagrams of at most max_packet bytes."""
+        packets, current, size = [], [], 0
+        for line in lines:
+            data = line.encode()
+            if current and size + 1 + len(data) > self.max_packet:
+                packets.append(b"\n".join(current))
+                current, size = [], 0
+            current.append(data)
+            size += len(data) + (1 if size else 0)
+        if current:
+            packets.append(b"\n".join(current))
+        return packets
+
+    def _work(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:  # Never let the flushing thread die
+                print("Warning: Failed to flush metrics:", file=stderr)
+                print_exc(file=stderr)
+
+    def flush(self) -> None:
+        """Send the metrics aggregated since the previous flush, without blocking."""
+        for packet in self.packets(self.lines()):
+            try:
+                self._socket.sendto(packet, self.address)
+                self.sent += 1
+            except OSError:  # e.g. full socket buffer (BlockingIOError), or unreachable agent
+                self.dropped += 1
+
+    def close(self) -> None:
+        """Stop the flushing thread, send the remaining metrics, and close the socket."""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+        if self._socket.fileno() != -1:
+            self.flush()
+            self._socket.close()
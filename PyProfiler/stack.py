@@ -0,0 +1,182 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/stack.py
+
+"""
+# Python Dependencies
+import os
+import sys
+
+from threading import Lock
+from threading import Thread
+from threading import get_ident
+from time import perf_counter
+from time import sleep
+from typing import Dict
+
+
+# Globals
+_PACKAGE = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_active: Dict[int, "StackSampler"] = {}
+_lock = Lock()
+_thread = None
+
+
+def recorded(profile) -> bool:
+    """Whether a profile recorded any results.
+
+    Only a StackSampler may record nothing (e.g. a call shorter than its interval), such that other
+    engines are not inspected: extracting the stats of cProfile is costly.
+
+    """
+    return not isinstance(profile, StackSampler) or bool(profile.stacks)
+
+
+def _label(code) -> tuple:
+    """Label a code object as cProfile does: (filename, line number, function name)."""
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def _internal(frame) -> bool:
+    return frame.f_code.co_filename.startswith(_PACKAGE)
+
+
+def _sample_forever() -> None:
+    """Sample the stacks of every thread holding an enabled StackSampler."""
+    global _thread
+    while True:
+        with _lock:
+            if not _active:
+                _thread = None
+                return
+            interval = min(i.interval for i in _active.values())
+
+        sleep(interval)
+        frames = sys._current_frames()
+        now = perf_counter()
+        with _lock:
+            for ident, sampler in _active.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    sampler._record(frame, now)
+        del frames
+
+
+class StackSampler:
+    """Statistical Profiler, periodically sampling the stack of the thread it is enabled in.
+
+    Unlike cProfile, which traces every call, the overhead of sampling depends only on the sampling
+    interval (not how frequently functions are called). A single daemon thread samples all enabled
+    StackSamplers via `sys._current_frames`. Samples are aggregated into counts per collapsed stack
+    (see `stacks`), and converted into pstats compatible results, such that a StackSampler may be
+    used wherever a cProfile.Profile is accepted (e.g. `pstats.Stats(sampler)`).
+
+    Args:
+        interval (float): Sampling interval in seconds.
+
+    Notes:
+        - Only frames beneath the call which enabled the sampler are recorded.
+        - In reported results, call counts are sample counts, and times are the wall clock time
+          elapsed between samples, attributed to the sampled stack.
+        - Sampling resolution is limited by the interpreter's switch interval when the sampled
+          thread holds the GIL (see `sys.setswitchinterval`).
+
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        if interval <= 0:
+            raise ValueError(f"Sampling interval must be positive: {interval}")
+        self.interval = interval
+        self.stacks: Dict[tuple, list] = {}
+        self.stats = {}
+        self._root = None
+        self._last = 0.
+
+    def enable(self) -> None:
+        global _thread
+        # The root is the first frame beneath the profiling machinery (i.e. the profiled call site)
+        root = sys._getframe()
+        while root is not None and _internal(root):
+            root = root.f_back
+
+        with _lock:
+            self._root = root
+            self._last = perf_counter()
+            _active[get_ident()] = self
+            if _thread is None:
+                _thread = Thread(target=_sample_forever, name="PyProfiler-StackSampler", daemon=True)
+                _thread.start()
+
+    def disable(self) -> None:
+        with _lock:
+            if _active.get(get_ident()) is self:
+                del _active[get_ident()]
+            self._root = None
+
+    def _record(self, frame, now: float) -> None:
+        elapsed, self._last = now - self._last, now
+        stack = []
+        while frame is not None and frame is not self._root:
+            if not _internal(frame):
+                stack.append(_label(frame.f_code))
+            frame = frame.f_back
+
+        if stack:
+            stack.reverse()
+            entry = self.stacks.setdefault(tuple(stack), [0, 0.])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def getstats(self) -> list:
+        """Return the raw samples as a list of (stack, count, seconds)."""
+        with _lock:
+            return [(stack, n, t) for stack, (n, t) in self.stacks.items()]
+
+    def collapsed(self) -> Dict[str, int]:
+        """Return sample counts per collapsed stack ("root;caller;leaf"), as used by flamegraphs."""
+        return {
+            ";".join(f"{name} ({os.path.basename(file)}:{line})" for file, line, name in stack): n
+            for stack, n, _ in self.getstats()
+        }
+
+    def create_stats(self) -> None:
+        """Convert samples into pstats compatible results (stored in the `stats` attribute)."""
+        self.disable()
+        stats = {}
+        for stack, n, t in self.getstats():
+            seen = set()
+            for index, key in enumerate(stack):
+                cc, nc, tt, ct, callers = stats.get(key, (0, 0, 0., 0., {}))
+                leaf = index == len(stack) - 1
+                if key not in seen:
+                    # Recursive frames are counted once per sample
+                    seen.add(key)
+                    cc, nc, ct = cc + n, nc + n, ct + t
+                if leaf:
+                    tt += t
+                if index:
+                    caller = stack[index - 1]
+                    c_cc, c_nc, c_tt, c_ct = callers.get(caller, (0, 0, 0., 0.))
+                    callers[caller] = (c_cc + n, c_nc + n, c_tt + (t if leaf else 0.), c_ct + t)
+                stats[key] = (cc, nc, tt, ct, callers)
+        self.stats = stats
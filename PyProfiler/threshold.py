@@ -0,0 +1,105 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    PyProfiler/threshold.py
+
+"""
+# Python Dependencies
+from threading import Lock
+from typing import Optional
+
+from .histogram import Histogram
+
+
+class SlowCalls:
+    """Slow Call Policy, profiling the next calls after a call exceeds a latency threshold.
+
+    Every (toggled) call is timed with a monotonic clock. When a call exceeds the threshold, the
+    following calls are fully profiled. The threshold is either fixed (seconds), or adaptive: a
+    percentile of the latencies observed so far.
+
+    Args:
+        seconds (float): Fixed latency threshold in seconds.
+        percentile (float): Adaptive threshold, as a percentile (between 0 and 100) of the
+            latencies observed so far (e.g. 99).
+        calls (int): Number of calls to profile once the threshold is exceeded.
+        warmup (int): Number of latencies to observe before an adaptive threshold is applied.
+        refresh (int): Number of latencies observed between updates of an adaptive threshold.
+
+    Notes:
+        - Exactly one of seconds or percentile must be defined.
+        - Profiled calls are not observed, since profiling inflates their latency.
+        - State is held by the policy, so a SlowCalls instance should not be shared by several
+          decorated functions.
+
+    """
+    __slots__ = ("seconds", "percentile", "calls", "warmup", "refresh", "threshold", "_remaining",
+                 "_histogram", "_observed", "_lock")
+
+    def __init__(self,
+                 seconds: Optional[float] = None,
+                 percentile: Optional[float] = None,
+                 calls: int = 1,
+                 warmup: int = 100,
+                 refresh: int = 100,
+                 ) -> None:
+        if (seconds is None) == (percentile is None):
+            raise ValueError("Define exactly one of seconds or percentile.")
+        if seconds is not None and seconds < 0:
+            raise ValueError(f"Threshold must be non-negative: {seconds}")
+        if percentile is not None and not 0 < percentile < 100:
+            raise ValueError(f"Percentile must be between 0 and 100: {percentile}")
+        if calls < 1 or warmup < 1 or refresh < 1:
+            raise ValueError(f"calls, warmup and refresh must be positive integers: ({calls}, {warmup}, {refresh})")
+
+        self.seconds = seconds
+        self.percentile = percentile
+        self.calls = calls
+        self.warmup = warmup
+        self.refresh = refresh
+        self.threshold = int(seconds * 1e9) if seconds is not None else float("inf")  # nanoseconds
+        self._remaining = 0
+        self._histogram = Histogram() if percentile is not None else None
+        self._observed = 0
+        self._lock = Lock()
+
+    def armed(self) -> bool:
+        """Consume one pending profile. True if the call should be profiled."""
+        if self._remaining <= 0:
+            return False
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    def observe(self, elapsed: int) -> None:
+        """Observe the latency (nanoseconds) of an unprofiled call."""
+        if self._histogram is not None:
+            self._histogram.record(elapsed)
+            self._observed += 1
+            if self._observed >= self.warmup and self._observed % self.refresh == 0:
+                self.threshold = self._histogram.percentile(self.percentile)
+
+        if elapsed > self.threshold:
+            with self._lock:
+                self._remaining = self.calls
@@ -24,6 +24,10 @@
 
 """
 # Python Dependencies
+import os
+import marshal
+
+from functools import reduce
 from io import IOBase
 from io import FileIO
 from io import BytesIO
@@ -32,18 +36,29 @@ from sys import stdout
 from sys import stderr
 from pstats import Stats
 from pstats import SortKey
+from threading import Lock
+from threading import get_ident
 
 from inspect import Parameter
 from inspect import signature
 from inspect import getfullargspec
 from inspect import ismethod
-from typing import Any, Callable, IO, Literal, Union
+from typing import Any, Callable, IO, Literal, Optional, Union
 
-from .errors import InvalidSortingMethod, InvalidMode
+from .errors import InvalidSortingMethod, InvalidMode, InvalidEngine, InvalidFormat, InvalidCompression
+from .exporters import FORMATS
+from .exporters import Dump
+from .stack import recorded
+from . import calibration
 
 
 # Globals
 MODE = Literal["a", "ab", "at", "w", "wb", "wt"]
+ENGINE = Literal["cprofile", "sampling", "memory", "timing", "monitoring", "line"]
+ENGINES = ["cprofile", "sampling", "memory", "timing", "monitoring", "line"]  # extended by wrapper.register_engine
+COMPRESSION = Literal["gzip", "zstd", None]
+_lock = Lock()
+_file_locks = {}  # {absolute path: Lock} serializing appends to a marshal dump within this process
 
 
 def get_default_args(function: Callable, default: Any) -> dict:
@@ -127,6 +142,82 @@ def check_keyword(function: Callable, keyword: str, *args, **kwargs):
     return key_value and isinstance(key_value, bool)
 
 
+class KeywordToggle:
+    """Precompiled Resolver of a toggle keyword for a given function.
+
+    Inspects the function once, caching where the keyword may be found, so that resolving the
+    toggle of each call only requires a dictionary lookup and a tuple index.
+
+    Args:
+        function (Callable): a callable function (or bound method / staticmethod)
+        keyword (str | None): keyword argument name found in function
+
+    Notes:
+        - If keyword is not present as a valid argument of the function, a warning is issued
+          once (at construction), and the resolver always returns False.
+        - As with `check_keyword`, only a value of exactly True enables the toggle.
+        - A keyword of None always enables the toggle (i.e. every call is profiled).
+
+    """
+    __slots__ = ("keyword", "index", "kwonly", "default", "offset", "present")
+
+    def __init__(self, function: Callable, keyword: Optional[str]) -> None:
+        self.keyword = keyword
+        self.index = -1
+        self.kwonly = False
+        self.default = False
+        self.offset = 0
+        self.present = True
+
+        if keyword is None:
+            self.kwonly = True
+            self.default = True
+            return
+
+        # Inspect the underlying function of staticmethod / classmethod descriptors
+        if isinstance(function, (staticmethod, classmethod)):
+            function = function.__func__
+        elif ismethod(function):
+            # Bound methods are called without the instance (or class) as first argument
+            self.offset = 1
+
+        specs = getfullargspec(function)
+        if keyword in specs.args:
+            self.index = specs.args.index(keyword) - self.offset
+            defaults = specs.defaults or ()
+            position = specs.args.index(keyword) - (len(specs.args) - len(defaults))
+            if position >= 0:
+                self.default = defaults[position]
+        elif keyword in specs.kwonlyargs:
+            self.kwonly = True
+            self.default = (specs.kwonlydefaults or {}).get(keyword, False)
+        else:
+            print(f"Warning: Keyword Not Available in Function: {keyword}", file=stderr)
+            self.present = False
+
+    def __call__(self, args: tuple, kwargs: dict) -> bool:
+        """Resolve the toggle value from the arguments delivered to the function.
+
+        Args:
+            args (tuple): Positional argument values delivered to function
+            kwargs (dict): Keyword argument values delivered to function
+
+        Returns:
+            (bool) True if the keyword resolves to True, else False
+
+        """
+        if not self.present:
+            return False
+
+        # Check Keyword Args --> Positional Args --> Default Values
+        if self.keyword in kwargs:
+            return kwargs[self.keyword] is True
+        if not self.kwonly and self.index < len(args):
+            return args[self.index] is True
+
+        return self.default is True
+
+
 def is_valid_sortkey(value: Any) -> bool:
     """Tests if the value is a valid Sorting Method accepted by cProfile and pstats Stats libraries.
 
@@ -173,35 +264,139 @@ def is_valid_mode(value: MODE) -> bool:
     return is_valid
 
 
-def output_stats(profile, sorting, stream: IO = stdout) -> None:
+def is_valid_engine(value: ENGINE) -> bool:
+    """Test if the value is a valid Profiling Engine.
+
+    Args:
+        value (ENGINE): name of the profiling engine
+
+    Returns:
+        (bool) if engine is supported / valid
+
+    Raises:
+        InvalidEngine
+
+    """
+    is_valid = value in ENGINES
+
+    if is_valid is False:
+        raise InvalidEngine(f"Invalid Profiling Engine: ({value}).")
+
+    return is_valid
+
+
+def is_valid_format(value: Union[str, Callable]) -> bool:
+    """Test if the value is a valid Output Format.
+
+    Args:
+        value (str | Callable): name of a supported format (see exporters.FORMATS), or a callable
+            exporter with signature (stats: pstats.Stats, stream: IO, name: str, sortby) -> None
+
+    Returns:
+        (bool) if format is supported / valid
+
+    Raises:
+        InvalidFormat
+
+    """
+    is_valid = callable(value) or value in FORMATS
+
+    if is_valid is False:
+        raise InvalidFormat(f"Invalid Output Format: ({value}).")
+
+    return is_valid
+
+
+def is_valid_compression(value: COMPRESSION) -> bool:
+    """Test if the value is a valid (and available) Compression Method.
+
+    Args:
+        value (COMPRESSION): name of the compression method, or None
+
+    Returns:
+        (bool) if compression is supported / valid
+
+    Raises:
+        InvalidCompression
+
+    Notes:
+        zstd compression requires the optional `zstandard` package.
+
+    """
+    is_valid = value in ["gzip", None]
+    if value == "zstd":
+        try:
+            import zstandard  # noqa: F401
+            is_valid = True
+        except ImportError:
+            raise InvalidCompression("zstd compression requires the zstandard package.")
+
+    if is_valid is False:
+        raise InvalidCompression(f"Invalid Compression Method: ({value}).")
+
+    return is_valid
+
+
+def output_stats(profile, sorting, stream: IO = stdout, fmt: Union[str, Callable] = "pstats", name: str = "",
+                 calibrate: Optional[str] = None) -> None:
     """Organize and delegate Profile results as prescribed.
 
     Args:
-        profile (cProfile.Profile): profile class containing results
+        profile (cProfile.Profile | tuple): profile class containing results, or a tuple of
+            profiles (e.g. from several threads) whose results are merged
         sorting (str | pstats.SortKey): method used to sort results
         stream (IO): where to output results (stdout by default)
+        fmt (str | Callable): output format (see exporters.FORMATS) or a callable exporter
+        name (str): name of the profiled function
+        calibrate (str): name of the engine whose instrumentation overhead is subtracted from
+            results (see PyProfiler.calibration), None to output results uncorrected
 
     Returns:
         (None) Profile results are sent to designated stream,
         which is stdout by default.
 
     """
-    p = Stats(profile, stream=stream)
-    p.sort_stats(sorting)
-    p.print_stats()
+    profiles = profile if isinstance(profile, tuple) else (profile,)
+
+    # Non pstats results (e.g. memory profiles) are merged, and write their own report
+    if hasattr(profiles[0], "write_report"):
+        report = reduce(lambda a, b: a.merge(b), profiles)
+        inner = tuple(i.profile for i in profiles if i.profile is not None and recorded(i.profile))
+        if inner:
+            output_stats(inner, sorting, stream, fmt, name, calibrate)
+        report.write_report(stream, name)
+        return
+
+    p = Stats(*profiles, stream=stream)
+    if calibrate is not None:
+        calibration.correct(p, calibration.bias(calibrate))
+    exporter = fmt if callable(fmt) else FORMATS[fmt]
+    exporter(p, stream, name, sorting)
+
+
+def _file_lock(path: str) -> Lock:
+    """Lock serializing appends to the file at path, shared by every Statistics of this process."""
+    path = os.path.abspath(path)
+    with _lock:
+        return _file_locks.setdefault(path, Lock())
 
 
 class Statistics:
-    __slots__ = ("stream", "mode", "sortby", "output")
+    __slots__ = ("stream", "mode", "sortby", "format", "calibrate", "output")
 
     def __init__(self,
                  stream: Union[str, StringIO, FileIO, BytesIO],
                  mode: MODE,
                  sortby: Any,
+                 format: Union[str, Callable] = "pstats",
+                 calibrate: Optional[str] = None,
                  ):
         self.stream = stream or stdout
         self.mode = mode
         self.sortby = sortby
+        self.calibrate = calibrate
+        # Binary modes write loadable (marshal) dumps rather than text tables
+        self.format = "marshal" if "b" in mode and format == "pstats" else format
 
         if issubclass(self.stream.__class__, (IOBase, StringIO, FileIO, BytesIO)):
             self.output = self._write_it
@@ -210,11 +405,47 @@ class Statistics:
         else:
             raise ValueError(f"Invalid Stream or Filepath: {self.stream}")
 
+    @property
+    def pstats_only(self) -> bool:
+        """Whether results are written as binary (marshal) dumps, which text reports cannot join."""
+        return "b" in self.mode or self.format == "marshal"
+
     def _open_file(self, profile, name: str):
+        if self.format == "marshal" and "a" in self.mode:
+            self._merge_file(profile, name)
+            return
         with open(self.stream, self.mode) as f:
-            f.write(f"Profiling {name}()\n")
-            output_stats(profile, self.sortby, f)
+            output_stats(profile, self.sortby, f, self.format, name, self.calibrate)
+
+    def _merge_file(self, profile, name: str):
+        """Append results to a marshal dump, merging them into (and replacing) the existing dump.
+
+        pstats only loads the first dump of a file, such that dumps may not simply be appended.
+        Merges are serialized per path within a process, and cost time proportional to the size
+        of the dump. Appending to the same file from several processes is unsupported (see
+        ShardWriter).
+
+        """
+        buffer = BytesIO()
+        output_stats(profile, self.sortby, buffer, self.format, name, self.calibrate)
+        stats = Stats(Dump(marshal.loads(buffer.getvalue())))
+
+        with _file_lock(self.stream):
+            if os.path.isfile(self.stream) and os.path.getsize(self.stream):
+                stats.add(self.stream)
+
+            temporary = f"{self.stream}.{os.getpid()}.{get_ident()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(marshal.dumps(stats.stats))
+            os.replace(temporary, self.stream)
 
     def _write_it(self, profile, name: str):
-        self.stream.write(f"Profiling {name}()\n")
-        output_stats(profile, self.sortby, self.stream)
+        output_stats(profile, self.sortby, self.stream, self.format, name, self.calibrate)
+
+    def flush(self) -> None:
+        if self.output == self._write_it:
+            self.stream.flush()
+
+    def close(self) -> None:
+        # Streams are owned by the caller, and files are closed after each write
+        self.flush()
@@ -24,10 +24,90 @@
 
 """
 # Python Dependencies
-from typing import Any, Callable, Optional
+import atexit
+
+from functools import partial
+from functools import update_wrapper
+from time import perf_counter_ns
+from time import thread_time_ns
+from inspect import isfunction
+from inspect import iscoroutinefunction
+from inspect import isasyncgenfunction
+from inspect import isgeneratorfunction
+from inspect import signature
+from sys import stderr
+from traceback import print_exc
+from types import ModuleType
+from typing import Any, Callable, Optional, Union
 from cProfile import Profile as _Profile
 
 from . import utils
+from . import calibration
+from . import context
+from . import coroutines
+from . import histogram
+from . import registry
+from .sampling import Sampler
+from .aggregate import Aggregate, Accumulator
+from .sinks import Sink
+from .sinks import as_sink
+from .stack import StackSampler
+from .stack import recorded
+from .memory import MemoryProfile
+from .threshold import SlowCalls
+from .engines import MONITORING
+from .engines import MonitoringProfile
+from .lines import LineProfile
+from .scaling import Scaling
+
+
+def _fallback(saturate: Optional[int] = None, **kwargs) -> _Profile:
+    """cProfile in place of MonitoringProfile before Python 3.12, where saturation is unsupported."""
+    return _Profile(**kwargs)
+
+
+# Globals
+ENGINES = {
+    "cprofile": _Profile,
+    "sampling": StackSampler,
+    "memory": MemoryProfile,
+    "monitoring": MonitoringProfile if MONITORING else _fallback,
+    "line": LineProfile,
+}
+DUNDERS = ("__init__", "__call__")  # special methods instrumented by class decoration
+
+
+def register_engine(name: str, factory: Callable) -> None:
+    """Register a Profiling Engine, selected by name with the engine argument of Profiler.
+
+    Args:
+        name (str): name of the engine
+        factory (Callable): creates a new (disabled) profile, supplied with the additional keyword
+            arguments of Profiler. Profiles must implement the interface of `engines.Engine`
+            (enable, disable, getstats and create_stats), producing pstats compatible results.
+
+    Example Usage:
+
+        ```python
+
+            from PyProfiler import Profiler, register_engine
+
+            register_engine("builtin-free", partial(cProfile.Profile, builtins=False))
+
+            @Profiler(engine="builtin-free")
+            def add(a, b, debug=True):
+                return a + b
+        ```
+
+    """
+    if name in ("memory", "timing"):
+        raise ValueError(f"Engine cannot be replaced: {name}")
+    if not callable(factory):
+        raise ValueError(f"Engine factory must be callable: {factory}")
+
+    ENGINES[name] = factory
+    if name not in utils.ENGINES:
+        utils.ENGINES.append(name)
 
 
 class Profiler:
@@ -38,14 +118,62 @@ class Profiler:
     then Profiled, providing output to the appropriate stream.
 
     Args:
-        keyword (str): Keyword (or Positional) Argument to search for in the wrapped function.
+        keyword (str | None): Keyword (or Positional) Argument to search for in the wrapped function.
+            If None, every call is profiled.
         filepath (str): The path to save output of function profiling. If None, the profile stats
-            are returned to stdout by default.
+            are returned to stdout by default. May also be a Sink (e.g. BackgroundWriter), in
+            which case mode and sortby are configured by the sink.
         mode (MODE): Mode used to write to filepath. Options: "a" | "ab" | "at" | "w" | "wb" | "wt"
         sortby (Any): Define how to sort Profiling Results for Visualization. For More Details:
             https://docs.python.org/3/library/profile.html#pstats.Stats.sort_stats
+        format (str | Callable): Output format of results. Options: "pstats" (default text table)
+            | "collapsed" (flamegraph collapsed stacks) | "speedscope" (JSON) | "callgrind"
+            | "marshal" (binary, default of binary modes), or a callable exporter (see PyProfiler.exporters).
+        sample (Sampler): Optional sampling policy (e.g. EveryN, Probability, TokenBucket),
+            consulted only when the keyword toggle is True. Unsampled calls are not profiled.
+        aggregate (Aggregate): Optional aggregation policy. When defined, profiled calls accumulate
+            into a single long-lived profile, flushed to the stream periodically (see Aggregate).
+        exclude_suspended (bool): When wrapping coroutine functions or asynchronous generators,
+            exclude time spent suspended in the event loop, such that results reflect the cost of
+            the awaited work itself (not I/O waits, or other tasks).
+        engine (ENGINE): How toggled calls are profiled. Options:
+            - "cprofile" (default): deterministic profiling with cProfile, output to the stream.
+            - "sampling": statistical profiling, sampling the stack at a fixed interval (see
+              StackSampler), output to the stream. Overhead is independent of call frequency.
+            - "memory": memory allocation profiling with tracemalloc (see MemoryProfile), reporting
+              peak memory, net allocated bytes and top allocating lines / tracebacks to the stream.
+            - "timing": low overhead wall clock and CPU time of each call, recorded into
+              histograms (see PyProfiler.histogram), available as the `timings` attribute of the
+              wrapped function. Nothing is output to the stream.
+            - "monitoring": deterministic profiling with sys.monitoring (see MonitoringProfile),
+              recording only the call tree of the profiled call, with lower overhead than cProfile.
+              Falls back to cProfile before Python 3.12.
+            - "line": hits and time of each line of the wrapped function (see LineProfile), and
+              optionally of the functions it calls directly (callees=True), reported as an
+              annotated source listing to the stream. Traced with sys.monitoring on Python 3.12+,
+              else sys.settrace.
+            Additional engines may be registered with `register_engine`.
         kwargs (Any): Additional keyword arguments are supplied to cProfile.Profile class. See:
             https://docs.python.org/3/library/profile.html#profile.Profile
+            When using the "sampling" engine, these are supplied to StackSampler (e.g. interval),
+            when using the "memory" engine, to MemoryProfile (e.g. limit, depth), and when using
+            the "monitoring" engine, to MonitoringProfile (e.g. saturate) on Python 3.12+ (saturate
+            is ignored by the cProfile fallback), and when using the "line" engine, to LineProfile
+            (e.g. callees).
+        slow (SlowCalls): Optional slow call policy. Every (toggled) call is timed, and only once a call
+            exceeds a latency threshold (fixed, or an adaptive percentile), the next calls are
+            profiled. Supported for (synchronous) functions.
+        memory (bool | dict): Profile memory allocations alongside the selected engine (other than
+            "memory" or "timing"). May be a dictionary of MemoryProfile options (e.g. {"depth": 5}).
+        calibrate (bool): Subtract the instrumentation overhead of the engine ("cprofile" or
+            "monitoring") from the reported tottime and cumtime. The overhead is measured once per
+            interpreter and CPU (when the Profiler is created), and cached on disk (see
+            PyProfiler.calibration). Unsupported when filepath is a Sink.
+        scaling (Scaling): Optional input size aware policy. Each profiled call is tagged with its
+            input size, and the report fits time against size (log-log slope and estimated
+            complexity) for the function and its top callees, available as the `scaling` attribute
+            of the wrapped function. Supported for (synchronous) functions, and not combined with
+            the slow or aggregate policies (nor class / module sessions).
 
     Example Usage:
 
@@ -76,41 +204,500 @@ class Profiler:
             sub(1, 2, verbose=False)  # Not profiled
         ```
 
+        A class may also be decorated, instrumenting each of its methods (including staticmethod,
+        classmethod and property descriptors), which accumulate into a single shared session (see
+        `flush` and `profile_module`):
+
+        ```python
+
+            profiler = Profiler(keyword=None)
+
+            @profiler
+            class Service:
+                def handle(self, request): ...
+                def query(self, sql): ...
+
+            Service().handle(request)
+            profiler.flush()  # one combined report of every instrumented method
+        ```
+
     Notes:
         - If the defined keyword is not a keyword or positional argument, the function will behave normally.
+        - When decorating a class, methods without the keyword are left undecorated, as are special
+          methods (other than __init__ and __call__).
         - When using multiple wrappers, the Profiler wrapper must be the first wrapper.
+        - Decorated functions may be switched on / off at runtime (see registry.enable / disable),
+          and the PYPROFILER environment variable may strip the decorator entirely.
 
     """
-    __slots__ = ("keyword", "_stream", "kwargs")
+    __slots__ = ("keyword", "_stream", "sample", "aggregate", "exclude_suspended", "engine", "slow", "memory",
+                 "scaling", "kwargs", "_factory", "_session")
 
     def __init__(self,
                  keyword: str = "debug",
                  filepath: Optional[Any] = None,
                  mode: utils.MODE = "a",
                  sortby: Any = "cumulative",
+                 format: Union[str, Callable] = "pstats",
+                 sample: Optional[Sampler] = None,
+                 aggregate: Optional[Aggregate] = None,
+                 exclude_suspended: bool = False,
+                 engine: utils.ENGINE = "cprofile",
+                 slow: Optional[SlowCalls] = None,
+                 memory: Union[bool, dict] = False,
+                 scaling: Optional[Scaling] = None,
+                 calibrate: bool = False,
                  **kwargs
                  ) -> None:
         # Sanity Checks - Raise errors immediately (not after profiling)
         utils.is_valid_mode(mode)
         utils.is_valid_sortkey(sortby)
+        utils.is_valid_engine(engine)
+        utils.is_valid_format(format)
 
         self.keyword = keyword
-        self._stream = utils.Statistics(
-            stream=filepath,
-            mode=mode,
-            sortby=sortby
-        )
+        if calibrate and engine not in calibration.FACTORIES:
+            raise ValueError(f"Calibration is unavailable for engine: {engine}")
+        if calibrate and isinstance(filepath, Sink):
+            raise ValueError(f"Calibration is unsupported by sinks: {type(filepath).__name__}")
+        if calibrate:
+            calibration.bias(engine)  # measure now, rather than within the first profiled call
+
+        self._stream = as_sink(filepath, mode, sortby, format, engine if calibrate else None)
+        self.sample = sample
+        self.aggregate = aggregate
+        self.exclude_suspended = exclude_suspended
+        self.engine = engine
+        self.slow = slow
+        self.memory = memory
+        self.scaling = scaling
         self.kwargs = kwargs
+        self._factory = partial(ENGINES.get(engine, _Profile), **kwargs)
+        self._session = None
+
+        if (engine == "memory" or (memory and engine != "timing")) and getattr(self._stream, "pstats_only", False):
+            raise ValueError("Memory profiles require a text output stream or filepath "
+                             f"(not a binary mode, marshal format, or {type(self._stream).__name__})")
+        if engine == "line" and getattr(self._stream, "pstats_only", False):
+            raise ValueError("Line profiles require a text output stream or filepath "
+                             f"(not a binary mode, marshal format, or {type(self._stream).__name__})")
+
+        if memory and engine not in ("memory", "timing"):
+            options = memory if isinstance(memory, dict) else {}
+            factory = self._factory
+            self._factory = lambda: MemoryProfile(profile=factory(), **options)
+
+    def __call__(self, function: Union[Callable, type]):
+        # Profiling is switched off entirely by the environment: hand back the function unmodified
+        if registry.stripped():
+            return function
+
+        if isinstance(function, type):
+            return self._class(function, self.session(function.__qualname__))
+        if isinstance(function, (staticmethod, classmethod, property)):
+            return self._member(function, None, select=False)
+
+        return self._wrap(function, None)
+
+    def session(self, name: str) -> Accumulator:
+        """Shared session, accumulating the profiles of every decorated class and module.
+
+        Args:
+            name (str): name of the class or module joining the session
+
+        Returns:
+            (Accumulator) the session of this Profiler, created on first use with the aggregation
+            policy of the Profiler (by default, flushed explicitly or at exit)
+
+        """
+        if self._session is None:
+            self._session = Accumulator(self.aggregate or Aggregate(), self._stream, name, self._factory)
+        elif name not in self._session.name.split(", "):
+            self._session.name = f"{self._session.name}, {name}"
+        return self._session
+
+    def flush(self) -> None:
+        """Output the results accumulated by the shared session (see `session`)."""
+        if self._session is not None:
+            self._session.flush()
+
+    def _accepts(self, function: Callable) -> bool:
+        """Whether the function should be instrumented by class / module decoration."""
+        if self.keyword is None:
+            return True
+        try:
+            return self.keyword in signature(function).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def _member(self, value: Any, session: Optional[Accumulator], select: bool = True) -> Any:
+        """Wrap a function, or the functions of a staticmethod, classmethod or property descriptor.
+
+        Args:
+            value (Any): class or module member
+            session (Accumulator): shared session, if any
+            select (bool): only wrap functions accepting the keyword (see `_accepts`)
+
+        Returns:
+            (Any) the wrapped member, or None if the member is not instrumented
+
+        """
+        if isinstance(value, (staticmethod, classmethod)):
+            function = self._member(value.__func__, session, select)
+            return None if function is None else type(value)(function)
+
+        if isinstance(value, property):
+            accessors = [self._member(i, session, select) if i is not None else None
+                         for i in (value.fget, value.fset, value.fdel)]
+            if all(i is None for i in accessors):
+                return None
+            fget, fset, fdel = [i or j for i, j in zip(accessors, (value.fget, value.fset, value.fdel))]
+            return type(value)(fget, fset, fdel, value.__doc__)
+
+        if isfunction(value) and (not select or self._accepts(value)):
+            return self._wrap(value, session)
+
+        return None
+
+    def _class(self, cls: type, session: Accumulator) -> type:
+        """Instrument (in place) the methods of a class, and of the classes nested in its body."""
+        for attribute, value in list(vars(cls).items()):
+            if isinstance(value, type) and value.__qualname__ == f"{cls.__qualname__}.{attribute}":
+                self._class(value, session)
+                continue
+            if attribute.startswith("__") and attribute.endswith("__") and attribute not in DUNDERS:
+                continue
+
+            member = self._member(value, session)
+            if member is not None:
+                setattr(cls, attribute, member)
+
+        return cls
+
+    def _wrap(self, function: Callable, accumulator: Optional[Accumulator]):
+        """Wrap a function, accumulating into the given session, if any."""
+        name = f"{function.__module__}.{function.__qualname__}"
+        toggle = utils.KeywordToggle(function, self.keyword)
+        entry = registry.register(name)
+
+        if self.engine == "timing":
+            timings = histogram.register(name)
+            wrapper = self._timing(function, toggle, entry, timings)
+            update_wrapper(wrapper, function)
+            wrapper.timings = timings
+            return wrapper
+
+        if accumulator is None and self.aggregate is not None:
+            accumulator = Accumulator(self.aggregate, self._stream, function.__qualname__, self._factory)
+
+        if self.slow is not None and (isgeneratorfunction(function) or iscoroutinefunction(function)
+                                      or isasyncgenfunction(function)):
+            raise ValueError(f"Slow call policy only supports (synchronous) functions: {function.__qualname__}")
+
+        if self.scaling is not None:
+            wrapper = self._scaling(function, toggle, entry, accumulator)
+            update_wrapper(wrapper, function)
+            wrapper.scaling = self.scaling
+            return wrapper
+
+        if isgeneratorfunction(function):
+            wrapper = self._generator(function, toggle, entry, accumulator)
+        elif iscoroutinefunction(function) or isasyncgenfunction(function):
+            wrapper = self._asynchronous(function, toggle, entry, accumulator)
+        else:
+            wrapper = self._function(function, toggle, entry, accumulator)
+
+        update_wrapper(wrapper, function)
+        if accumulator is not None:
+            wrapper.flush = accumulator.flush
+
+        return wrapper
+
+    def _function(self, function: Callable, toggle: utils.KeywordToggle, entry: registry.Entry,
+                  accumulator: Optional[Accumulator]):
+        """Wrap a (synchronous) function."""
+        sample = self.sample
+
+        if self.slow is not None:
+            return self._slow(function, toggle, entry, accumulator)
+
+        if accumulator is not None:
+            def wrapper(*args, **kwargs):
+                if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                    return function(*args, **kwargs)
+                return accumulator(function, args, kwargs)
+
+            return wrapper
 
-    def __call__(self, function: Callable):
         def wrapper(*args, **kwargs):
-            if not utils.check_keyword(function, self.keyword, *args, **kwargs):
+            if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                return function(*args, **kwargs)
+
+            # Nested calls are folded into the profile already active in this thread
+            prof = self._factory()
+            if not context.enable(prof):
                 return function(*args, **kwargs)
 
-            prof = _Profile(**self.kwargs)
-            ret_val = prof.runcall(function, *args, **kwargs)
-            self._stream.output(prof, function.__qualname__)
+            try:
+                ret_val = function(*args, **kwargs)
+            finally:
+                context.disable(prof)
+            # e.g. a sampling profile of a call shorter than its interval records nothing
+            if recorded(prof):
+                self._stream.output(prof, function.__qualname__)
 
             return ret_val
 
         return wrapper
+
+    def _slow(self, function: Callable, toggle: utils.KeywordToggle, entry: registry.Entry,
+              accumulator: Optional[Accumulator]):
+        """Wrap a (synchronous) function, timing every call, and profiling calls after a slow call."""
+        sample, slow = self.sample, self.slow
+        begin, end = self._lifecycle(function, accumulator)
+
+        def wrapper(*args, **kwargs):
+            if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                return function(*args, **kwargs)
+
+            if not slow.armed():
+                start = perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    slow.observe(perf_counter_ns() - start)
+
+            slot = begin()
+            try:
+                return context.runcall(slot.profile, function, args, kwargs)
+            finally:
+                end(slot)
+
+        return wrapper
+
+    def _scaling(self, function: Callable, toggle: utils.KeywordToggle, entry: registry.Entry,
+                 accumulator: Optional[Accumulator]):
+        """Wrap a (synchronous) function, recording the time and profile of each call by input size."""
+        if isgeneratorfunction(function) or iscoroutinefunction(function) or isasyncgenfunction(function):
+            raise ValueError(f"Scaling policy only supports (synchronous) functions: {function.__qualname__}")
+        if self.engine in ("memory", "timing", "line") or self.memory:
+            raise ValueError(f"Scaling policy requires a pstats compatible engine: {function.__qualname__}")
+        if self.slow is not None or accumulator is not None:
+            raise ValueError(f"Scaling policy cannot be combined with slow call or aggregation policies "
+                             f"(nor class / module sessions): {function.__qualname__}")
+
+        sample, scaling, factory, stream = self.sample, self.scaling, self._factory, self._stream
+        scaling.bind(function)
+
+        def flush() -> None:
+            # Recorded calls are handed to the stream, and recording starts afresh
+            snapshot = scaling.detach()
+            if snapshot.getstats():
+                stream.output(snapshot, function.__qualname__)
+
+        atexit.register(flush)
+
+        def wrapper(*args, **kwargs):
+            if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                return function(*args, **kwargs)
+
+            try:
+                size = scaling.size(args, kwargs)
+            except Exception:
+                # A faulty size extractor must not fail the call: it is instead executed unprofiled
+                print(f"Warning: Failed to extract the input size of {function.__qualname__}:", file=stderr)
+                print_exc(file=stderr)
+                return function(*args, **kwargs)
+
+            prof = factory()
+            start = perf_counter_ns()
+            try:
+                return context.runcall(prof, function, args, kwargs)
+            finally:
+                scaling.record(size, (perf_counter_ns() - start) / 1e9, prof)
+
+        wrapper.flush = flush
+        return wrapper
+
+    def _timing(self, function: Callable, toggle: utils.KeywordToggle, entry: registry.Entry,
+                timings: histogram.Timings):
+        """Wrap a function (or coroutine function), recording only wall clock and CPU time."""
+        if isgeneratorfunction(function) or isasyncgenfunction(function):
+            raise ValueError(f"Timing engine does not support generator functions: {function.__qualname__}")
+
+        sample = self.sample
+        record = timings.record
+
+        if iscoroutinefunction(function):
+            async def wrapper(*args, **kwargs):
+                if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                    return await function(*args, **kwargs)
+
+                wall, cpu = perf_counter_ns(), thread_time_ns()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    record(perf_counter_ns() - wall, thread_time_ns() - cpu)
+
+            return wrapper
+
+        def wrapper(*args, **kwargs):
+            if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                return function(*args, **kwargs)
+
+            wall, cpu = perf_counter_ns(), thread_time_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - wall, thread_time_ns() - cpu)
+
+        return wrapper
+
+    def _lifecycle(self, function: Callable, accumulator: Optional[Accumulator]):
+        """Return callables to begin (returning a Slot) and end (given the Slot) a profiled call."""
+        if accumulator is not None:
+            return accumulator.acquire, accumulator.release
+
+        factory, stream, name = self._factory, self._stream, function.__qualname__
+
+        def begin() -> context.Slot:
+            return context.Slot(factory(), 1)
+
+        def end(slot: context.Slot) -> None:
+            slot.depth -= 1
+            # Profiles of calls folded entirely into an already active profile record nothing
+            if slot.profile.getstats():
+                stream.output(slot.profile, name)
+
+        return begin, end
+
+    def _generator(self, function: Callable, toggle: utils.KeywordToggle, entry: registry.Entry,
+                   accumulator: Optional[Accumulator]):
+        """Wrap a generator function, profiling across the entire consumption of the generator."""
+        sample = self.sample
+        begin, end = self._lifecycle(function, accumulator)
+
+        def wrapper(*args, **kwargs):
+            if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                return (yield from function(*args, **kwargs))
+
+            # Delegates send, throw and close, profiling each resumption of the generator
+            slot = begin()
+            prof = slot.profile
+            gen = function(*args, **kwargs)
+            try:
+                value, error = None, None
+                while True:
+                    enabled = context.enable(prof)
+                    try:
+                        item = gen.send(value) if error is None else gen.throw(error)
+                    except StopIteration as e:
+                        return e.value
+                    finally:
+                        if enabled:
+                            context.disable(prof)
+
+                    try:
+                        value, error = (yield item), None
+                    except GeneratorExit:
+                        enabled = context.enable(prof)
+                        try:
+                            gen.close()
+                        finally:
+                            if enabled:
+                                context.disable(prof)
+                        raise
+                    except BaseException as e:
+                        value, error = None, e
+            finally:
+                end(slot)
+
+        return wrapper
+
+    def _asynchronous(self, function: Callable, toggle: utils.KeywordToggle, entry: registry.Entry,
+                      accumulator: Optional[Accumulator]):
+        """Wrap a coroutine function or asynchronous generator function."""
+        sample = self.sample
+        run = coroutines.stepped if self.exclude_suspended else coroutines.awaited
+        begin, end = self._lifecycle(function, accumulator)
+
+        if isasyncgenfunction(function):
+            async def wrapper(*args, **kwargs):
+                # Delegates asend, athrow and aclose, profiling each resumption of the generator
+                if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                    slot, prof, step = None, None, coroutines.plain
+                else:
+                    slot = begin()
+                    prof, step = slot.profile, run
+
+                agen = function(*args, **kwargs)
+                try:
+                    pending = agen.asend(None)
+                    while True:
+                        try:
+                            item = await step(pending, prof)
+                        except StopAsyncIteration:
+                            return
+
+                        try:
+                            value = yield item
+                        except GeneratorExit:
+                            await step(agen.aclose(), prof)
+                            raise
+                        except BaseException as e:
+                            pending = agen.athrow(e)
+                        else:
+                            pending = agen.asend(value)
+                finally:
+                    if slot is not None:
+                        end(slot)
+
+            return wrapper
+
+        async def wrapper(*args, **kwargs):
+            if not entry.enabled or not toggle(args, kwargs) or (sample is not None and not sample()):
+                return await function(*args, **kwargs)
+
+            slot = begin()
+            try:
+                return await run(function(*args, **kwargs), slot.profile)
+            finally:
+                end(slot)
+
+        return wrapper
+
+
+def profile_module(module: ModuleType, profiler: Optional[Profiler] = None) -> Profiler:
+    """Instrument (in place) the functions and classes defined in a module.
+
+    Every instrumented function and method accumulates into the shared session of the profiler,
+    such that calls crossing many functions produce a single combined report.
+
+    Args:
+        module (ModuleType): an imported module
+        profiler (Profiler): profiler used to instrument the module. By default, a Profiler
+            profiling every call (keyword=None), output to stdout when flushed.
+
+    Returns:
+        (Profiler) the profiler, whose `flush` method outputs the results of the session
+
+    Notes:
+        References bound before instrumentation (e.g. `from module import function`) are unaffected.
+
+    """
+    profiler = Profiler(keyword=None) if profiler is None else profiler
+    if registry.stripped():
+        return profiler
+
+    session = profiler.session(module.__name__)
+    for attribute, value in list(vars(module).items()):
+        if getattr(value, "__module__", None) != module.__name__:
+            continue  # imported
+        if isinstance(value, type):
+            profiler._class(value, session)
+        elif isfunction(value):
+            member = profiler._member(value, session)
+            if member is not None:
+                setattr(module, attribute, member)
+
+    return profiler
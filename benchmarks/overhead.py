@@ -0,0 +1,225 @@
+"""
+    PyProfiler/benchmarks/overhead.py
+
+    Per call overhead of the Profiler decorator, for the call shapes of tests/functions.py:
+    undecorated (baseline), disabled toggle, enabled toggle (results discarded). Separately, the
+    cost of outputting the results of a captured profile (Statistics) to stdout, StringIO and a file.
+
+    Usage (from the repository root):
+
+        python -m benchmarks.overhead -o results.json
+        python -m benchmarks.overhead --compare results.json --threshold 1.25
+
+"""
+# Python Dependencies
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+from cProfile import Profile
+from io import StringIO
+from io import TextIOWrapper
+from tempfile import TemporaryDirectory
+from timeit import Timer
+from typing import Callable, Dict, IO, List, Optional, Tuple
+
+from PyProfiler import Profiler
+from PyProfiler import Sink
+from PyProfiler.utils import Statistics
+
+from tests.functions import example
+from tests.functions import example_2
+from tests.functions import example_3
+from tests.functions import Example
+
+
+# Globals
+REPEAT = 5
+TARGET = 0.2  # seconds per measurement
+THRESHOLD = 1.25  # ratio of a regression
+FLOOR = 50.  # nanoseconds, differences below are noise
+
+
+class Discard(Sink):
+    """Sink discarding results, isolating the cost of profiling from the cost of output."""
+    __slots__ = ()
+
+    def output(self, profile, name: str) -> None:
+        ...
+
+
+def shapes(decorate: Callable) -> Dict[str, Tuple[Callable, tuple, dict, tuple, dict]]:
+    """Call shapes of tests/functions.py, decorated by decorate(function, keyword).
+
+    Returns:
+        (dict) {shape: (callable, enabled args, enabled kwargs, disabled args, disabled kwargs)}
+
+    """
+    bench = type("Bench", (), {
+        "magic": decorate(Example.magic, "profile"),
+        "lady": staticmethod(decorate(Example.lady, "profile")),
+        "black": classmethod(decorate(vars(Example)["black"].__func__, "debug")),
+    })
+    instance = bench()
+    return {
+        "positional": (decorate(example, "debug"), (1, 2, True), {}, (1, 2, False), {}),
+        "keyword": (decorate(example, "debug"), (1, 2), {"debug": True}, (1, 2), {"debug": False}),
+        "default": (decorate(example_2, "verbose"), (1, 2), {}, (1, 2), {"verbose": False}),
+        "keyword-only": (decorate(example_3, "debug"), (1, 2), {}, (1, 2), {"debug": False}),
+        "method": (instance.magic, (1, True), {}, (1, False), {}),
+        "staticmethod": (bench.lady, (1, True), {}, (1, False), {}),
+        "classmethod": (bench.black, (1,), {"debug": True}, (1,), {"debug": False}),
+    }
+
+
+def measure(function: Callable, args: tuple, kwargs: dict, repeat: int = REPEAT,
+            number: Optional[int] = None) -> float:
+    """Best (minimum) time per call in nanoseconds, over repeated measurements."""
+    timer = Timer(lambda: function(*args, **kwargs))
+    if number is None:
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * TARGET / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def _output(statistics: Statistics) -> Callable:
+    """Output function of statistics, emptying a StringIO stream first (so it does not grow across calls)."""
+    stream = statistics.stream
+    if not isinstance(stream, StringIO):
+        return statistics.output
+
+    def output(profile, name: str) -> None:
+        stream.seek(0)
+        stream.truncate()
+        statistics.output(profile, name)
+
+    return output
+
+
+def run(repeat: int = REPEAT, number: Optional[int] = None) -> Dict[str, float]:
+    """Measure every case.
+
+    Args:
+        repeat (int): number of measurements of each case (the best is kept)
+        number (int): calls per measurement (calibrated to ~0.2 seconds by default)
+
+    Returns:
+        (dict) {"<shape>.<path>": nanoseconds per call}
+
+    """
+    results = {}
+    undecorated = shapes(lambda function, keyword: function)
+    decorated = shapes(lambda function, keyword: Profiler(keyword=keyword, filepath=Discard())(function))
+    for shape, (function, args, kwargs, off_args, off_kwargs) in undecorated.items():
+        wrapped = decorated[shape][0]
+        results[f"{shape}.baseline"] = measure(function, args, kwargs, repeat, number)
+        results[f"{shape}.disabled"] = measure(wrapped, off_args, off_kwargs, repeat, number)
+        results[f"{shape}.enabled"] = measure(wrapped, args, kwargs, repeat, number)
+
+    # Output of the results of a profile captured once (Statistics), isolated from profiling
+    profile = Profile()
+    profile.runcall(example, 1, 2, True)
+    with TemporaryDirectory() as directory, open(os.devnull, "wb") as devnull:
+        streams = {
+            "stdout": TextIOWrapper(devnull, write_through=True),  # as stdout redirected to /dev/null
+            "stringio": StringIO(),
+            "file": os.path.join(directory, "output.txt"),  # opened (and truncated) by every output
+        }
+        for name, stream in streams.items():
+            statistics = Statistics(stream, mode="w", sortby="cumulative")
+            results[f"output.{name}"] = measure(_output(statistics), (profile, "example"), {}, repeat, number)
+        streams["stdout"].detach()
+
+    return results
+
+
+def revision() -> Optional[str]:
+    """Git revision of the working tree (None if unavailable)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: Dict[str, float]) -> dict:
+    """Machine readable report of results, with the environment they were measured in."""
+    return {
+        "revision": revision(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "unit": "ns/call",
+        "results": results,
+    }
+
+
+def compare(before: Dict[str, float], after: Dict[str, float], threshold: float = THRESHOLD,
+            floor: float = FLOOR) -> List[tuple]:
+    """Compare results of two revisions.
+
+    Args:
+        before (dict): baseline results
+        after (dict): results to compare
+        threshold (float): ratio (after / before) above which a case regressed
+        floor (float): differences (nanoseconds) below which a case never regresses
+
+    Returns:
+        (list) of (case, before, after, ratio, regressed)
+
+    """
+    rows = []
+    for case in sorted(before.keys() & after.keys()):
+        ratio = after[case] / before[case] if before[case] else float("inf")
+        regressed = ratio > threshold and after[case] - before[case] > floor
+        rows.append((case, before[case], after[case], ratio, regressed))
+    return rows
+
+
+def write_table(results: Dict[str, float], stream: IO) -> None:
+    """Human readable table of results, with the overhead of each path over the baseline."""
+    stream.write(f"{'case':<28} {'ns/call':>12} {'overhead':>12}\n")
+    for case, value in results.items():
+        # Output cases measure output alone, without a baseline
+        baseline = results.get(f"{case.split('.')[0]}.baseline")
+        overhead = "" if baseline is None or case.endswith(".baseline") else f"{value - baseline:+.1f}"
+        stream.write(f"{case:<28} {value:>12.1f} {overhead:>12}\n")
+
+
+def main(argv: Optional[List[str]] = None, stream: Optional[IO] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.overhead", description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("-o", "--output", help="write results (JSON) to this path")
+    parser.add_argument("-c", "--compare", help="compare with results (JSON) of another revision")
+    parser.add_argument("-t", "--threshold", type=float, default=THRESHOLD, help="ratio of a regression")
+    parser.add_argument("-r", "--repeat", type=int, default=REPEAT, help="measurements of each case")
+    parser.add_argument("-n", "--number", type=int, default=None, help="calls per measurement")
+    args = parser.parse_args(argv)
+    stream = stream or sys.stdout
+
+    results = run(args.repeat, args.number)
+    write_table(results, stream)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report(results), f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)
+        rows = compare(before["results"], results, args.threshold)
+        stream.write(f"\nCompared with {before.get('revision') or args.compare} (python {before.get('python')})\n")
+        stream.write(f"{'case':<28} {'before':>12} {'after':>12} {'ratio':>8}\n")
+        for case, a, b, ratio, regressed in rows:
+            stream.write(f"{case:<28} {a:>12.1f} {b:>12.1f} {ratio:>8.2f}{'  REGRESSION' if regressed else ''}\n")
+        if any(row[-1] for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,10 @@ def example_2(a: int = 1, b: int = 2, verbose: bool = True):
     return a + b
 
 
+def example_3(a, b, *, debug=True):
+    return a + b
+
+
 class Example:
     def __init__(self):
         pass
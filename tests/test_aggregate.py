@@ -0,0 +1,61 @@
+"""
+    PyProfiler/tests/test_aggregate.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+
+from PyProfiler import Profiler
+from PyProfiler import Aggregate
+
+
+def factorial(n, debug=True):
+    return 1 if n <= 1 else n * factorial(n - 1)
+
+
+@pytest.mark.parametrize("calls, n, expected", [
+    (1, 5, 5),
+    (2, 5, 2),
+    (5, 5, 1),
+    (10, 5, 0),
+])
+def test_flush_by_calls(calls, n, expected):
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, aggregate=Aggregate(calls=calls, at_exit=False))(factorial)
+    for _ in range(n):
+        assert wrapped(4) == 24
+    assert stream.getvalue().count("Profiling factorial()") == expected
+
+
+def test_flush_explicit():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, aggregate=Aggregate(at_exit=False))(factorial)
+    for _ in range(3):
+        wrapped(4)
+    assert stream.getvalue() == ""
+
+    wrapped.flush()
+    output = stream.getvalue()
+    assert output.count("Profiling factorial()") == 1
+    assert "12/3" in output  # 3 calls, each recursing 3 times
+
+    # Nothing remains to be flushed
+    wrapped.flush()
+    assert stream.getvalue() == output
+
+
+def test_flush_by_interval():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, aggregate=Aggregate(interval=1e-9, at_exit=False))(factorial)
+    wrapped(3)
+    assert stream.getvalue().count("Profiling factorial()") == 1
+
+
+@pytest.mark.parametrize("kwargs", [
+    pytest.param({"interval": 0}, marks=pytest.mark.xfail(raises=ValueError)),
+    pytest.param({"calls": 0}, marks=pytest.mark.xfail(raises=ValueError)),
+])
+def test_invalid_policy(kwargs):
+    Aggregate(**kwargs)
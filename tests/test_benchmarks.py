@@ -0,0 +1,59 @@
+"""
+    PyProfiler/tests/test_benchmarks.py
+
+"""
+# Python Dependencies
+import json
+import pytest
+
+from cProfile import Profile
+from io import StringIO
+
+from benchmarks import overhead
+from PyProfiler.utils import Statistics
+
+
+def test_overhead(tmp_path):
+    path = str(tmp_path / "results.json")
+    stream = StringIO()
+    assert overhead.main(["-r", "1", "-n", "10", "-o", path], stream) == 0
+
+    with open(path) as f:
+        report = json.load(f)
+    assert report["unit"] == "ns/call"
+    for shape in ("positional", "keyword", "default", "keyword-only", "method", "staticmethod", "classmethod"):
+        for path_ in ("baseline", "disabled", "enabled"):
+            assert report["results"][f"{shape}.{path_}"] > 0
+    for output in ("stdout", "stringio", "file"):
+        assert report["results"][f"output.{output}"] > 0
+    assert "positional.enabled" in stream.getvalue()
+
+
+@pytest.mark.parametrize("before, after, regressed", [
+    (100., 110., False),
+    (100., 200., True),
+    (10., 40., False),  # below the noise floor
+])
+def test_compare(before, after, regressed):
+    rows = overhead.compare({"case": before}, {"case": after, "other": 1.})
+    assert [row[0] for row in rows] == ["case"]
+    assert rows[0][-1] is regressed
+
+
+def test_output_stringio():
+    # The StringIO stream is emptied before each output, rather than growing across measurements
+    profile = Profile()
+    profile.runcall(sum, range(10))
+    statistics = Statistics(StringIO(), mode="w", sortby="cumulative")
+    output = overhead._output(statistics)
+    output(profile, "sum")
+    size = len(statistics.stream.getvalue())
+    output(profile, "sum")
+    assert len(statistics.stream.getvalue()) == size > 0
+
+
+def test_write_table():
+    stream = StringIO()
+    overhead.write_table({"positional.baseline": 100., "positional.enabled": 350., "output.file": 5000.}, stream)
+    rows = {line.split()[0]: line.split()[1:] for line in stream.getvalue().splitlines()[1:]}
+    assert rows == {"positional.baseline": ["100.0"], "positional.enabled": ["350.0", "+250.0"], "output.file": ["5000.0"]}
@@ -0,0 +1,151 @@
+"""
+    PyProfiler/tests/test_calibration.py
+
+"""
+# Python Dependencies
+import json
+import pytest
+
+from cProfile import Profile
+from io import StringIO
+from pstats import Stats
+
+from PyProfiler import Profiler
+from PyProfiler import RingBuffer
+from PyProfiler import calibration
+from PyProfiler.calibration import Bias
+
+
+class Dump:
+    """Raw stats, loadable by pstats.Stats."""
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        ...
+
+
+ROOT = ("a.py", 1, "root")
+LEAF = ("a.py", 5, "leaf")
+
+
+def leaf():
+    ...
+
+
+def root(n, debug=True):
+    for _ in range(n):
+        leaf()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "calibration.json")
+    monkeypatch.setattr(calibration, "CACHE", path)
+    monkeypatch.setattr(calibration, "_biases", {})
+    return path
+
+
+def test_measure():
+    bias = calibration.measure(calls=10_000, rounds=3)
+    assert bias.inside >= 0 and bias.outside >= 0
+    assert bias.inside + bias.outside > 0
+    assert "ns" in repr(bias)
+
+
+def test_correct():
+    stats = Stats(Dump({
+        ROOT: (1, 1, 0.5, 2.0, {}),
+        LEAF: (100, 100, 1.5, 1.5, {ROOT: (100, 100, 1.5, 1.5)}),
+    }))
+    calibration.correct(stats, Bias(0.01, 0.004))
+    assert stats.stats[LEAF][2] == pytest.approx(0.5)  # 1.5 - 100 * 0.01
+    assert stats.stats[LEAF][3] == pytest.approx(0.5)
+    assert stats.stats[LEAF][4][ROOT][2] == pytest.approx(0.5)
+    assert stats.stats[ROOT][2] == pytest.approx(0.09)  # 0.5 - 1 * 0.01 - 100 * 0.004
+    assert stats.stats[ROOT][3] == pytest.approx(0.59)  # 2.0 - 0.01 - 100 * 0.014
+    assert stats.total_tt == pytest.approx(0.59)
+
+
+def test_correct_floor():
+    stats = Stats(Dump({LEAF: (1, 1, 1e-9, 1e-9, {})}))
+    calibration.correct(stats, Bias(1., 1.))
+    assert stats.stats[LEAF][2:4] == (0., 0.)
+
+
+def test_correct_callees():
+    # Corrected cumtime of a caller includes the corrected cumtime of its callees
+    stats = Stats(Dump({
+        ROOT: (1, 1, 0.001, 0.002, {}),
+        LEAF: (1, 1, 0.001, 0.001, {ROOT: (1, 1, 0.001, 0.001)}),
+    }))
+    calibration.correct(stats, Bias(0., 0.0015))
+    assert stats.stats[LEAF][3] == pytest.approx(0.001)
+    assert stats.stats[ROOT][2] == 0.
+    assert stats.stats[ROOT][3] == pytest.approx(0.001)
+
+
+def test_bias_unavailable(cache, monkeypatch):
+    measured = []
+
+    def measure(factory):
+        measured.append(factory)
+        raise ValueError("profiler in use")
+
+    monkeypatch.setattr(calibration, "measure", measure)
+    assert calibration.bias("cprofile").inside == 0.
+    assert calibration.bias("cprofile").outside == 0.
+    assert len(measured) == 1
+
+
+def test_bias_cache(cache, monkeypatch):
+    measured = []
+
+    def measure(factory):
+        measured.append(factory)
+        return Bias(1e-8, 2e-8)
+
+    monkeypatch.setattr(calibration, "measure", measure)
+    assert calibration.bias("cprofile").inside == 1e-8
+    assert calibration.bias("cprofile").outside == 2e-8
+    assert measured == [Profile]
+
+    # Cached on disk, keyed by engine, interpreter and CPU
+    with open(cache) as f:
+        assert list(json.load(f)) == [f"cprofile | {calibration.machine()}"]
+    monkeypatch.setattr(calibration, "_biases", {})
+    calibration.bias("cprofile")
+    assert len(measured) == 1
+
+    calibration.bias("cprofile", refresh=True)
+    assert len(measured) == 2
+
+
+def test_profiler_calibrate(cache):
+    def tottime(output: str) -> float:
+        return next(float(line.split()[1]) for line in output.splitlines() if "(leaf)" in line)
+
+    raw, corrected = StringIO(), StringIO()
+    Profiler(filepath=raw, sortby="tottime")(root)(100_000)
+    Profiler(filepath=corrected, sortby="tottime", calibrate=True)(root)(100_000)
+    assert tottime(corrected.getvalue()) < tottime(raw.getvalue())
+
+
+def test_profiler_calibrate_measures(cache, monkeypatch):
+    measured = []
+    monkeypatch.setattr(calibration, "measure", lambda factory: measured.append(factory) or Bias(0., 0.))
+    wrapped = Profiler(filepath=StringIO(), calibrate=True)(root)
+    assert measured == [Profile]
+    wrapped(10)
+    assert measured == [Profile]
+
+
+def test_calibrate_sink():
+    with pytest.raises(ValueError):
+        Profiler(filepath=RingBuffer(), calibrate=True)
+
+
+@pytest.mark.parametrize("engine", ["sampling", "memory", "timing"])
+def test_calibrate_engine(engine):
+    with pytest.raises(ValueError):
+        Profiler(engine=engine, calibrate=True)
@@ -0,0 +1,138 @@
+"""
+    PyProfiler/tests/test_callgraph.py
+
+"""
+# Python Dependencies
+import random
+import time
+import pytest
+
+from PyProfiler import CallGraph
+from PyProfiler import Profiler
+from PyProfiler import RingBuffer
+from PyProfiler.exporters import MAX_DEPTH
+
+
+def key(name: str) -> tuple:
+    return ("app.py", 1, name)
+
+
+#   main (10s) -> load (2s) -> read (2s)
+#              -> process (7s) -> parse (1s)
+#                              -> compute (6s) -> compute (recursive)
+STATS = {
+    key("main"): (1, 1, 1.0, 10.0, {}),
+    key("load"): (1, 1, 0.0, 2.0, {key("main"): (1, 1, 0.0, 2.0)}),
+    key("read"): (1, 1, 2.0, 2.0, {key("load"): (1, 1, 2.0, 2.0)}),
+    key("process"): (1, 1, 0.0, 7.0, {key("main"): (1, 1, 0.0, 7.0)}),
+    key("parse"): (1, 1, 1.0, 1.0, {key("process"): (1, 1, 1.0, 1.0)}),
+    key("compute"): (1, 3, 6.0, 6.0, {key("process"): (1, 1, 2.0, 6.0), key("compute"): (0, 2, 4.0, 4.0)}),
+}
+
+
+@pytest.fixture
+def graph():
+    return CallGraph(STATS)
+
+
+def test_indexes(graph):
+    assert len(graph) == 6
+    assert graph.edges == 6
+    assert key("main") in graph
+    assert set(graph.callees(key("main"))) == {key("load"), key("process")}
+    assert set(graph.callers(key("compute"))) == {key("process"), key("compute")}
+    assert graph.callees(key("read")) == {}
+    assert graph.roots() == [key("main")]
+    assert graph.root() == key("main")
+    assert graph.find("comp*") == [key("compute")]
+    assert set(graph.reachable(key("process"))) == {key("process"), key("parse"), key("compute")}
+    assert graph.find("*(app.py:1)") == list(STATS)
+
+
+def test_critical_path(graph):
+    assert graph.critical_path() == [(key("main"), 10.0), (key("process"), 7.0), (key("compute"), 6.0)]
+    assert graph.critical_path(key("load")) == [(key("load"), 2.0), (key("read"), 2.0)]
+
+
+def test_top_paths(graph):
+    paths = graph.top_paths(limit=2)
+    assert [tuple(k[2] for k in path) for path, _ in paths] == [
+        ("main", "process", "compute"),
+        ("main", "load", "read"),
+    ]
+    assert [value for _, value in paths] == [6.0, 2.0]
+    paths = graph.top_paths(limit=10)
+    assert [(path[-1][2], value) for path, value in paths] == [("compute", 6.0), ("read", 2.0), ("parse", 1.0), ("main", 1.0)]
+
+
+def test_hotspots(graph):
+    assert [(k[2], value) for k, value in graph.hotspots(50)] == [("main", 100.0), ("process", 70.0), ("compute", 60.0)]
+    assert [k[2] for k, _ in graph.hotspots(20, root=key("process"))] == ["process", "compute"]
+
+
+def test_empty():
+    graph = CallGraph({})
+    assert graph.root() is None
+    assert graph.critical_path() == []
+    assert graph.top_paths() == []
+    assert graph.hotspots(10) == []
+
+
+def leaf(i):
+    return i
+
+
+def branch(n):
+    return sum(leaf(i) for i in range(n))
+
+
+def handler(n, debug=True):
+    return [branch(n) for _ in range(3)]
+
+
+def test_capture():
+    buffer = RingBuffer()
+    Profiler(filepath=buffer)(handler)(100)
+    for source in (buffer.stats(), buffer.stats().stats):
+        graph = CallGraph(source)
+        assert graph.root()[2] == "handler"
+        assert "branch" in [k[2] for k, _ in graph.critical_path()]
+        assert any(k[2] == "branch" for k, _ in graph.hotspots(10))
+
+
+def fib(n, debug=True):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def test_capture_recursive():
+    # A recursive function is its own caller: it remains the root, rather than the profiler's frames
+    buffer = RingBuffer()
+    Profiler(filepath=buffer)(fib)(15)
+    graph = CallGraph(buffer.stats())
+    assert graph.root()[2] == "fib"
+    assert graph.critical_path()[0][0][2] == "fib"
+    assert graph.top_paths(limit=1)[0][0][0][2] == "fib"
+    hotspots = graph.hotspots(10)
+    assert hotspots[0][0][2] == "fib" and hotspots[0][1] == pytest.approx(100)
+    assert all(value <= 100 + 1e-6 for _, value in hotspots)
+
+
+def test_scale():
+    # Wide and deep graph with hundreds of thousands of edges, each function called by two callers
+    rng, stats, width, depth = random.Random(0), {}, 500, 400
+    for layer in range(depth):
+        for i in range(width):
+            ct = rng.uniform(1, 2) / (layer + 1)
+            edges = (((i + 1) % width, .4), ((i + 7) % width, .6))
+            callers = {} if layer == 0 else {("m.py", layer - 1, f"f{j}"): (1, 1, 0., ct * share) for j, share in edges}
+            stats[("m.py", layer, f"f{i}")] = (1, 2, rng.uniform(0, ct), ct, callers)
+
+    start = time.perf_counter()
+    graph = CallGraph(stats)
+    assert graph.edges == (depth - 1) * width * 2
+    assert len(graph.critical_path()) == min(depth, MAX_DEPTH)
+    paths = graph.top_paths(limit=10)
+    assert len(paths) == 10
+    assert all(a >= b or a == pytest.approx(b) for (_, a), (_, b) in zip(paths, paths[1:]))
+    graph.hotspots(5)
+    assert time.perf_counter() - start < 10
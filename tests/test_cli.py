@@ -0,0 +1,93 @@
+"""
+    PyProfiler/tests/test_cli.py
+
+"""
+# Python Dependencies
+import os
+import gzip
+import shutil
+import pytest
+
+from io import StringIO
+from pstats import Stats
+
+from PyProfiler import Profiler
+from PyProfiler import cli
+
+
+def fast(n, debug=True):
+    return sum(range(n))
+
+
+def slow(n, debug=True):
+    return sum(i * i for i in range(n))
+
+
+def capture(directory, function, count, n=100):
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        Profiler(filepath=os.path.join(directory, f"{function.__name__}.{i}.prof"), mode="wb")(function)(n)
+
+
+def calls(stats, name):
+    return sum(v[1] for k, v in stats.stats.items() if k[2] == name)
+
+
+@pytest.mark.parametrize("workers, chunksize", [
+    (1, 64),
+    (1, 2),
+    (2, 3),
+])
+def test_merge(tmp_path, workers, chunksize):
+    capture(tmp_path / "dumps", fast, 7)
+    capture(tmp_path / "dumps" / "nested", slow, 3)
+    output = str(tmp_path / "merged.prof")
+    assert cli.main(["merge", str(tmp_path / "dumps"), "-o", output, "-j", str(workers),
+                     "--chunksize", str(chunksize)]) == 0
+
+    stats = Stats(output)
+    assert calls(stats, "fast") == 7
+    assert calls(stats, "slow") == 3
+
+
+def test_merge_compressed(tmp_path):
+    capture(tmp_path, fast, 2)
+    path = str(tmp_path / "fast.0.prof")
+    with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+    stats = cli.merge(cli.discover([str(tmp_path)]), workers=1)
+    assert calls(stats, "fast") == 2
+
+
+def test_merge_empty(tmp_path):
+    assert cli.merge(cli.discover([str(tmp_path)]), workers=1) is None
+    with pytest.raises(SystemExit):
+        cli.main(["top", str(tmp_path), "-j", "1"])
+
+
+def test_top(tmp_path):
+    capture(tmp_path, fast, 3)
+    stream = StringIO()
+    cli.main(["top", str(tmp_path), "-s", "ncalls", "-n", "5", "-j", "1"], stream)
+    output = stream.getvalue()
+    assert "Ordered by: call count" in output
+    assert "fast" in output
+
+
+def test_top_sortkey(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["top", str(tmp_path), "-s", "unknown"])
+    assert "Invalid Sorting Method" in capsys.readouterr().err
+
+
+def test_diff(tmp_path):
+    capture(tmp_path / "before", slow, 1, n=10)
+    capture(tmp_path / "after", slow, 1, n=100000)
+    stream = StringIO()
+    cli.main(["diff", str(tmp_path / "before"), str(tmp_path / "after"), "-b", "cumtime", "-j", "1"], stream)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].split() == ["delta", "before", "after", "calls", "function"]
+    assert any("slow" in line for line in lines[1:4])
+    assert lines[1].split()[0].startswith("+")
+    assert float(lines[1].split()[0]) >= float(lines[-1].split()[0])
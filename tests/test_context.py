@@ -0,0 +1,110 @@
+"""
+    PyProfiler/tests/test_context.py
+
+"""
+# Python Dependencies
+import sys
+import pytest
+
+from io import StringIO
+from cProfile import Profile
+from concurrent.futures import ThreadPoolExecutor
+
+from PyProfiler import Profiler
+from PyProfiler import Aggregate
+from PyProfiler import context
+
+
+def profiled_names(output):
+    return [line for line in output.splitlines() if line.startswith("Profiling ")]
+
+
+def busy(n, debug=True):
+    return sum(i * i for i in range(n))
+
+
+def test_enable_folds_nested():
+    outer, inner = Profile(), Profile()
+    assert context.active() is None
+    assert context.enable(outer) is True
+    assert context.active() is outer
+    assert context.enable(inner) is False
+    context.disable(outer)
+    assert context.active() is None
+
+
+def test_nested_profilers():
+    stream = StringIO()
+    inner = Profiler(filepath=stream)(busy)
+
+    @Profiler(filepath=stream)
+    def outer(debug=True):
+        return inner(100) + inner(200)
+
+    assert outer() == busy(100) + busy(200)
+    output = stream.getvalue()
+    # The inner calls are folded into (and recorded by) the outer profile
+    assert profiled_names(output) == ["Profiling test_nested_profilers.<locals>.outer()"]
+    assert "(busy)" in output
+
+
+def test_nested_aggregate():
+    stream = StringIO()
+    inner = Profiler(filepath=stream, aggregate=Aggregate(calls=1, at_exit=False))(busy)
+
+    @Profiler(filepath=stream)
+    def outer(debug=True):
+        return inner(100)
+
+    # The inner call is folded into the outer profile: its own (empty) profile is never output
+    assert outer() == busy(100)
+    inner.flush()
+    assert profiled_names(stream.getvalue()) == ["Profiling test_nested_aggregate.<locals>.outer()"]
+
+
+def test_recursive_profiler():
+    stream = StringIO()
+
+    @Profiler(filepath=stream)
+    def fib(n, debug=True):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    assert fib(10) == 55
+    assert len(profiled_names(stream.getvalue())) == 1
+
+
+# On Python 3.12+ a single profile may be enabled at once, interpreter wide: concurrent calls run
+# unprofiled, and the enabled profile also records the frames of other threads
+SHARED = pytest.mark.skipif(sys.version_info >= (3, 12), reason="cProfile is interpreter wide on Python 3.12+")
+
+
+@pytest.mark.parametrize("aggregate, expected", [
+    pytest.param(None, 32, marks=SHARED),
+    (Aggregate(at_exit=False), 0),
+])
+def test_thread_pool(aggregate, expected):
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, aggregate=aggregate)(busy)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(wrapped, [1000] * 32))
+
+    assert results == [busy(1000)] * 32
+    assert len(profiled_names(stream.getvalue())) == expected
+
+
+@SHARED
+def test_thread_pool_merged():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, aggregate=Aggregate(at_exit=False))(busy)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(wrapped, [1000] * 32))
+
+    wrapped.flush()
+    output = stream.getvalue()
+    assert len(profiled_names(output)) == 1
+
+    # Every call of every thread is present in the single merged report
+    line = next(i for i in output.splitlines() if i.endswith("(busy)"))
+    assert line.split()[0] == "32"
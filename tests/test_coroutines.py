@@ -0,0 +1,113 @@
+"""
+    PyProfiler/tests/test_coroutines.py
+
+"""
+# Python Dependencies
+import asyncio
+import pytest
+
+from io import StringIO
+from inspect import iscoroutinefunction
+from inspect import isasyncgenfunction
+
+from PyProfiler import Profiler
+from PyProfiler import Aggregate
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+async def compute(n, debug=True):
+    await asyncio.sleep(0)
+    return busy(n)
+
+
+async def countdown(n, debug=True):
+    while n > 0:
+        received = yield n
+        n = received if received is not None else n - 1
+
+
+def profiled_names(output):
+    return [line for line in output.splitlines() if line.startswith("Profiling ")]
+
+
+@pytest.mark.parametrize("exclude_suspended", [True, False])
+@pytest.mark.parametrize("debug, expected", [(True, 1), (False, 0)])
+def test_coroutine(exclude_suspended, debug, expected):
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, exclude_suspended=exclude_suspended)(compute)
+    assert iscoroutinefunction(wrapped)
+    assert asyncio.run(wrapped(1000, debug=debug)) == busy(1000)
+
+    output = stream.getvalue()
+    assert profiled_names(output) == ["Profiling compute()"] * expected
+    if expected:
+        # The awaited work is recorded (not only the creation of the coroutine)
+        assert "(busy)" in output
+
+
+def test_coroutine_excludes_suspended():
+    stream = StringIO()
+
+    async def sleeper(debug=True):
+        await asyncio.sleep(0.05)
+
+    asyncio.run(Profiler(filepath=stream, exclude_suspended=True)(sleeper)())
+    total = float(stream.getvalue().split(" in ")[1].split()[0])
+    assert total < 0.05
+
+
+def test_coroutine_exception():
+    stream = StringIO()
+
+    async def failure(debug=True):
+        await asyncio.sleep(0)
+        raise KeyError("failure")
+
+    with pytest.raises(KeyError):
+        asyncio.run(Profiler(filepath=stream, exclude_suspended=True)(failure)())
+    assert profiled_names(stream.getvalue()) == ["Profiling test_coroutine_exception.<locals>.failure()"]
+
+
+@pytest.mark.parametrize("exclude_suspended", [True, False])
+@pytest.mark.parametrize("debug, expected", [(True, 1), (False, 0)])
+def test_async_generator(exclude_suspended, debug, expected):
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, exclude_suspended=exclude_suspended)(countdown)
+    assert isasyncgenfunction(wrapped)
+
+    async def consume():
+        return [i async for i in wrapped(3, debug=debug)]
+
+    assert asyncio.run(consume()) == [3, 2, 1]
+    assert profiled_names(stream.getvalue()) == ["Profiling countdown()"] * expected
+
+
+def test_async_generator_asend_aclose():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, exclude_suspended=True)(countdown)
+
+    async def consume():
+        agen = wrapped(10)
+        values = [await agen.__anext__(), await agen.asend(3), await agen.__anext__()]
+        await agen.aclose()
+        return values
+
+    assert asyncio.run(consume()) == [10, 3, 2]
+    assert profiled_names(stream.getvalue()) == ["Profiling countdown()"]
+
+
+def test_coroutine_aggregate():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, aggregate=Aggregate(at_exit=False), exclude_suspended=True)(compute)
+
+    async def many():
+        for _ in range(3):
+            await wrapped(100)
+
+    asyncio.run(many())
+    assert stream.getvalue() == ""
+    wrapped.flush()
+    assert profiled_names(stream.getvalue()) == ["Profiling compute()"]
@@ -0,0 +1,125 @@
+"""
+    PyProfiler/tests/test_engines.py
+
+"""
+# Python Dependencies
+import pytest
+
+from cProfile import Profile
+from functools import partial
+from io import StringIO
+from pstats import Stats
+from threading import Thread
+
+from PyProfiler import Profiler
+from PyProfiler import register_engine
+from PyProfiler import wrapper
+from PyProfiler.engines import MONITORING
+from PyProfiler.engines import MonitoringProfile
+from PyProfiler.engines import builtin_key
+from PyProfiler.errors import InvalidEngine
+
+
+monitoring = pytest.mark.skipif(not MONITORING, reason="sys.monitoring requires Python 3.12+")
+
+
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def count(n):
+    yield from range(n)
+
+
+def fail():
+    raise KeyError
+
+
+def work(n, debug=True):
+    try:
+        fail()
+    except KeyError:
+        pass
+    values = sorted([3, 1, 2], key=lambda v: -v)
+    return fib(n) + sum(count(3)) + len(values)
+
+
+def calls(stats: Stats) -> dict:
+    return {key[2]: value[:2] for key, value in stats.stats.items()}
+
+
+@pytest.mark.parametrize("function, expected", [
+    (len, ("~", 0, "<built-in method builtins.len>")),
+    ([].append, ("~", 0, "<method 'append' of 'list' objects>")),
+    (list.append, ("~", 0, "<method 'append' of 'list' objects>")),
+    (fib, None),
+    (list, None),
+])
+def test_builtin_key(function, expected):
+    assert builtin_key(function) == expected
+
+
+def test_fallback():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="monitoring", saturate=100)(work)
+    assert wrapped(10) == 61
+    assert "Profiling work()" in stream.getvalue()
+    assert wrapper.ENGINES["monitoring"] is (MonitoringProfile if MONITORING else wrapper._fallback)
+
+
+@monitoring
+def test_monitoring_profile():
+    reference = Profile()
+    reference.runcall(work, 10)
+    profile = MonitoringProfile()
+    profile.enable()
+    work(10)
+    profile.disable()
+
+    expected = {k: v for k, v in calls(Stats(reference)).items() if "disable" not in k}
+    assert calls(Stats(profile)) == expected
+    assert calls(Stats(profile))["fib"] == (1, 177)
+
+
+@monitoring
+def test_monitoring_thread():
+    thread = Thread(target=fib, args=(15,))
+    profile = MonitoringProfile(builtins=False)
+    profile.enable()
+    thread.start()
+    fib(5)
+    thread.join()
+    profile.disable()
+    assert calls(Stats(profile))["fib"] == (1, 15)
+
+
+@monitoring
+def test_monitoring_saturate():
+    profile = MonitoringProfile(saturate=5)
+    profile.enable()
+    fib(10)
+    profile.disable()
+    assert calls(Stats(profile))["fib"] == (1, 5)
+
+
+def test_register_engine():
+    stream = StringIO()
+    register_engine("no-builtins", partial(Profile, builtins=False))
+    Profiler(filepath=stream, engine="no-builtins")(work)(10)
+    output = stream.getvalue()
+    assert "fib" in output
+    assert "built-in method" not in output
+
+
+@pytest.mark.parametrize("name, factory", [
+    ("memory", Profile),
+    ("other", None),
+])
+def test_register_engine_invalid(name, factory):
+    with pytest.raises(ValueError):
+        register_engine(name, factory)
+
+
+@pytest.mark.xfail(raises=InvalidEngine)
+def test_unregistered_engine():
+    Profiler(engine="unregistered")
@@ -0,0 +1,117 @@
+"""
+    PyProfiler/tests/test_exporters.py
+
+"""
+# Python Dependencies
+import json
+import pytest
+
+from io import StringIO
+from pstats import Stats
+from cProfile import Profile
+
+from PyProfiler import Profiler
+from PyProfiler import exporters
+
+
+def leaf(n):
+    return sum(i * i for i in range(n))
+
+
+def middle(n):
+    return leaf(n) + leaf(n // 2)
+
+
+def root(n, debug=True):
+    return middle(n) + leaf(n)
+
+
+def fib(n, debug=True):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+@pytest.fixture(scope="module")
+def stats():
+    profile = Profile()
+    profile.runcall(root, 20000)
+    return Stats(profile)
+
+
+def test_stacks(stats):
+    paths = {tuple(key[2] for key in path): time for path, time in exporters.stacks(stats)}
+    assert ("root", "middle", "leaf") in paths
+    assert ("root", "leaf") in paths
+    # Self time is conserved (up to pruned paths)
+    total = sum(value[2] for key, value in stats.stats.items() if not exporters.is_profiler(key))
+    assert sum(paths.values()) == pytest.approx(total, rel=1e-3)
+
+
+def test_collapsed(stats):
+    stream = StringIO()
+    exporters.collapsed(stats, stream, "root", "cumulative")
+    lines = stream.getvalue().splitlines()
+    assert lines
+    for line in lines:
+        stack, value = line.rsplit(" ", 1)
+        assert int(value) > 0
+        assert stack.startswith("root (test_exporters.py")
+    assert any("middle (test_exporters.py" in i and "leaf (test_exporters.py" in i for i in lines)
+
+
+def test_speedscope(stats):
+    stream = StringIO()
+    exporters.speedscope(stats, stream, "root", "cumulative")
+    document = json.loads(stream.getvalue())
+    profile = document["profiles"][0]
+    frames = document["shared"]["frames"]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert {"root", "middle", "leaf"} <= {frame["name"] for frame in frames}
+    assert all(0 <= i < len(frames) for sample in profile["samples"] for i in sample)
+
+
+def test_callgrind(stats):
+    stream = StringIO()
+    exporters.callgrind(stats, stream, "root", "cumulative")
+    output = stream.getvalue()
+    assert output.startswith("# callgrind format\n")
+    assert "events: Microseconds" in output
+    assert any(line.startswith("fn=middle:") for line in output.splitlines())
+    assert any(line.startswith("cfn=leaf:") for line in output.splitlines())
+
+
+@pytest.mark.parametrize("fmt, expected", [
+    ("pstats", "Profiling root()"),
+    ("collapsed", "root (test_exporters.py"),
+    ("speedscope", '"exporter": "PyProfiler"'),
+    ("callgrind", "cmd: root"),
+])
+def test_profiler_format(fmt, expected):
+    stream = StringIO()
+    Profiler(filepath=stream, format=fmt)(root)(1000)
+    assert expected in stream.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["collapsed", "speedscope", "callgrind"])
+def test_recursive(fmt):
+    # A recursive function is its own caller, and is nonetheless the entry point of the profile
+    stream = StringIO()
+    Profiler(filepath=stream, format=fmt)(fib)(15)
+    output = stream.getvalue()
+    assert "fib" in output
+    assert "disable" not in output
+    if fmt == "collapsed":
+        assert all(line.startswith("fib (test_exporters.py") for line in output.splitlines())
+    elif fmt == "speedscope":
+        frames = json.loads(output)["shared"]["frames"]
+        assert [frame["name"] for frame in frames] == ["fib"]
+
+
+def test_custom_exporter():
+    stream = StringIO()
+
+    def count(stats, stream, name, sortby):
+        stream.write(f"{name}: {len(stats.stats)}\n")
+
+    Profiler(filepath=stream, format=count)(root)(1000)
+    assert stream.getvalue().startswith("root: ")
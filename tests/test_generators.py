@@ -0,0 +1,83 @@
+"""
+    PyProfiler/tests/test_generators.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+from inspect import isgeneratorfunction
+
+from PyProfiler import Profiler
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def stream_squares(n, debug=True):
+    for i in range(n):
+        yield busy(i)
+    return "done"
+
+
+def accumulate(debug=True):
+    total = 0
+    while True:
+        received = yield total
+        total += received
+
+
+def profiled_names(output):
+    return [line for line in output.splitlines() if line.startswith("Profiling ")]
+
+
+@pytest.mark.parametrize("debug, expected", [(True, 1), (False, 0)])
+def test_generator(debug, expected):
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream)(stream_squares)
+    assert isgeneratorfunction(wrapped)
+
+    gen = wrapped(5, debug=debug)
+    assert stream.getvalue() == ""  # Nothing is reported until consumed
+    assert list(gen) == [busy(i) for i in range(5)]
+
+    output = stream.getvalue()
+    assert profiled_names(output) == ["Profiling stream_squares()"] * expected
+    if expected:
+        # Work performed during iteration is recorded
+        assert "(busy)" in output
+
+
+def test_generator_return_value():
+    wrapped = Profiler(filepath=StringIO())(stream_squares)
+
+    def consume():
+        return (yield from wrapped(3))
+
+    gen = consume()
+    with pytest.raises(StopIteration) as e:
+        while True:
+            next(gen)
+    assert e.value.value == "done"
+
+
+def test_generator_send_close():
+    stream = StringIO()
+    gen = Profiler(filepath=stream)(accumulate)()
+    assert next(gen) == 0
+    assert gen.send(5) == 5
+    assert gen.send(7) == 12
+    assert stream.getvalue() == ""
+
+    gen.close()
+    assert profiled_names(stream.getvalue()) == ["Profiling accumulate()"]
+
+
+def test_generator_throw():
+    stream = StringIO()
+    gen = Profiler(filepath=stream)(accumulate)()
+    next(gen)
+    with pytest.raises(KeyError):
+        gen.throw(KeyError("failure"))
+    assert profiled_names(stream.getvalue()) == ["Profiling accumulate()"]
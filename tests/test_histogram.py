@@ -0,0 +1,82 @@
+"""
+    PyProfiler/tests/test_histogram.py
+
+"""
+# Python Dependencies
+import json
+import asyncio
+import pytest
+
+from io import StringIO
+
+from PyProfiler import Profiler
+from PyProfiler import histogram
+
+
+@pytest.mark.parametrize("value", [0, 1, 31, 32, 33, 47, 48, 1000, 123_456_789, 2 ** 64 - 1])
+def test_bucket_bounds(value):
+    lower, upper = histogram.bucket_bounds(histogram.bucket_index(value))
+    assert lower <= value <= upper
+    # Bounded relative error
+    assert upper - lower <= max(1, lower) / histogram.SUB_BUCKETS
+
+
+@pytest.mark.parametrize("p, expected", [
+    (50, 5000),
+    (90, 9000),
+    (99, 9900),
+    (100, 10000),
+])
+def test_percentile(p, expected):
+    h = histogram.Histogram()
+    for i in range(1, 10001):
+        h.record(i)
+    assert h.count == 10000
+    assert h.max == 10000
+    assert abs(h.percentile(p) - expected) <= expected / histogram.SUB_BUCKETS
+
+
+def test_empty():
+    summary = histogram.Histogram().summary()
+    assert summary["count"] == 0
+    assert summary["p99"] == 0
+
+
+def test_timing_engine():
+    stream = StringIO()
+
+    @Profiler(filepath=stream, engine="timing")
+    def add(a, b, debug=True):
+        return a + b
+
+    for _ in range(10):
+        assert add(1, 2) == 3
+    assert add(1, 2, debug=False) == 3
+
+    # Nothing is output to the stream
+    assert stream.getvalue() == ""
+    summary = add.timings.summary()
+    assert summary["wall"]["count"] == summary["cpu"]["count"] == 10
+    assert summary["wall"]["max"] >= summary["wall"]["p50"] > 0
+
+    exported = histogram.dump(stream)
+    assert exported[add.timings.name] == summary
+    assert json.loads(stream.getvalue())[add.timings.name]["wall"]["count"] == 10
+
+
+def test_timing_engine_coroutine():
+    @Profiler(engine="timing")
+    async def pause(debug=True):
+        await asyncio.sleep(0.01)
+
+    asyncio.run(pause())
+    assert pause.timings.wall.count == 1
+    assert pause.timings.wall.max >= 10_000_000
+
+
+def test_timing_engine_generator():
+    def gen(debug=True):
+        yield 1
+
+    with pytest.raises(ValueError):
+        Profiler(engine="timing")(gen)
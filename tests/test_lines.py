@@ -0,0 +1,156 @@
+"""
+    PyProfiler/tests/test_lines.py
+
+"""
+# Python Dependencies
+import sys
+import pytest
+
+from io import StringIO
+
+from PyProfiler import Profiler
+from PyProfiler import Aggregate
+from PyProfiler import RingBuffer
+from PyProfiler import StatsdWriter
+from PyProfiler import context
+from PyProfiler.lines import LineProfile
+from PyProfiler.lines import source_lines
+
+
+def helper(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def work(n, debug=True):
+    a = helper(n)
+    b = sorted(range(n), reverse=True)
+    return a + len(b)
+
+
+def countdown(n, debug=True):
+    while n:
+        yield helper(n)
+        n -= 1
+
+
+FIRST = work.__code__.co_firstlineno
+
+
+def traced(profile) -> dict:
+    """{function name: {line offset: hits}} of a LineProfile."""
+    return {key[2]: {line - key[1]: hits for line, (hits, _) in lines.items()} for key, lines in profile.lines.items()}
+
+
+@pytest.mark.parametrize("settrace", [False, True])
+def test_line_profile(settrace):
+    profile = LineProfile(settrace=settrace)
+    assert context.runcall(profile, work, (100,), {}) == 4950 + 100
+
+    assert traced(profile) == {"work": {1: 1, 2: 1, 3: 1}}  # helper is not traced
+    assert profile.calls[(__file__, FIRST, "work")] == 1
+    assert all(time > 0 for lines in profile.lines.values() for _, time in lines.values())
+    assert sys.gettrace() is None
+
+
+@pytest.mark.parametrize("settrace", [False, True])
+def test_line_profile_callees(settrace):
+    profile = LineProfile(callees=True, settrace=settrace)
+    for _ in range(2):
+        context.runcall(profile, work, (10,), {})
+
+    lines = traced(profile)
+    assert lines["work"] == {1: 2, 2: 2, 3: 2}
+    assert lines["helper"] == {1: 2, 2: 22, 3: 20, 4: 2}
+    assert profile.calls[(__file__, helper.__code__.co_firstlineno, "helper")] == 2
+
+    # The time of a line includes the time of the functions it calls
+    work_lines = profile.lines[(__file__, FIRST, "work")]
+    helper_time = sum(time for _, time in profile.lines[(__file__, helper.__code__.co_firstlineno, "helper")].values())
+    assert work_lines[FIRST + 1][1] >= helper_time
+
+
+def test_line_profile_generator():
+    profile = LineProfile()
+    generator = countdown(3)
+    assert [context.runcall(profile, next, (generator,), {}) for _ in range(3)] == [3, 1, 0]
+
+    key = (__file__, countdown.__code__.co_firstlineno, "countdown")
+    assert profile.calls[key] == 1
+    assert traced(profile)["countdown"][2] == 3
+
+
+def test_line_profile_merge():
+    a, b = LineProfile(), LineProfile()
+    context.runcall(a, work, (5,), {})
+    context.runcall(b, work, (5,), {})
+    merged = a.merge(b)
+    assert traced(merged) == {"work": {1: 2, 2: 2, 3: 2}}
+    assert merged.calls[(__file__, FIRST, "work")] == 2
+    assert LineProfile().getstats() == []
+
+
+def test_source_lines():
+    lines = source_lines(__file__, FIRST, FIRST)
+    assert [number for number, _ in lines] == list(range(FIRST, FIRST + 4))
+    assert lines[0][1] == "def work(n, debug=True):"
+    assert lines[-1][1] == "    return a + len(b)"
+    assert source_lines("<unknown>", 3, 4) == [(3, ""), (4, "")]
+
+
+def test_line_engine():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="line", callees=True)(work)
+    assert wrapped(50) == 1225 + 50
+    assert wrapped(50, debug=False) == 1225 + 50
+
+    output = stream.getvalue()
+    assert output.startswith("Line Profiling work()")
+    assert output.count("Line Profiling") == 1
+    assert "helper (test_lines.py:" in output
+    assert "% Time  Source" in output
+    row = next(line for line in output.splitlines() if line.endswith("a = helper(n)"))
+    number, hits = row.split()[:2]
+    assert (int(number), int(hits)) == (FIRST + 1, 1)
+
+
+def test_line_engine_aggregate():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="line", aggregate=Aggregate(calls=3))(work)
+    for _ in range(3):
+        wrapped(10)
+
+    output = stream.getvalue()
+    assert output.count("Line Profiling") == 1
+    assert f"work (test_lines.py:{FIRST})  calls: 3" in output
+
+
+def test_line_engine_generator():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="line")(countdown)
+    assert list(wrapped(3)) == [3, 1, 0]
+    assert "yield helper(n)" in stream.getvalue()
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_line_engine_scaling():
+    from PyProfiler import Scaling
+    Profiler(engine="line", scaling=Scaling(size=lambda n, debug=True: n))(work)
+
+
+@pytest.mark.xfail(raises=ValueError)
+@pytest.mark.parametrize("sink", [RingBuffer, lambda: StatsdWriter(interval=None)])
+def test_line_engine_pstats_sink(sink):
+    Profiler(engine="line", filepath=sink())
+
+
+@pytest.mark.xfail(raises=ValueError)
+@pytest.mark.parametrize("kwargs", [
+    {"filepath": "lines.prof", "mode": "wb"},
+    {"filepath": "lines.prof", "mode": "ab"},
+    {"filepath": StringIO(), "format": "marshal"},
+])
+def test_line_engine_binary(kwargs):
+    Profiler(engine="line", **kwargs)
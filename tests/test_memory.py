@@ -0,0 +1,143 @@
+"""
+    PyProfiler/tests/test_memory.py
+
+"""
+# Python Dependencies
+import pytest
+import tracemalloc
+
+from io import StringIO
+from threading import Event
+from threading import Thread
+
+from PyProfiler import Profiler
+from PyProfiler import Aggregate
+from PyProfiler import BackgroundWriter
+from PyProfiler import RingBuffer
+from PyProfiler.memory import MemoryProfile
+from PyProfiler.memory import format_size
+
+
+RETAINED = []
+
+
+def allocate(n, debug=True):
+    data = [bytearray(1024) for _ in range(n)]  # released on return
+    RETAINED.append(bytearray(n * 1024))  # retained
+    return len(data)
+
+
+@pytest.mark.parametrize("size, sign, expected", [
+    (0, False, "0.0 B"),
+    (1536, False, "1.5 KiB"),
+    (3 * 1024 ** 2, True, "+3.0 MiB"),
+    (-2048, True, "-2.0 KiB"),
+])
+def test_format_size(size, sign, expected):
+    assert format_size(size, sign) == expected
+
+
+def test_memory_profile():
+    profile = MemoryProfile(limit=5)
+    profile.enable()
+    allocate(100)
+    profile.disable()
+
+    assert not tracemalloc.is_tracing()
+    assert profile.calls == 1
+    assert profile.peak >= 200 * 1024
+    assert 100 * 1024 <= profile.net < profile.peak
+    assert any(filename == __file__ for key in profile.allocations for filename, _ in key)
+
+
+def test_memory_profile_threads():
+    # tracemalloc is process wide: the first profile disabled must not stop tracing under the other
+    first, second = MemoryProfile(), MemoryProfile()
+    entered, left, errors = Event(), Event(), []
+
+    def run():
+        try:
+            second.enable()
+            entered.set()
+            left.wait(5)
+            allocate(10)
+            second.disable()
+        except Exception as e:
+            errors.append(e)
+
+    first.enable()
+    thread = Thread(target=run)
+    thread.start()
+    entered.wait(5)
+    first.disable()
+    left.set()
+    thread.join()
+
+    assert errors == []
+    assert second.calls == 1 and second.net >= 10 * 1024
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize("kwargs", [
+    pytest.param({"limit": 0}, marks=pytest.mark.xfail(raises=ValueError)),
+    pytest.param({"depth": 0}, marks=pytest.mark.xfail(raises=ValueError)),
+])
+def test_invalid_memory_profile(kwargs):
+    MemoryProfile(**kwargs)
+
+
+def test_memory_engine():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="memory", limit=3, depth=2)(allocate)
+    assert wrapped(50) == 50
+
+    output = stream.getvalue()
+    assert "Memory Profiling allocate()" in output
+    assert "allocations (traceback depth 2)" in output
+    assert "RETAINED.append(bytearray(n * 1024))" in output
+    # cProfile is not used
+    assert "ncalls" not in output
+
+
+def test_memory_alongside():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, memory={"limit": 2})(allocate)
+    wrapped(10)
+
+    output = stream.getvalue()
+    assert "Profiling allocate()" in output
+    assert "ncalls  tottime" in output
+    assert "Memory Profiling allocate()" in output
+    assert "Top 2 allocations" in output
+
+
+def test_memory_aggregate():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="memory", aggregate=Aggregate(calls=3, at_exit=False))(allocate)
+    for _ in range(3):
+        wrapped(10)
+
+    output = stream.getvalue()
+    assert output.count("Memory Profiling allocate()") == 1
+    assert "calls: 3" in output
+
+
+@pytest.mark.xfail(raises=ValueError)
+@pytest.mark.parametrize("kwargs", [
+    {"engine": "memory", "filepath": RingBuffer()},
+    {"memory": True, "filepath": RingBuffer()},
+    {"memory": True, "filepath": BackgroundWriter(RingBuffer())},
+    {"engine": "memory", "filepath": "memory.prof", "mode": "ab"},
+    {"memory": True, "filepath": "memory.prof", "mode": "wb"},
+    {"memory": True, "filepath": StringIO(), "format": "marshal"},
+])
+def test_memory_pstats_sink(kwargs):
+    Profiler(**kwargs)
+
+
+def test_memory_background_writer():
+    stream = StringIO()
+    writer = BackgroundWriter(stream)
+    Profiler(memory=True, filepath=writer)(allocate)(5)
+    writer.flush()
+    assert "Memory Profiling allocate()" in stream.getvalue()
@@ -0,0 +1,91 @@
+"""
+    PyProfiler/tests/test_registry.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+
+from PyProfiler import Profiler
+from PyProfiler import enable
+from PyProfiler import disable
+from PyProfiler import registry
+
+
+def add(a, b, debug=True):
+    return a + b
+
+
+def subtract(a, b, debug=True):
+    return a - b
+
+
+@pytest.fixture
+def environment(monkeypatch):
+    def apply(value):
+        if value is None:
+            monkeypatch.delenv(registry.ENVIRONMENT, raising=False)
+        else:
+            monkeypatch.setenv(registry.ENVIRONMENT, value)
+        monkeypatch.setattr(registry, "_PATTERNS", registry._patterns())
+    return apply
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("*", None),
+    ("TRUE", None),
+    ("On", None),
+    ("off", []),
+    ("OFF", []),
+    ("0", []),
+    ("a.*, b.c", ["a.*", "b.c"]),
+])
+def test_patterns(environment, value, expected):
+    environment(value)
+    assert registry._patterns() == expected
+
+
+def test_runtime_switch():
+    stream = StringIO()
+    wrapped_add = Profiler(filepath=stream)(add)
+    wrapped_sub = Profiler(filepath=stream)(subtract)
+    assert registry.registered()[f"{__name__}.add"] is True
+
+    assert disable(f"{__name__}.*") == [f"{__name__}.add", f"{__name__}.subtract"]
+    assert wrapped_add(1, 2) == 3
+    assert wrapped_sub(1, 2) == -1
+    assert stream.getvalue() == ""
+
+    assert enable(f"{__name__}.sub*") == [f"{__name__}.subtract"]
+    wrapped_add(1, 2)
+    wrapped_sub(1, 2)
+    assert stream.getvalue().count("Profiling ") == 1
+    assert "Profiling subtract()" in stream.getvalue()
+    enable(f"{__name__}.*")
+
+
+def test_signal_handler_switch():
+    # A signal handler interrupting the main thread while it holds the registry lock must not deadlock
+    Profiler()(add)
+    with registry._lock:
+        assert f"{__name__}.add" in disable(f"{__name__}.add")
+        assert f"{__name__}.add" in enable(f"{__name__}.add")
+
+
+def test_environment_patterns(environment):
+    environment(f"{__name__}.sub*")
+    stream = StringIO()
+    Profiler(filepath=stream)(add)(1, 2)
+    Profiler(filepath=stream)(subtract)(1, 2)
+    assert stream.getvalue().count("Profiling ") == 1
+    assert "Profiling subtract()" in stream.getvalue()
+    enable(f"{__name__}.*")
+
+
+def test_environment_strip(environment):
+    environment("off")
+    assert registry.stripped()
+    assert Profiler()(add) is add
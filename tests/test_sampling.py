@@ -0,0 +1,55 @@
+"""
+    PyProfiler/tests/test_sampling.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+
+from PyProfiler import Profiler
+from PyProfiler import EveryN
+from PyProfiler import Probability
+from PyProfiler import TokenBucket
+
+
+@pytest.mark.parametrize("n, calls, expected", [
+    (1, 10, 10),
+    (2, 10, 5),
+    (3, 10, 4),
+    (10, 10, 1),
+    pytest.param(0, 10, 0, marks=pytest.mark.xfail(raises=ValueError)),
+])
+def test_every_n(n, calls, expected):
+    sampler = EveryN(n)
+    assert sum(sampler() for _ in range(calls)) == expected
+
+
+@pytest.mark.parametrize("p, expected", [
+    (0., 0),
+    (1., 100),
+    pytest.param(1.5, 0, marks=pytest.mark.xfail(raises=ValueError)),
+])
+def test_probability(p, expected):
+    sampler = Probability(p)
+    assert sum(sampler() for _ in range(100)) == expected
+
+
+def test_token_bucket():
+    sampler = TokenBucket(rate=1, burst=3)
+    # Only the burst is available when called in rapid succession
+    assert sum(sampler() for _ in range(10)) == 3
+
+
+def test_sampled_profiler():
+    stream = StringIO()
+
+    @Profiler(filepath=stream, sample=EveryN(3))
+    def add(a, b, debug=True):
+        return a + b
+
+    for _ in range(6):
+        assert add(1, 2) == 3
+    # Disabled calls are never profiled, and do not consume a sample
+    assert add(1, 2, debug=False) == 3
+    assert stream.getvalue().count("Profiling ") == 2
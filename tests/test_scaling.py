@@ -0,0 +1,141 @@
+"""
+    PyProfiler/tests/test_scaling.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+from pstats import Stats
+
+from PyProfiler import Profiler
+from PyProfiler import wrapper
+from PyProfiler import Scaling
+from PyProfiler import Aggregate
+from PyProfiler import SlowCalls
+from PyProfiler.scaling import fit
+from PyProfiler.scaling import complexity
+
+
+def linear(values):
+    return sum(values)
+
+
+def quadratic(values):
+    return sum(a * b for a in values for b in values)
+
+
+def process(values, debug=True):
+    linear(values)
+    quadratic(values)
+    return len(values)
+
+
+def size(args, kwargs):
+    return len(args[0])
+
+
+@pytest.mark.parametrize("points, slope", [
+    ([(1, 1, 1), (10, 10, 1), (100, 100, 1)], 1.),
+    ([(1, 1, 1), (10, 100, 1), (100, 10000, 1)], 2.),
+    ([(2, 5, 3), (4, 5, 1)], 0.),
+    ([(2, 5, 1), (2, 7, 1)], None),
+    ([(0, 5, 1), (2, 7, 1)], None),
+])
+def test_fit(points, slope):
+    result = fit(points)
+    if slope is None:
+        assert result is None
+    else:
+        assert result[0] == pytest.approx(slope)
+
+
+@pytest.mark.parametrize("slope, expected", [
+    (None, "?"),
+    (0.02, "O(1)"),
+    (0.5, "O(√n)"),
+    (0.97, "O(n)"),
+    (1.3, "O(n log n)"),
+    (2.1, "O(n²)"),
+    (3, "O(n³)"),
+    (4.2, "O(n^4)"),
+])
+def test_complexity(slope, expected):
+    assert complexity(slope) == expected
+
+
+def test_scaling():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, scaling=Scaling(size=size))(process)
+    for n in (16, 32, 64, 128, 256):
+        for _ in range(3):
+            assert wrapped(list(range(n))) == n
+    wrapped([])
+    wrapped([1], debug=False)
+
+    summary = wrapped.scaling.summary()
+    assert summary["calls"] == 15
+    assert summary["ignored"] == 1
+    assert [i["size"] for i in summary["buckets"]] == [16, 32, 64, 128, 256]
+    assert 1.5 < summary["slope"] < 2.5
+    callees = {i["function"].split()[0]: i for i in summary["callees"]}
+    assert callees["quadratic"]["complexity"] == "O(n²)"
+    assert callees["linear"]["slope"] < callees["quadratic"]["slope"]
+    assert any(k[2] == "quadratic" for k in Stats(wrapped.scaling).stats)
+
+    assert stream.getvalue() == ""
+    wrapped.flush()
+    output = stream.getvalue()
+    assert "Scaling process()" in output
+    assert "log-log slope" in output
+    assert "quadratic" in output
+    assert wrapped.scaling.summary()["calls"] == 0
+
+
+def test_scaling_single_size():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, scaling=Scaling(size=size))(process)
+    wrapped([1, 2, 3])
+    assert wrapped.scaling.summary()["slope"] is None
+    wrapped.flush()
+    assert "log-log slope: ?" in stream.getvalue()
+
+
+def generator(values, debug=True):
+    yield from values
+
+
+@pytest.mark.parametrize("function, options", [
+    (generator, {}),
+    (process, {"engine": "memory"}),
+    (process, {"slow": SlowCalls(seconds=1)}),
+    (process, {"aggregate": Aggregate()}),
+])
+def test_scaling_unsupported(function, options):
+    with pytest.raises(ValueError):
+        Profiler(scaling=Scaling(size=size), **options)(function)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_scaling_size():
+    Scaling(size=None)
+
+
+def test_scaling_session():
+    class Service:
+        def process(self, values, debug=True):
+            return len(values)
+
+    with pytest.raises(ValueError):
+        Profiler(scaling=Scaling(size=size))(Service)
+
+
+def test_scaling_size_error(monkeypatch):
+    # A failing size extractor runs the call unprofiled, with a warning
+    stream, errors = StringIO(), StringIO()
+    monkeypatch.setattr(wrapper, "stderr", errors)
+    wrapped = Profiler(filepath=stream, scaling=Scaling(size=lambda args, kwargs: 1 / 0))(process)
+    assert wrapped([1, 2, 3]) == 3
+    assert wrapped.scaling.summary()["calls"] == 0
+    assert "Failed to extract the input size of process" in errors.getvalue()
+    assert "ZeroDivisionError" in errors.getvalue()
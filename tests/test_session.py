@@ -0,0 +1,160 @@
+"""
+    PyProfiler/tests/test_session.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+from types import ModuleType
+
+from PyProfiler import Profiler
+from PyProfiler import profile_module
+
+
+SOURCE = """
+import math
+
+
+def area(radius):
+    return math.pi * radius ** 2
+
+
+def volume(radius, height):
+    return area(radius) * height
+
+
+class Cylinder:
+    def __init__(self, radius, height):
+        self.radius = radius
+        self.height = height
+
+    def volume(self):
+        return volume(self.radius, self.height)
+"""
+
+
+def make_module(name: str) -> ModuleType:
+    module = ModuleType(name)
+    exec(SOURCE, module.__dict__)
+    return module
+
+
+def calls(output: str, name: str) -> int:
+    return sum(int(line.split()[0].split("/")[0]) for line in output.splitlines() if f"({name})" in line)
+
+
+def make_class(profiler):
+    @profiler
+    class Shape:
+        sides = 3
+
+        def __init__(self, size, debug=True):
+            self.size = size
+
+        def perimeter(self, debug=True):
+            return self.sides * self.size
+
+        def area(self):  # without keyword, not instrumented
+            return self.size ** 2
+
+        @staticmethod
+        def unit(debug=True):
+            return 1
+
+        @classmethod
+        def triangle(cls, size, debug=True):
+            return cls(size, debug)
+
+        @property
+        def half(self):
+            return self.size / 2
+
+        class Inner:
+            def run(self, debug=True):
+                return Shape.unit(debug)
+
+    return Shape
+
+
+def test_class_decoration():
+    stream = StringIO()
+    profiler = Profiler(filepath=stream)
+    Shape = make_class(profiler)
+
+    assert Shape.area.__qualname__.endswith("Shape.area") and not hasattr(Shape.area, "__wrapped__")
+    assert hasattr(Shape.perimeter, "__wrapped__")
+    assert isinstance(vars(Shape)["unit"], staticmethod)
+    assert isinstance(vars(Shape)["triangle"], classmethod)
+    assert isinstance(vars(Shape)["half"], property)
+
+    shape = Shape.triangle(2)
+    assert isinstance(shape, Shape)
+    assert shape.perimeter() == 6
+    assert shape.perimeter(debug=False) == 6
+    assert Shape.unit() == 1
+    assert Shape.Inner().run() == 1
+    assert shape.half == 1
+    assert stream.getvalue() == ""  # session is only output when flushed
+
+    profiler.flush()
+    output = stream.getvalue()
+    assert output.count("Profiling ") == 1
+    assert "Profiling make_class.<locals>.Shape()" in output
+    assert calls(output, "perimeter") == 1
+    assert calls(output, "unit") == 2
+    assert calls(output, "triangle") == 1
+    assert calls(output, "half") == 0
+
+
+def test_class_decoration_every_call():
+    stream = StringIO()
+    profiler = Profiler(keyword=None, filepath=stream)
+    Shape = make_class(profiler)
+    shape = Shape(4)
+    assert shape.half == 2
+    assert shape.area() == 16
+    profiler.flush()
+    output = stream.getvalue()
+    assert calls(output, "half") == 1
+    assert calls(output, "area") == 1
+    assert calls(output, "__init__") == 1
+
+
+@pytest.mark.parametrize("descriptor", [staticmethod, classmethod])
+def test_descriptor_decoration(descriptor):
+    stream = StringIO()
+
+    class Example:
+        @Profiler(filepath=stream)
+        @descriptor
+        def method(*args, debug=True):
+            return len(args)
+
+    assert Example.method() == (1 if descriptor is classmethod else 0)
+    assert "Profiling " in stream.getvalue()
+
+
+def test_profile_module():
+    stream = StringIO()
+    module = make_module("shapes")
+    profiler = profile_module(module, Profiler(keyword=None, filepath=stream))
+    assert hasattr(module.volume, "__wrapped__")
+    assert not hasattr(module.math, "__wrapped__")
+
+    assert round(module.Cylinder(1, 2).volume(), 6) == round(module.math.pi * 2, 6)
+    assert module.area(1) == module.math.pi
+    profiler.flush()
+
+    output = stream.getvalue()
+    assert output.count("Profiling shapes()") == 1
+    assert calls(output, "area") == 2
+    assert calls(output, "volume") == 2
+
+
+def test_profile_module_shared():
+    stream = StringIO()
+    profiler = Profiler(keyword=None, filepath=stream)
+    profile_module(make_module("first"), profiler)
+    profile_module(make_module("second"), profiler)
+    assert profiler.session("second").name == "first, second"
@@ -0,0 +1,396 @@
+"""
+    PyProfiler/tests/test_sinks.py
+
+"""
+# Python Dependencies
+import os
+import gzip
+import cProfile
+import time
+import socket
+import pytest
+
+from io import StringIO
+from pstats import Stats
+from threading import Event
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+from PyProfiler import Profiler
+from PyProfiler import Sink
+from PyProfiler import BackgroundWriter
+from PyProfiler import ShardWriter
+from PyProfiler import RotatingWriter
+from PyProfiler import RingBuffer
+from PyProfiler import StatsdWriter
+from PyProfiler import Aggregate
+from PyProfiler.errors import InvalidCompression
+
+
+class Blocking(Sink):
+    """Sink which blocks the worker thread until released."""
+    __slots__ = ("release", "names")
+
+    def __init__(self):
+        self.release = Event()
+        self.names = []
+
+    def output(self, profile, name: str) -> None:
+        self.release.wait()
+        self.names.append(name)
+
+
+def add(a, b, debug=True):
+    return a + b
+
+
+def test_background_writer():
+    stream = StringIO()
+    writer = BackgroundWriter(stream)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(5):
+        assert wrapped(1, 2) == 3
+
+    writer.flush()
+    output = stream.getvalue()
+    assert output.count("Profiling add()") == 5
+    assert "Ordered by: cumulative time" in output
+    writer.close()
+
+
+def test_background_writer_file(tmp_path):
+    path = str(tmp_path / "add.prof")
+    writer = BackgroundWriter(path, mode="a")
+    wrapped = Profiler(filepath=writer)(add)
+    wrapped(1, 2)
+    writer.close()
+    with open(path) as f:
+        assert "Profiling add()" in f.read()
+
+
+def test_background_writer_drops():
+    sink = Blocking()
+    writer = BackgroundWriter(sink, maxsize=1, block=False)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(5):
+        wrapped(1, 2)
+    # At most one profile is held by the worker, and one awaits in the queue
+    assert writer.dropped >= 3
+
+    sink.release.set()
+    writer.close()
+    assert len(sink.names) == 5 - writer.dropped
+
+
+def square(n, debug=True):
+    return n * n
+
+
+def test_shard_writer(tmp_path):
+    shards = ShardWriter(str(tmp_path))
+    wrapped = Profiler(filepath=shards)(square)
+    for i in range(3):
+        wrapped(i)
+
+    # A single (loadable) shard for this process, accumulating every call
+    assert shards.shards() == [shards.path]
+    stats = Stats(shards.path)
+    assert any(key[2] == "square" and value[1] == 3 for key, value in stats.stats.items())
+
+
+def test_shard_writer_threads(tmp_path):
+    shards = ShardWriter(str(tmp_path))
+    wrapped = Profiler(filepath=shards)(square)
+    with ThreadPoolExecutor(8) as pool:
+        assert list(pool.map(wrapped, range(80))) == [square(i) for i in range(80)]
+
+    assert shards.shards() == [shards.path]
+    stats = Stats(shards.path)
+    assert any(key[2] == "square" and value[1] == 80 for key, value in stats.stats.items())
+
+
+def task(n, debug=True):
+    return n * n
+
+
+def test_shard_writer_processes(tmp_path):
+    global task
+    shards = ShardWriter(str(tmp_path))
+    original, task = task, Profiler(filepath=shards)(task)
+
+    try:
+        with ProcessPoolExecutor(max_workers=2, mp_context=get_context("fork")) as pool:
+            assert list(pool.map(task, range(20))) == [square(i) for i in range(20)]
+    finally:
+        task = original
+
+    paths = shards.shards()
+    assert 1 <= len(paths) <= 2
+    assert all(str(os.getpid()) not in os.path.basename(i) for i in paths)
+
+    stats = shards.collect()
+    assert any(key[2] == "task" and value[1] == 20 for key, value in stats.stats.items())
+
+    stream = StringIO()
+    shards.report(stream)
+    assert "Ordered by: cumulative time" in stream.getvalue()
+
+
+def test_binary_mode(tmp_path):
+    path = str(tmp_path / "add.prof")
+    Profiler(filepath=path, mode="wb")(add)(1, 2)
+    stats = Stats(path)
+    assert any(key[2] == "add" for key in stats.stats)
+
+
+def test_binary_append_mode(tmp_path):
+    # Successive dumps are merged into a single dump, as pstats only loads the first of a file
+    path = str(tmp_path / "add.prof")
+    wrapped = Profiler(filepath=path, mode="ab")(add)
+    for _ in range(5):
+        wrapped(1, 2)
+
+    stats = Stats(path)
+    assert next(value[1] for key, value in stats.stats.items() if key[2] == "add") == 5
+    assert os.listdir(tmp_path) == ["add.prof"]
+
+
+def test_binary_append_mode_threads(tmp_path):
+    path = str(tmp_path / "add.prof")
+    wrapped = Profiler(keyword=None, filepath=path, mode="ab")(add)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: wrapped(1, 2), range(80)))
+
+    stats = Stats(path)
+    assert next(value[1] for key, value in stats.stats.items() if key[2] == "add") == 80
+    assert os.listdir(tmp_path) == ["add.prof"]
+
+
+@pytest.mark.parametrize("compress, suffix", [
+    ("gzip", ".gz"),
+    (None, ""),
+])
+def test_rotating_writer(tmp_path, compress, suffix):
+    path = str(tmp_path / "add.prof")
+    writer = RotatingWriter(path, max_bytes=1, backups=2, compress=compress)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(4):
+        wrapped(1, 2)
+
+    # Every output exceeds max_bytes, and is rotated immediately. Only 2 segments are retained
+    segments = writer.segments()
+    assert [os.path.basename(i) for i in segments] == [f"add.prof.3{suffix}", f"add.prof.4{suffix}"]
+    assert not os.path.exists(path)
+    if compress == "gzip":
+        with gzip.open(segments[0], "rb") as f:
+            assert f.read(1)
+
+    stats = writer.collect()
+    assert sum(v[1] for k, v in stats.stats.items() if k[2] == "add") == 2
+    writer.close()
+
+
+def test_rotating_writer_open(tmp_path):
+    path = str(tmp_path / "add.prof")
+    writer = RotatingWriter(path)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(3):
+        wrapped(1, 2)
+
+    # Current segment is merged in place, and loadable while open
+    assert writer.segments() == []
+    stats = Stats(path)
+    assert sum(v[1] for k, v in stats.stats.items() if k[2] == "add") == 3
+    writer.close()
+
+    # A new writer rotates the existing file before writing
+    writer = RotatingWriter(path)
+    Profiler(filepath=writer)(add)(1, 2)
+    assert len(writer.segments()) == 1
+    assert sum(v[1] for k, v in writer.collect().stats.items() if k[2] == "add") == 4
+    writer.close()
+
+
+def test_rotating_writer_interval(tmp_path):
+    path = str(tmp_path / "add.prof")
+    writer = RotatingWriter(path, max_bytes=0, interval=1e-9)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(3):
+        wrapped(1, 2)
+    assert len(writer.segments()) == 2
+    writer.close()
+
+
+@pytest.mark.xfail(raises=InvalidCompression)
+def test_rotating_writer_compression(tmp_path):
+    RotatingWriter(str(tmp_path / "add.prof"), compress="bz2")
+
+
+def subtract(a, b, debug=True):
+    return a - b
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(maxlen=3)
+    wrapped_add = Profiler(filepath=buffer)(add)
+    wrapped_sub = Profiler(filepath=buffer)(subtract)
+    start = time.time()
+    for _ in range(3):
+        wrapped_add(1, 2)
+        wrapped_sub(1, 2)
+
+    assert len(buffer) == 3
+    assert buffer.evicted == 3
+    assert [i.name for i in buffer.select()] == ["subtract", "add", "subtract"]
+    assert len(buffer.select(name="sub*")) == 2
+    assert buffer.select(since=time.time() + 1) == []
+    assert len(buffer.select(since=start, min_duration=0)) == 3
+    assert buffer.select(min_duration=60) == []
+
+    stats = buffer.stats(name="subtract")
+    assert sum(v[1] for k, v in stats.stats.items() if k[2] == "subtract") == 2
+    assert buffer.stats(name="missing") is None
+
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.nbytes == 0
+
+
+def test_ring_buffer_bytes():
+    buffer = RingBuffer(maxlen=None, maxbytes=1)
+    wrapped = Profiler(filepath=buffer)(add)
+    wrapped(1, 2)
+    assert len(buffer) == 0 and buffer.evicted == 1
+
+    buffer = RingBuffer(maxlen=None, maxbytes=10 ** 6)
+    wrapped = Profiler(filepath=buffer)(add)
+    wrapped(1, 2)
+    size = buffer.nbytes
+    buffer.maxbytes = size * 2
+    for _ in range(5):
+        wrapped(1, 2)
+    assert len(buffer) == 2
+    assert buffer.nbytes <= buffer.maxbytes
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_ring_buffer_budget():
+    RingBuffer(maxlen=0)
+
+
+@pytest.fixture
+def listener():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(2)
+    yield server
+    server.close()
+
+
+def receive(server) -> list:
+    """Receive pending datagrams, each as a list of lines."""
+    packets = []
+    server.settimeout(0.2)
+    try:
+        while True:
+            packets.append(server.recv(65535).decode().split("\n"))
+    except socket.timeout:
+        return packets
+
+
+def test_statsd_writer(listener):
+    writer = StatsdWriter(port=listener.getsockname()[1], prefix="app", interval=None, max_samples=4)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(10):
+        assert wrapped(1, 2) == 3
+    assert receive(listener) == []  # aggregated in process until flushed
+
+    writer.flush()
+    packets = receive(listener)
+    assert len(packets) == 1
+    lines = packets[0]
+    assert "app.add.calls:10|c" in lines
+    timers = [line for line in lines if line.startswith("app.add.time:")]
+    assert len(timers) == 4
+    assert all(line.endswith("|ms|@0.4") for line in timers)
+    assert writer.sent == 1 and writer.dropped == 0
+    writer.close()
+
+
+def test_statsd_writer_aggregate(listener):
+    writer = StatsdWriter(port=listener.getsockname()[1], interval=None, functions="*add*")
+    wrapped = Profiler(filepath=writer, aggregate=Aggregate(calls=5))(add)
+    for _ in range(10):
+        wrapped(1, 2)
+
+    writer.close()
+    lines = [line for packet in receive(listener) for line in packet]
+    assert "pyprofiler.add.calls:10|c" in lines
+    assert [line.endswith("|ms|@0.2") for line in lines if line.startswith("pyprofiler.add.time:")] == [True] * 2
+
+
+def fib(n, debug=True):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def test_statsd_writer_recursive(listener):
+    # A recursive function is its own caller: its metrics are those of its outermost calls
+    writer = StatsdWriter(port=listener.getsockname()[1], interval=None)
+    buffer = RingBuffer()
+    for sink in (writer, buffer):
+        Profiler(filepath=sink)(fib)(15)
+    writer.close()
+
+    lines = [line for packet in receive(listener) for line in packet]
+    assert "pyprofiler.fib.calls:1|c" in lines
+    timer = next(line for line in lines if line.startswith("pyprofiler.fib.time:"))
+    cumtime = next(value[3] for key, value in buffer.stats().stats.items() if key[2] == "fib")
+    assert float(timer.split(":")[1].split("|")[0]) > cumtime * 1000 / 10
+
+
+def test_statsd_writer_batches(listener):
+    writer = StatsdWriter(port=listener.getsockname()[1], interval=None, max_packet=100)
+    for i in range(50):
+        profile = cProfile.Profile()
+        profile.runcall(add, 1, 2)
+        writer.output(profile, f"add_{i}")
+
+    writer.flush()
+    packets = receive(listener)
+    assert 1 < len(packets) < 100
+    assert all(len("\n".join(packet)) <= 100 for packet in packets)
+    lines = [line for packet in packets for line in packet]
+    assert len(lines) == 100
+    assert all(line.count("|") in (1, 2) for line in lines)
+    writer.close()
+
+
+def test_statsd_writer_interval(listener):
+    writer = StatsdWriter(port=listener.getsockname()[1], interval=0.05)
+    Profiler(filepath=writer)(add)(1, 2)
+    assert listener.recv(65535).decode().startswith("pyprofiler.add.calls:1|c")
+    writer.close()
+
+
+def test_statsd_writer_unreachable():
+    # Nothing listens on this port: datagrams are lost, and never block or raise
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    server.close()
+
+    writer = StatsdWriter(port=port, interval=None)
+    wrapped = Profiler(filepath=writer)(add)
+    for _ in range(3):
+        wrapped(1, 2)
+        start = time.perf_counter()
+        writer.flush()
+        assert time.perf_counter() - start < 0.5
+    assert writer.sent + writer.dropped == 3
+    writer.close()
+
+
+@pytest.mark.xfail(raises=ValueError)
+@pytest.mark.parametrize("kwargs", [{"interval": 0}, {"max_samples": 0}, {"max_packet": 10}])
+def test_statsd_writer_invalid(kwargs):
+    StatsdWriter(**kwargs)
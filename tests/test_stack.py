@@ -0,0 +1,88 @@
+"""
+    PyProfiler/tests/test_stack.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+from pstats import Stats
+from time import perf_counter
+
+from PyProfiler import Profiler
+from PyProfiler import Aggregate
+from PyProfiler.stack import StackSampler
+
+
+def spin(seconds):
+    end = perf_counter() + seconds
+    while perf_counter() < end:
+        pass
+
+
+def outer(seconds, debug=True):
+    spin(seconds)
+    return seconds
+
+
+def names(stats):
+    return {key[2] for key in stats.stats}
+
+
+def test_stack_sampler():
+    sampler = StackSampler(interval=0.001)
+    sampler.enable()
+    outer(0.1)
+    sampler.disable()
+
+    samples = sampler.getstats()
+    assert samples
+    # Stacks are collapsed from the call site (root) to the sampled leaf
+    assert all(stack[0][2] == "outer" for stack, _, _ in samples)
+    assert any(i.startswith("outer (test_stack.py") and "spin" in i for i in sampler.collapsed())
+
+    stats = Stats(sampler)
+    assert {"outer", "spin"} <= names(stats)
+    n_outer = next(v for k, v in stats.stats.items() if k[2] == "outer")
+    n_spin = next(v for k, v in stats.stats.items() if k[2] == "spin")
+    assert n_outer[3] >= n_spin[3] > 0.05  # cumulative time
+    assert n_outer[2] <= n_outer[3]  # own time
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_invalid_interval():
+    StackSampler(interval=0)
+
+
+def test_sampling_engine():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="sampling", interval=0.001)(outer)
+    assert wrapped(0.05) == 0.05
+
+    output = stream.getvalue()
+    assert "Profiling outer()" in output
+    assert "(spin)" in output
+
+
+def test_sampling_engine_aggregate():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="sampling", aggregate=Aggregate(calls=3, at_exit=False))(outer)
+    for _ in range(3):
+        wrapped(0.02)
+    assert stream.getvalue().count("Profiling outer()") == 1
+
+
+def test_sampling_engine_short_call():
+    # A call shorter than the interval records no sample, and outputs nothing
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="sampling", interval=0.5)(outer)
+    assert wrapped(0) == 0
+    assert stream.getvalue() == ""
+
+
+def test_sampling_engine_short_call_memory():
+    # Only the memory report is output
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, engine="sampling", interval=0.5, memory=True)(outer)
+    assert wrapped(0) == 0
+    assert stream.getvalue().startswith("Memory Profiling outer()")
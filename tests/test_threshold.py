@@ -0,0 +1,80 @@
+"""
+    PyProfiler/tests/test_threshold.py
+
+"""
+# Python Dependencies
+import pytest
+
+from io import StringIO
+from time import sleep
+
+from PyProfiler import Profiler
+from PyProfiler import SlowCalls
+
+
+def nap(seconds, debug=True):
+    if seconds:
+        sleep(seconds)
+    return seconds
+
+
+def reports(stream):
+    return stream.getvalue().count("Profiling nap()")
+
+
+@pytest.mark.parametrize("kwargs", [
+    pytest.param({}, marks=pytest.mark.xfail(raises=ValueError)),
+    pytest.param({"seconds": 1, "percentile": 99}, marks=pytest.mark.xfail(raises=ValueError)),
+    pytest.param({"seconds": -1}, marks=pytest.mark.xfail(raises=ValueError)),
+    pytest.param({"percentile": 100}, marks=pytest.mark.xfail(raises=ValueError)),
+    pytest.param({"seconds": 1, "calls": 0}, marks=pytest.mark.xfail(raises=ValueError)),
+])
+def test_invalid_policy(kwargs):
+    SlowCalls(**kwargs)
+
+
+def test_fixed_threshold():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, slow=SlowCalls(seconds=0.01, calls=2))(nap)
+
+    for _ in range(5):
+        wrapped(0)
+    assert reports(stream) == 0
+
+    wrapped(0.02)  # slow call (not itself profiled)
+    assert reports(stream) == 0
+
+    for _ in range(5):
+        wrapped(0)
+    assert reports(stream) == 2
+
+
+def test_adaptive_threshold():
+    stream = StringIO()
+    policy = SlowCalls(percentile=90, calls=1, warmup=20, refresh=10)
+    wrapped = Profiler(filepath=stream, slow=policy)(nap)
+
+    for _ in range(20):
+        wrapped(0)
+    assert reports(stream) == 0
+    assert policy.threshold < 5e6  # nanoseconds
+
+    wrapped(0.01)
+    wrapped(0)
+    assert reports(stream) == 1
+
+
+def test_disabled_calls_are_not_observed():
+    stream = StringIO()
+    wrapped = Profiler(filepath=stream, slow=SlowCalls(seconds=0.001))(nap)
+    wrapped(0.01, debug=False)
+    wrapped(0)
+    assert reports(stream) == 0
+
+
+def test_generator_unsupported():
+    def gen(debug=True):
+        yield 1
+
+    with pytest.raises(ValueError):
+        Profiler(slow=SlowCalls(seconds=1))(gen)
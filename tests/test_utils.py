@@ -10,13 +10,21 @@ from pstats import SortKey
 from PyProfiler import get_default_args
 from PyProfiler.utils import default_arg
 from PyProfiler.utils import check_keyword
+from PyProfiler.utils import KeywordToggle
 from PyProfiler.utils import is_valid_mode
 from PyProfiler.utils import is_valid_sortkey
+from PyProfiler.utils import is_valid_engine
+from PyProfiler.utils import is_valid_format
+from PyProfiler.utils import is_valid_compression
 from PyProfiler.errors import InvalidMode
 from PyProfiler.errors import InvalidSortingMethod
+from PyProfiler.errors import InvalidEngine
+from PyProfiler.errors import InvalidFormat
+from PyProfiler.errors import InvalidCompression
 
 from .functions import example
 from .functions import example_2
+from .functions import example_3
 from .functions import Example
 
 
@@ -93,6 +101,52 @@ def test_keyword(function, keyword, args, kwargs, expected):
     assert check_keyword(function, keyword, *args, **kwargs) is expected
 
 
+@pytest.mark.parametrize("function, keyword, args, kwargs, expected", [
+    # Function without Default Value
+    (example, "debug", (), {"debug": True}, True),  # Keyword Arg is True
+    (example, "debug", (0, 0, True), {}, True),  # Positional Arg is True
+    (example, "debug", (0, 0, False), {}, False),  # Positional Arg is False
+    (example, "debug", (0, 0), {}, False),  # No Default Value Specified
+    (example, "verbose", (), {"verbose": True}, False),  # Wrong Keyword (Keyword not present)
+
+    # Function with Default Value (True)
+    (example_2, "verbose", (), {}, True),  # Default Value is True
+    (example_2, "verbose", (0, 0, False), {}, False),  # Positional Arg is False
+    (example_2, "verbose", (0, 0, 1), {}, False),  # Positional Arg is not bool
+
+    # Keyword Only Argument with Default Value (True)
+    (example_3, "debug", (0, 0), {}, True),  # Default Value is True
+    (example_3, "debug", (0, 0), {"debug": False}, False),  # Keyword Arg is False
+
+    # Unbound Method (as seen by decorator within class body)
+    (Example.magic, "profile", ("self", 0), {}, True),  # Default Value is True
+    (Example.magic, "profile", ("self", 0, False), {}, False),  # Positional Arg is False
+
+    # Bound Method (instance is not delivered as an argument)
+    (Example().magic, "profile", (0,), {}, True),  # Default Value is True
+    (Example().magic, "profile", (0, False), {}, False),  # Positional Arg is False
+    (Example().magic, "profile", (0, True), {}, True),  # Positional Arg is True
+
+    # Staticmethod descriptor
+    (Example.__dict__["lady"], "profile", (0, True), {}, True),  # Positional Arg is True
+    (Example.__dict__["lady"], "profile", (0,), {}, False),  # No Default Value --> False
+])
+def test_keyword_toggle(function, keyword, args, kwargs, expected):
+    assert KeywordToggle(function, keyword)(args, kwargs) is expected
+
+
+def test_keyword_toggle_missing():
+    toggle = KeywordToggle(example, "missing")
+    assert toggle.present is False
+    assert toggle((0, 0, True), {"missing": True}) is False
+
+
+def test_keyword_toggle_none():
+    toggle = KeywordToggle(example, None)
+    assert toggle.present is True
+    assert toggle((0, 0, False), {}) is True
+
+
 @pytest.mark.parametrize("function, expected", [
     (example, dict(zip(["a", "b", "debug"], [None] * 3))),
     (example_2, dict(zip(["a", "b", "verbose"], [1, 2, True]))),
@@ -140,3 +194,34 @@ def test_default_keyvalue(function, keyword, default, expected):
 ])
 def test_mode(value, expected):
     assert is_valid_mode(value) is expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("cprofile", True),
+    ("timing", True),
+    pytest.param("profile", False, marks=pytest.mark.xfail(raises=InvalidEngine)),
+])
+def test_engine(value, expected):
+    assert is_valid_engine(value) is expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("pstats", True),
+    ("collapsed", True),
+    ("speedscope", True),
+    ("callgrind", True),
+    ("marshal", True),
+    (print, True),
+    pytest.param("flamegraph", False, marks=pytest.mark.xfail(raises=InvalidFormat)),
+])
+def test_format(value, expected):
+    assert is_valid_format(value) is expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("gzip", True),
+    (None, True),
+    pytest.param("bz2", False, marks=pytest.mark.xfail(raises=InvalidCompression)),
+])
+def test_compression(value, expected):
+    assert is_valid_compression(value) is expected